@@ -0,0 +1,48 @@
+"""
+Latency of single-task CLI commands as the task list grows.
+
+Each command should cost one dictionary access, so its latency should stay
+flat from a thousand tasks to a hundred thousand.
+
+Usage (from the phase-1 directory):
+    python benchmarks/command_latency.py
+"""
+import sys
+import os
+import io
+import time
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from implementation.cli import TodoCLI
+
+SIZES = (1_000, 10_000, 100_000)
+RUNS = 2_000
+
+
+def time_command(cli: TodoCLI, make_command) -> float:
+    """Run RUNS commands built by make_command(i) and return microseconds per command."""
+    commands = [make_command(i) for i in range(RUNS)]
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for command in commands:
+            cli.process_command(command)
+        elapsed = time.perf_counter() - start
+    return elapsed / RUNS * 1e6
+
+
+def main():
+    """Print per-command latency for each list size."""
+    print(f"{'tasks':>10} {'COMPLETE':>12} {'UPDATE':>12} {'DELETE':>12}   (us/command)")
+    for size in SIZES:
+        cli = TodoCLI()
+        for i in range(size):
+            cli.service.add_task(f"Task {i}")
+        complete = time_command(cli, lambda i: f"COMPLETE {i % size + 1}")
+        update = time_command(cli, lambda i: f'UPDATE {i % size + 1} "Renamed {i}"')
+        delete = time_command(cli, lambda i: f"DELETE {size - i}")
+        print(f"{size:>10,} {complete:>12.2f} {update:>12.2f} {delete:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Memory-per-task comparison between the dict and compact storage backends.
+
+Usage (from the phase-1 directory):
+    python benchmarks/memory_per_task.py [task_count]
+"""
+import sys
+import os
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from implementation.service import create_repository
+
+
+def measure(backend: str, count: int) -> float:
+    """
+    Fill a fresh repository with tasks and measure the memory it retains.
+
+    Args:
+        backend: Name of the storage backend to measure
+        count: Number of tasks to add
+
+    Returns:
+        The number of bytes retained per task
+    """
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    repository = create_repository(backend)
+    for i in range(count):
+        description = f"Description for task {i}" if i % 2 else None
+        repository.add_todo(f"Task number {i}", description)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del repository
+    return retained / count
+
+
+def main():
+    """Print bytes per task for every backend."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Memory per task ({count:,} tasks, half with descriptions)")
+    baseline = None
+    for backend in ("dict", "compact"):
+        per_task = measure(backend, count)
+        baseline = baseline or per_task
+        print(f"  {backend:<8} {per_task:8.1f} bytes/task  ({per_task / baseline:.0%} of dict)")
+
+
+if __name__ == "__main__":
+    main()
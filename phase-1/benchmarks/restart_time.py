@@ -0,0 +1,50 @@
+"""
+Restart time of the durable repository: snapshot load versus log replay.
+
+Usage (from the phase-1 directory):
+    python benchmarks/restart_time.py [task_count] [tail_length]
+"""
+import sys
+import os
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from implementation.persistence import DurableTodoRepository
+
+
+def timed_open(data_dir: str) -> float:
+    """Open (recover) a repository and return the elapsed seconds."""
+    start = time.perf_counter()
+    repository = DurableTodoRepository(data_dir, snapshot_interval=10**9)
+    elapsed = time.perf_counter() - start
+    repository.close()
+    return elapsed
+
+
+def main():
+    """Compare recovery from a pure log with recovery from a snapshot plus tail."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    tail = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        repository = DurableTodoRepository(data_dir, snapshot_interval=10**9, group_size=4096)
+        for i in range(count):
+            repository.add_todo(f"Task {i}", "Seeded by the benchmark")
+        repository.close()
+        log_only = timed_open(data_dir)
+
+        repository = DurableTodoRepository(data_dir, snapshot_interval=10**9)
+        repository.snapshot()
+        for i in range(tail):
+            repository.toggle_completion(i + 1)
+        repository.close()
+        with_snapshot = timed_open(data_dir)
+
+    print(f"Restart with {count:,} tasks")
+    print(f"  full log replay          {log_only:8.2f} s")
+    print(f"  snapshot + {tail:,} tail ops {with_snapshot:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Reproducible benchmark suite for the phase-1 in-memory engine.
+
+For every list size the suite fills a fresh service and times add, get,
+list, update, toggle, delete and CLI command parsing, reporting ops/sec,
+p50/p99 latency and peak memory (via tracemalloc). Results can be written
+to JSON and compared against a previous run to catch regressions.
+
+Usage (from the phase-1 directory):
+    python benchmarks/run.py --sizes 1000 10000 100000 --output results.json
+    python benchmarks/run.py --compare results.json --threshold 0.25
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Sequence
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from implementation.cli import TodoCLI
+from implementation.service import TodoService
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+# Per-operation sample count for the single-task operations
+SAMPLES = 2_000
+# The full listing is O(n), so it gets far fewer samples
+LIST_SAMPLES = 20
+
+
+def _percentile(sorted_values: Sequence[int], fraction: float) -> int:
+    """Return the value at a fraction of a sorted sequence."""
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def _measure(operation: Callable[[int], object], arguments: Sequence[int]) -> Dict[str, float]:
+    """
+    Time one call of an operation per argument.
+
+    Args:
+        operation: Callable invoked once per argument
+        arguments: The arguments to call it with
+
+    Returns:
+        ops_per_sec, p50_us and p99_us for the calls
+    """
+    clock = time.perf_counter_ns
+    latencies: List[int] = []
+    append = latencies.append
+    for argument in arguments:
+        start = clock()
+        operation(argument)
+        append(clock() - start)
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "ops_per_sec": round(len(latencies) / (total / 1e9), 1) if total else 0.0,
+        "p50_us": round(_percentile(latencies, 0.50) / 1000, 3),
+        "p99_us": round(_percentile(latencies, 0.99) / 1000, 3),
+    }
+
+
+def _fill(service: TodoService, size: int):
+    """Add `size` tasks to a service."""
+    for i in range(size):
+        service.add_task(f"Benchmark task {i}", "Seeded by the benchmark suite" if i % 2 else None)
+
+
+def _peak_memory(backend: str, size: int) -> int:
+    """Return the peak traced memory, in bytes, of filling a service with `size` tasks."""
+    tracemalloc.start()
+    service = TodoService(backend=backend)
+    _fill(service, size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del service
+    return peak
+
+
+def run_size(backend: str, size: int, seed: int) -> Dict[str, object]:
+    """
+    Run every operation benchmark for one list size.
+
+    Args:
+        backend: Storage backend to benchmark
+        size: Number of tasks in the list
+        seed: Seed for the random task IDs
+
+    Returns:
+        Per-operation results plus peak memory for the size
+    """
+    rng = random.Random(seed)
+    samples = min(SAMPLES, size)
+    service = TodoService(backend=backend)
+    _fill(service, size)
+    ids = [rng.randint(1, size) for _ in range(samples)]
+
+    results: Dict[str, object] = {}
+    next_titles = iter(range(10**9))
+    results["add"] = _measure(lambda _: service.add_task(f"Extra task {next(next_titles)}"),
+                              range(samples))
+    results["get"] = _measure(service.get_task, ids)
+    results["list"] = _measure(lambda _: service.list_tasks(), range(LIST_SAMPLES))
+    results["update"] = _measure(lambda todo_id: service.update_task(todo_id, "Renamed task"), ids)
+    results["toggle"] = _measure(service.complete_task, ids)
+    results["delete"] = _measure(service.delete_task, rng.sample(range(1, size + 1), samples))
+
+    cli = TodoCLI(TodoService(backend=backend))
+    _fill(cli.service, size)
+    commands = [f'UPDATE {todo_id} "Renamed from the CLI" "Benchmark"' for todo_id in ids]
+    with redirect_stdout(io.StringIO()):
+        results["cli_parse"] = _measure(lambda i: cli.process_command(commands[i]),
+                                        range(samples))
+
+    results["peak_memory_bytes"] = _peak_memory(backend, size)
+    return results
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], threshold: float) -> List[str]:
+    """
+    Find operations that got slower than a baseline run.
+
+    An operation regresses when its throughput drops, or its p99 latency
+    grows, by more than `threshold` (a fraction) at the same list size.
+
+    Returns:
+        One human-readable line per regression
+    """
+    regressions = []
+    for size, operations in current["results"].items():
+        base_operations = baseline.get("results", {}).get(size)
+        if not base_operations:
+            continue
+        for name, metrics in operations.items():
+            base = base_operations.get(name)
+            if not isinstance(metrics, dict) or not isinstance(base, dict):
+                continue
+            if metrics["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+                regressions.append(f"{name} @ {size}: {metrics['ops_per_sec']:,.0f} ops/s "
+                                   f"(baseline {base['ops_per_sec']:,.0f})")
+            if metrics["p99_us"] > base["p99_us"] * (1 + threshold):
+                regressions.append(f"{name} @ {size}: p99 {metrics['p99_us']:.2f} us "
+                                   f"(baseline {base['p99_us']:.2f} us)")
+    return regressions
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse the command-line options."""
+    parser = argparse.ArgumentParser(description="Phase-1 engine benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="list sizes to benchmark (default: 1e3 1e4 1e5; add 1000000 for 1e6)")
+    parser.add_argument("--backend", default="dict", help="storage backend to benchmark")
+    parser.add_argument("--seed", type=int, default=1234, help="seed for the random task IDs")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a previous JSON run")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative slowdown reported as a regression (default: 0.25)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run the suite, print a table and optionally write and compare JSON results."""
+    args = parse_args(argv)
+    report = {
+        "backend": args.backend,
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": {},
+    }
+
+    print(f"{'size':>9} {'operation':<10} {'ops/s':>12} {'p50 us':>9} {'p99 us':>9}")
+    for size in args.sizes:
+        results = run_size(args.backend, size, args.seed)
+        report["results"][str(size)] = results
+        for name, metrics in results.items():
+            if isinstance(metrics, dict):
+                print(f"{size:>9,} {name:<10} {metrics['ops_per_sec']:>12,.0f} "
+                      f"{metrics['p50_us']:>9.2f} {metrics['p99_us']:>9.2f}")
+        peak = results["peak_memory_bytes"]
+        print(f"{size:>9,} {'memory':<10} {peak / 1e6:>10.1f} MB peak ({peak / size:.0f} B/task)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.compare}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+Search latency at scale for the inverted full-text index.
+
+Usage (from the phase-1 directory):
+    python benchmarks/search_latency.py [task_count]
+"""
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from implementation.service import TodoService
+
+WORDS = ["buy", "walk", "call", "email", "review", "fix", "plan", "book", "clean", "pay"]
+OBJECTS = ["groceries", "dog", "mom", "report", "invoice", "car", "flight", "garage"]
+QUERIES = ["invoice", "pay inv", "walk dog", "review report 77", "task 123456", "zzz"]
+
+
+def main():
+    """Fill a service with synthetic tasks and time a set of queries."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    service = TodoService()
+    start = time.perf_counter()
+    for i in range(count):
+        title = f"{WORDS[i % len(WORDS)]} {OBJECTS[i % len(OBJECTS)]} task {i}"
+        service.add_task(title)
+    # The first query merges the vocabulary; keep that out of the timings
+    service.search("warmup")
+    print(f"Indexed {count:,} tasks in {time.perf_counter() - start:.1f}s")
+
+    for query in QUERIES:
+        runs = 20
+        start = time.perf_counter()
+        for _ in range(runs):
+            results = service.repository._search_index.search(query)
+        elapsed = (time.perf_counter() - start) / runs
+        print(f"  {query!r:<22} {len(results):>8,} hits  {elapsed * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
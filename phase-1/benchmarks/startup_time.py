@@ -0,0 +1,109 @@
+"""
+Startup time of the console app, checked against a budget.
+
+Runs `python -X importtime implementation/main.py --batch` on a one-line
+EXIT script several times, reports the median import time of the app's
+modules (parsed from the -X importtime log) and the median wall time of the
+whole process, and lists the slowest imports. Imports the interpreter makes
+before running main.py, `site` and everything before it, are left out of
+both, since no change to the app can make them faster. Exits with status 1
+when the median import time exceeds the budget.
+
+Usage (from the phase-1 directory):
+    python benchmarks/startup_time.py [--runs 20] [--budget-ms 40] [--top 10]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+MAIN = os.path.join(os.path.dirname(__file__), '..', 'implementation', 'main.py')
+# "import time: self [us] | cumulative | imported package" lines of -X importtime
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+# The last top-level import of interpreter startup
+_STARTUP_DONE = "site"
+
+
+def parse_importtime(log: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Parse the stderr of a -X importtime run.
+
+    Imports completed up to and including `site` belong to interpreter
+    startup and are skipped.
+
+    Returns:
+        The summed cumulative microseconds of the app's top-level imports,
+        and the self time in microseconds of every module the app imported
+    """
+    total = 0
+    self_times = {}
+    for line in log.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        self_times[module] = int(self_us)
+        if len(indent) == 1:
+            total += int(cumulative_us)
+            if module == _STARTUP_DONE:
+                total = 0
+                self_times = {}
+    return total, self_times
+
+
+def run_once(script: str) -> Tuple[float, int, Dict[str, int]]:
+    """Start the app once, returning wall seconds, import microseconds and per-module times."""
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", MAIN, "--batch", script],
+                               capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    total, self_times = parse_importtime(completed.stderr)
+    return elapsed, total, self_times
+
+
+def main(argv=None) -> int:
+    """Measure startup, print a report and compare the median import time with the budget."""
+    parser = argparse.ArgumentParser(description="Console app startup benchmark")
+    parser.add_argument("--runs", type=int, default=20, help="number of process starts")
+    parser.add_argument("--budget-ms", type=float, default=40.0,
+                        help="allowed median import time in milliseconds (default: 40)")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to list")
+    args = parser.parse_args(argv)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as script:
+        script.write("EXIT\n")
+    try:
+        runs = [run_once(script.name) for _ in range(args.runs)]
+    finally:
+        os.unlink(script.name)
+
+    wall_ms = statistics.median(elapsed for elapsed, _, _ in runs) * 1000
+    import_ms = statistics.median(total for _, total, _ in runs) / 1000
+    modules: Dict[str, List[int]] = {}
+    for _, _, self_times in runs:
+        for module, self_us in self_times.items():
+            modules.setdefault(module, []).append(self_us)
+    slowest = sorted(((statistics.median(times), module) for module, times in modules.items()),
+                     reverse=True)[:args.top]
+
+    print(f"Startup over {args.runs} runs (median)")
+    print(f"  process wall time  {wall_ms:8.1f} ms")
+    print(f"  imports            {import_ms:8.1f} ms (budget {args.budget_ms:.1f} ms)")
+    print("  slowest imports (self time):")
+    for self_us, module in slowest:
+        print(f"    {self_us / 1000:6.2f} ms  {module}")
+
+    if import_ms > args.budget_ms:
+        print(f"Over budget by {import_ms - args.budget_ms:.1f} ms")
+        return 1
+    print("Within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
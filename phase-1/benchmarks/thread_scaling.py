@@ -0,0 +1,64 @@
+"""
+Throughput of the concurrent repository from 1 to N threads.
+
+Each thread toggles and updates its own slice of a shared task set. On a
+GIL build of CPython the total throughput stays roughly flat (the locks
+only have to avoid making it worse); on a free-threaded build it should
+grow with the thread count.
+
+Usage (from the phase-1 directory):
+    python benchmarks/thread_scaling.py [max_threads] [ops_per_thread]
+"""
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from implementation.concurrent_repository import ConcurrentTodoRepository
+
+
+def run(threads: int, ops_per_thread: int) -> float:
+    """Run the workload with a number of threads and return operations per second."""
+    repository = ConcurrentTodoRepository()
+    for i in range(threads * 1000):
+        repository.add_todo(f"Task {i}")
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(index):
+        ids = range(index * 1000 + 1, (index + 1) * 1000 + 1)
+        barrier.wait()
+        for op in range(ops_per_thread):
+            todo_id = ids[op % len(ids)]
+            if op % 2:
+                repository.toggle_completion(todo_id)
+            else:
+                repository.update_todo(todo_id, description=f"Revision {op}")
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * ops_per_thread / (time.perf_counter() - start)
+
+
+def main():
+    """Print throughput for doubling thread counts."""
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    ops_per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Concurrent repository scaling (GIL {'enabled' if gil else 'disabled'})")
+    baseline = None
+    threads = 1
+    while threads <= max_threads:
+        rate = run(threads, ops_per_thread)
+        baseline = baseline or rate
+        print(f"  {threads:>3} threads  {rate:12,.0f} ops/s  ({rate / baseline:.2f}x)")
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main()
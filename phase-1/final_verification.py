@@ -42,7 +42,7 @@ def test_all_functional_requirements():
     # FR-004: System MUST allow users to update existing tasks by ID, modifying title and/or description
     print("PASS FR-004: Testing task updates by ID")
     success = service.update_task(task1.id, "Buy shopping", "Fruits and vegetables")
-    assert success is True
+    assert success is not None
     updated_tasks = service.list_tasks()
     updated_task = next(t for t in updated_tasks if t.id == task1.id)
     assert updated_task.title == "Buy shopping"
@@ -50,7 +50,7 @@ def test_all_functional_requirements():
 
     # Test updating only title
     success = service.update_task(task2.id, "Walk the cat")
-    assert success is True
+    assert success is not None
     updated_tasks = service.list_tasks()
     updated_task2 = next(t for t in updated_tasks if t.id == task2.id)
     assert updated_task2.title == "Walk the cat"
@@ -59,7 +59,7 @@ def test_all_functional_requirements():
     print("PASS FR-005: Testing task deletion by ID")
     initial_count = len(service.list_tasks())
     success = service.delete_task(task1.id)
-    assert success is True
+    assert success is not None
     after_deletion_count = len(service.list_tasks())
     assert after_deletion_count == initial_count - 1
     # Verify task no longer exists
@@ -78,14 +78,14 @@ def test_all_functional_requirements():
 
     # Toggle to complete
     success = service.complete_task(task1.id)
-    assert success is True
+    assert success is not None
     tasks = service.list_tasks()
     completed_status = next(t for t in tasks if t.id == task1.id).completed
     assert completed_status is True
 
     # Toggle back to incomplete
     success = service.complete_task(task1.id)
-    assert success is True
+    assert success is not None
     tasks = service.list_tasks()
     incomplete_status = next(t for t in tasks if t.id == task1.id).completed
     assert incomplete_status is False
@@ -101,13 +101,13 @@ def test_all_functional_requirements():
     # FR-009: System MUST handle invalid task IDs gracefully with appropriate error messages
     print("PASS FR-009: Testing graceful handling of invalid task IDs")
     result = service.update_task(999, "Non-existent task")
-    assert result is False
+    assert result is None
 
     result = service.delete_task(999)
-    assert result is False
+    assert result is None
 
     result = service.complete_task(999)
-    assert result is False
+    assert result is None
 
     # FR-010: System MUST validate that task titles are not empty when adding or updating
     print("PASS FR-010: Testing title validation for empty titles")
@@ -184,7 +184,7 @@ def test_acceptance_scenarios():
     original_title = original_task.title
 
     success = service.update_task(1, "Updated task title", "Updated description")
-    assert success is True
+    assert success is not None
 
     updated_tasks = service.list_tasks()
     updated_task = next(t for t in updated_tasks if t.id == 1)
@@ -196,7 +196,7 @@ def test_acceptance_scenarios():
     print("PASS User Story 3, Scenario 2: Delete task, verify removal from list")
     initial_count = len(service.list_tasks())
     success = service.delete_task(1)
-    assert success is True
+    assert success is not None
     after_delete_count = len(service.list_tasks())
     assert after_delete_count == initial_count - 1
 
@@ -239,7 +239,7 @@ def test_success_criteria():
     print("PASS SC-003: Update/delete tasks by ID with immediate reflection")
     # Update
     success = service.update_task(2, "Updated Task 2")
-    assert success is True
+    assert success is not None
     tasks = service.list_tasks()
     updated_task = next(t for t in tasks if t.id == 2)
     assert updated_task.title == "Updated Task 2"
@@ -247,7 +247,7 @@ def test_success_criteria():
     # Delete
     initial_count = len(service.list_tasks())
     success = service.delete_task(3)
-    assert success is True
+    assert success is not None
     after_delete_count = len(service.list_tasks())
     assert after_delete_count == initial_count - 1
 
@@ -279,10 +279,10 @@ def test_edge_cases():
     # Edge Case 1: Update/delete/list a task that doesn't exist
     print("PASS Edge Case 1: Handling non-existent tasks gracefully")
     result = service.update_task(999, "Non-existent task")
-    assert result is False  # Should return False, not crash
+    assert result is None  # Should return None, not crash
 
     result = service.delete_task(999)
-    assert result is False  # Should return False, not crash
+    assert result is None  # Should return None, not crash
 
     # Edge Case 2: Invalid input for task IDs
     print("PASS Edge Case 2: Handling invalid task ID formats")
@@ -2,13 +2,43 @@
 Command-line interface for the todo application.
 """
 import re
-from typing import Tuple, Optional
+from typing import Optional
 try:
-    from implementation.service import TodoService
-    from implementation.todo_model import Todo
+    from implementation.service import DEFAULT_LIST, TodoService
+    from implementation.validation import numbered_titles, parse_id_ranges
 except ImportError:
-    from service import TodoService
-    from todo_model import Todo
+    from service import DEFAULT_LIST, TodoService
+    from validation import numbered_titles, parse_id_ranges
+
+# Argument patterns, compiled once at import rather than on every command
+_ADD_PATTERN = re.compile(r'^"([^"]*)"(?:\s+"([^"]*)")?$')
+_UPDATE_PATTERN = re.compile(r'^(\d+)\s+"([^"]*)"(?:\s+"([^"]*)")?$')
+_ADD_MANY_COUNT_PATTERN = re.compile(r'^(\d+)\s+"([^"]*)"$')
+_ADD_MANY_TITLES_PATTERN = re.compile(r'^"[^"]*"(?:\s+"[^"]*")*$')
+_QUOTED_PATTERN = re.compile(r'"([^"]*)"')
+_LIST_PATTERN = re.compile(r'^(pending|completed)?\s*(?:(\d+)\s+(\d+))?$', re.IGNORECASE)
+_TRANSFER_PATTERN = re.compile(r'^(?:"([^"]+)"|(\S+))(?:\s+(json|csv))?$', re.IGNORECASE)
+_PROFILE_PATTERN = re.compile(r'^(?:(on)(?:\s+(?:"([^"]+)"|(\S+)))?|(off))$', re.IGNORECASE)
+# Commands that report on profiling and are not profiled themselves
+_UNPROFILED = frozenset(("PROFILE", "STATS"))
+
+
+def _profiling():
+    """Import the profiling module on first use, keeping it off the startup path."""
+    try:
+        from implementation import profiling
+    except ImportError:
+        import profiling
+    return profiling
+
+
+def _format_bytes(size: float) -> str:
+    """Format a byte count with a binary unit, e.g. 1.5 KiB."""
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
 
 
 class TodoCLI:
@@ -19,20 +49,51 @@ class TodoCLI:
     the todo service, parsing commands and displaying results.
     """
 
-    def __init__(self):
-        """Initialize the CLI with a service instance."""
-        self.service = TodoService()
+    def __init__(self, service: Optional[TodoService] = None):
+        """
+        Initialize the CLI with a service instance.
+
+        Args:
+            service: The service to drive; a new in-memory service if omitted
+        """
+        self.service = service if service is not None else TodoService()
         self.running = True
+        # Active command profiler, and the last one for STATS after PROFILE OFF
+        self.profiler = None
+        self._last_profiler = None
+        # Dispatch table from command name to bound handler, built once
+        self._handlers = {
+            "ADD": self.handle_add,
+            "LIST": self.handle_list,
+            "UPDATE": self.handle_update,
+            "DELETE": self.handle_delete,
+            "COMPLETE": self.handle_complete,
+            "ADD-MANY": self.handle_add_many,
+            "COMPLETE-MANY": self.handle_complete_many,
+            "DELETE-MANY": self.handle_delete_many,
+            "SEARCH": self.handle_search,
+            "EXPORT": self.handle_export,
+            "IMPORT": self.handle_import,
+            "UNDO": self.handle_undo,
+            "REDO": self.handle_redo,
+            "PROFILE": self.handle_profile,
+            "STATS": self.handle_stats,
+            "USE": self.handle_use,
+            "LISTS": self.handle_lists,
+            "HELP": self.handle_help,
+            "EXIT": self.handle_exit,
+        }
 
     def run(self):
         """Start the main command loop."""
         print("Welcome to the Todo Application!")
-        print("Available commands: ADD, LIST, UPDATE, DELETE, COMPLETE, HELP, EXIT")
+        print("Available commands: ADD, LIST, SEARCH, UPDATE, DELETE, COMPLETE, HELP, EXIT")
         print("Type 'HELP' for detailed command information.\n")
 
         while self.running:
             try:
-                user_input = input("> ").strip()
+                prompt = "> " if self.service.current_list == DEFAULT_LIST else f"{self.service.current_list}> "
+                user_input = input(prompt).strip()
                 if user_input:
                     self.process_command(user_input)
             except KeyboardInterrupt:
@@ -41,6 +102,14 @@ class TodoCLI:
             except EOFError:
                 print("\nGoodbye!")
                 break
+        self.close()
+
+    def close(self):
+        """Stop profiling, writing any cProfile file, and close the service."""
+        try:
+            self._stop_profiling()
+        finally:
+            self.service.close()
 
     def process_command(self, command_line: str):
         """
@@ -50,24 +119,16 @@ class TodoCLI:
             command_line: The full command line input from the user
         """
         parts = command_line.split(maxsplit=1)
-        command = parts[0].upper()
-
-        if command == "ADD":
-            self.handle_add(parts[1] if len(parts) > 1 else "")
-        elif command == "LIST":
-            self.handle_list()
-        elif command == "UPDATE":
-            self.handle_update(parts[1] if len(parts) > 1 else "")
-        elif command == "DELETE":
-            self.handle_delete(parts[1] if len(parts) > 1 else "")
-        elif command == "COMPLETE":
-            self.handle_complete(parts[1] if len(parts) > 1 else "")
-        elif command == "HELP":
-            self.handle_help()
-        elif command == "EXIT":
-            self.handle_exit()
+        name = parts[0].upper()
+        handler = self._handlers.get(name)
+        if handler is None:
+            print(f"Unknown command: {name}. Type 'HELP' for available commands.")
+            return
+        args = parts[1] if len(parts) > 1 else ""
+        if self.profiler is None or name in _UNPROFILED:
+            handler(args)
         else:
-            print(f"Unknown command: {command}. Type 'HELP' for available commands.")
+            self.profiler.measure(name, handler, args)
 
     def handle_add(self, args: str):
         """
@@ -78,7 +139,7 @@ class TodoCLI:
         """
         # Extract title and description using regex
         # Format: "title" ["description"] or just "title"
-        match = re.match(r'^"([^"]*)"(?:\s+"([^"]*)")?$', args)
+        match = _ADD_PATTERN.match(args)
 
         if not match:
             print('Invalid format for ADD. Use: ADD "title" ["description"]')
@@ -98,15 +159,35 @@ class TodoCLI:
         Handle the LIST command.
 
         Args:
-            args: Arguments following the LIST command (ignored)
+            args: Optional status filter, either "pending" or "completed",
+                optionally followed by a page as a starting ID and a count
         """
-        tasks = self.service.list_tasks()
+        match = _LIST_PATTERN.match(args.strip())
+        if not match:
+            print("Invalid format for LIST. Use: LIST [pending|completed] [from count]")
+            return
+
+        status_filter = (match.group(1) or "").lower()
+        completed = None if not status_filter else status_filter == "completed"
+        if match.group(2) is None:
+            tasks = self.service.list_tasks(completed)
+            more = False
+        else:
+            count = int(match.group(3))
+            # Fetch one extra task to find out whether another page follows
+            tasks = self.service.list_tasks(completed, start_id=int(match.group(2)),
+                                            limit=count + 1)
+            more = len(tasks) > count
+            tasks = tasks[:count]
 
         if not tasks:
             print("No tasks found.")
         else:
             for task in tasks:
                 print(task)
+            if more:
+                page = " ".join(part for part in (status_filter, str(tasks[-1].id + 1), str(count)) if part)
+                print(f"More tasks: LIST {page}")
 
     def handle_update(self, args: str):
         """
@@ -117,7 +198,7 @@ class TodoCLI:
         """
         # Extract id, title and description using regex
         # Format: id "title" ["description"]
-        match = re.match(r'^(\d+)\s+"([^"]*)"(?:\s+"([^"]*)")?$', args)
+        match = _UPDATE_PATTERN.match(args)
 
         if not match:
             print('Invalid format for UPDATE. Use: UPDATE id "title" ["description"]')
@@ -127,16 +208,12 @@ class TodoCLI:
         title = match.group(2)
         description = match.group(3) if match.group(3) else None
 
-        if not self.service.task_exists(task_id):
-            print(f"Error: Task with ID {task_id} does not exist")
-            return
-
         try:
-            success = self.service.update_task(task_id, title, description)
-            if success:
+            task = self.service.update_task(task_id, title, description)
+            if task is not None:
                 print(f"Task #{task_id} updated successfully")
             else:
-                print(f"Error: Failed to update task with ID {task_id}")
+                print(f"Error: Task with ID {task_id} does not exist")
         except ValueError as e:
             print(f"Error: {str(e)}")
 
@@ -154,18 +231,15 @@ class TodoCLI:
 
         try:
             task_id = int(parts[0])
-
-            if not self.service.task_exists(task_id):
-                print(f"Error: Task with ID {task_id} does not exist")
-                return
-
-            success = self.service.delete_task(task_id)
-            if success:
-                print(f"Task #{task_id} deleted successfully")
-            else:
-                print(f"Error: Failed to delete task with ID {task_id}")
         except ValueError:
             print("Invalid task ID. Please provide a valid number.")
+            return
+
+        task = self.service.delete_task(task_id)
+        if task is not None:
+            print(f"Task #{task_id} deleted successfully")
+        else:
+            print(f"Error: Task with ID {task_id} does not exist")
 
     def handle_complete(self, args: str):
         """
@@ -181,25 +255,305 @@ class TodoCLI:
 
         try:
             task_id = int(parts[0])
+        except ValueError:
+            print("Invalid task ID. Please provide a valid number.")
+            return
 
-            if not self.service.task_exists(task_id):
-                print(f"Error: Task with ID {task_id} does not exist")
+        task = self.service.complete_task(task_id)
+        if task is not None:
+            status = "complete" if task.completed else "incomplete"
+            print(f"Task #{task_id} marked as {status}")
+        else:
+            print(f"Error: Task with ID {task_id} does not exist")
+
+    def handle_add_many(self, args: str):
+        """
+        Handle the ADD-MANY command.
+
+        Args:
+            args: Either several quoted titles, or a count followed by one
+                quoted title that is numbered for each new task
+        """
+        # Format: count "title" or "title" ["title" ...]
+        count_match = _ADD_MANY_COUNT_PATTERN.match(args)
+        if count_match:
+            try:
+                titles = numbered_titles(int(count_match.group(1)), count_match.group(2))
+            except ValueError as e:
+                print(f"Error: {str(e)}")
                 return
+        elif _ADD_MANY_TITLES_PATTERN.match(args):
+            titles = _QUOTED_PATTERN.findall(args)
+        else:
+            print('Invalid format for ADD-MANY. Use: ADD-MANY "title" ["title" ...] '
+                  'or ADD-MANY count "title"')
+            return
 
-            success = self.service.complete_task(task_id)
-            if success:
-                # Get the updated task to show its new status
-                tasks = self.service.list_tasks()
-                task = next((t for t in tasks if t.id == task_id), None)
-                if task:
-                    status = "complete" if task.completed else "incomplete"
-                    print(f"Task #{task_id} marked as {status}")
-                else:
-                    print(f"Error: Failed to retrieve updated task with ID {task_id}")
+        result = self.service.add_many((title, None) for title in titles)
+        if result.succeeded:
+            first, last = result.succeeded[0].id, result.succeeded[-1].id
+            print(f"Added {len(result.succeeded)} tasks (#{first}-#{last})")
+        else:
+            print("Added 0 tasks")
+        if result.failed:
+            print(f"Skipped {len(result.failed)} tasks: {result.failed[0][1]}")
+
+    def _parse_id_ranges(self, command: str, args: str):
+        """Parse the ID ranges of a bulk command, printing usage on failure."""
+        try:
+            task_ids = parse_id_ranges(args)
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+            return None
+        if not task_ids:
+            print(f"Invalid format for {command}. Use: {command} id|from-to ...")
+            return None
+        return task_ids
+
+    def handle_complete_many(self, args: str):
+        """
+        Handle the COMPLETE-MANY command.
+
+        Args:
+            args: Task IDs and ID ranges, e.g. "1-5000 7"
+        """
+        task_ids = self._parse_id_ranges("COMPLETE-MANY", args)
+        if task_ids is None:
+            return
+
+        result = self.service.complete_many(task_ids)
+        print(f"Marked {len(result.succeeded)} tasks as complete")
+        if result.failed:
+            print(f"{len(result.failed)} task IDs do not exist")
+
+    def handle_delete_many(self, args: str):
+        """
+        Handle the DELETE-MANY command.
+
+        Args:
+            args: Task IDs and ID ranges, e.g. "1-5000 7"
+        """
+        task_ids = self._parse_id_ranges("DELETE-MANY", args)
+        if task_ids is None:
+            return
+
+        result = self.service.delete_many(task_ids)
+        print(f"Deleted {len(result.succeeded)} tasks")
+        if result.failed:
+            print(f"{len(result.failed)} task IDs do not exist")
+
+    def handle_search(self, args: str):
+        """
+        Handle the SEARCH command.
+
+        Args:
+            args: The search query following the SEARCH command
+        """
+        query = args.strip().strip('"')
+        if not query:
+            print('Invalid format for SEARCH. Use: SEARCH query')
+            return
+
+        tasks = self.service.search(query)
+
+        if not tasks:
+            print("No tasks found.")
+        else:
+            for task in tasks:
+                print(task)
+
+    def _parse_transfer_args(self, command: str, args: str):
+        """
+        Parse the arguments of EXPORT and IMPORT.
+
+        Args:
+            command: The command name, used in the usage message
+            args: A file name, quoted if it contains spaces, and an optional format
+
+        Returns:
+            A (path, format or None) pair, or None if the arguments are invalid
+        """
+        match = _TRANSFER_PATTERN.match(args.strip())
+        if not match:
+            print(f'Invalid format for {command}. Use: {command} file [json|csv]')
+            return None
+        return match.group(1) or match.group(2), match.group(3)
+
+    def handle_export(self, args: str):
+        """
+        Handle the EXPORT command.
+
+        Args:
+            args: The file to write and an optional format
+        """
+        parsed = self._parse_transfer_args("EXPORT", args)
+        if parsed is None:
+            return
+
+        try:
+            count = self.service.export_tasks(*parsed)
+            print(f"Exported {count} tasks to {parsed[0]}")
+        except (ValueError, OSError) as e:
+            print(f"Error: {str(e)}")
+
+    def handle_import(self, args: str):
+        """
+        Handle the IMPORT command.
+
+        Args:
+            args: The file to read and an optional format
+        """
+        parsed = self._parse_transfer_args("IMPORT", args)
+        if parsed is None:
+            return
+
+        try:
+            imported, rejected = self.service.import_tasks(*parsed)
+            print(f"Imported {imported} tasks from {parsed[0]}")
+            if rejected:
+                print(f"{rejected} records had an empty title and were skipped")
+        except (ValueError, OSError) as e:
+            print(f"Error: {str(e)}")
+
+    def handle_undo(self, args: str = ""):
+        """
+        Handle the UNDO command.
+
+        Args:
+            args: Arguments following the UNDO command (ignored)
+        """
+        try:
+            if self.service.undo():
+                print("Undid the last change")
             else:
-                print(f"Error: Failed to update task with ID {task_id}")
-        except ValueError:
-            print("Invalid task ID. Please provide a valid number.")
+                print("Nothing to undo")
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+
+    def handle_redo(self, args: str = ""):
+        """
+        Handle the REDO command.
+
+        Args:
+            args: Arguments following the REDO command (ignored)
+        """
+        try:
+            if self.service.redo():
+                print("Redid the last undone change")
+            else:
+                print("Nothing to redo")
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+
+    def handle_use(self, args: str):
+        """
+        Handle the USE command.
+
+        Args:
+            args: The name of the list to switch to
+        """
+        name = args.strip()
+        if not name:
+            print("Invalid format for USE. Use: USE list")
+            return
+        try:
+            if self.service.use_list(name):
+                print(f"Created and switched to list '{name}'")
+            else:
+                print(f"Switched to list '{name}'")
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+
+    def handle_lists(self, args: str = ""):
+        """
+        Handle the LISTS command.
+
+        Args:
+            args: Arguments following the LISTS command (ignored)
+        """
+        for name in self.service.list_names():
+            marker = "*" if name == self.service.current_list else " "
+            print(f"{marker} {name}")
+
+    def handle_profile(self, args: str):
+        """
+        Handle the PROFILE command.
+
+        Args:
+            args: "ON" with an optional cProfile output file, or "OFF"
+        """
+        match = _PROFILE_PATTERN.match(args.strip())
+        if not match:
+            print("Invalid format for PROFILE. Use: PROFILE ON [file] or PROFILE OFF")
+            return
+
+        if match.group(4):
+            if self.profiler is None:
+                print("Profiling is not on")
+                return
+            self._stop_profiling()
+            print("Profiling stopped. Use STATS to see the results.")
+            return
+
+        if self.profiler is not None:
+            print("Profiling is already on")
+            return
+        profiler = _profiling().CommandProfiler(match.group(2) or match.group(3))
+        profiler.start()
+        self.profiler = self._last_profiler = profiler
+        if profiler.profile_path:
+            print(f"Profiling started; cProfile output goes to {profiler.profile_path}")
+        else:
+            print("Profiling started")
+
+    def _stop_profiling(self):
+        """Stop the active profiler, if any, and report where its cProfile file went."""
+        profiler, self.profiler = self.profiler, None
+        if profiler is None:
+            return
+        try:
+            path = profiler.stop()
+            if path:
+                print(f"cProfile statistics written to {path}")
+        except OSError as e:
+            print(f"Error: {str(e)}")
+
+    def handle_stats(self, args: str = ""):
+        """
+        Handle the STATS command.
+
+        Args:
+            args: Arguments following the STATS command (ignored)
+        """
+        count = self.service.count_tasks()
+        size = self.service.storage_bytes()
+        per_task = f" ({size / count:.1f} bytes/task)" if count else ""
+        print(f"List '{self.service.current_list}': {count} tasks, {_format_bytes(size)}{per_task}")
+
+        profiler = self._last_profiler
+        if profiler is None:
+            print("No profile recorded. Use PROFILE ON to record command statistics.")
+            return
+        total = sum(stats.count for stats in profiler.commands.values())
+        state = "on" if profiler.active else "off"
+        print(f"Profiling {state}: {total} commands in {profiler.elapsed():.2f}s")
+        if not total:
+            return
+        print(f"{'Command':<14}{'Count':>8}{'Mean':>11}{'p50':>10}{'p99':>10}{'Alloc/cmd':>13}{'Peak':>12}")
+        for name, stats in sorted(profiler.commands.items()):
+            mean_us = stats.total_ns / stats.count / 1000
+            print(f"{name:<14}{stats.count:>8}{mean_us:>9.1f}us"
+                  f"{'<' + str(stats.percentile(0.5)) + 'us':>10}"
+                  f"{'<' + str(stats.percentile(0.99)) + 'us':>10}"
+                  f"{_format_bytes(stats.allocated / stats.count):>13}{_format_bytes(stats.peak):>12}")
+            histogram = ", ".join(f"<{2 ** bucket}us: {runs}"
+                                  for bucket, runs in enumerate(stats.buckets) if runs)
+            print(f"  latency {histogram}")
+        sites = profiler.top_allocations()
+        if sites:
+            print("Largest live allocations since PROFILE ON:")
+            for location, blocks, size in sites:
+                print(f"  {location:<28}{blocks:>8} blocks {_format_bytes(size):>12}")
 
     def handle_help(self, args: str = ""):
         """
@@ -210,10 +564,23 @@ class TodoCLI:
         """
         print("\nAvailable Commands:")
         print("ADD \"title\" [\"description\"] - Create a new todo task")
-        print("LIST - Display all current tasks with their status")
+        print("ADD-MANY \"title\" [\"title\" ...] - Create several tasks at once")
+        print("ADD-MANY count \"title\" - Create count numbered tasks")
+        print("LIST [pending|completed] [from count] - Display tasks, optionally filtered or one page at a time")
+        print("SEARCH query - Find tasks whose title or description matches every word")
         print("UPDATE id \"title\" [\"description\"] - Update an existing task")
         print("DELETE id - Remove a task by ID")
         print("COMPLETE id - Toggle completion status of a task")
+        print("COMPLETE-MANY id|from-to ... - Mark several tasks as complete")
+        print("DELETE-MANY id|from-to ... - Remove several tasks")
+        print("EXPORT file [json|csv] - Write every task to a JSON or CSV file")
+        print("IMPORT file [json|csv] - Add the tasks from a JSON or CSV file")
+        print("UNDO - Undo the last change (versioned backend only)")
+        print("REDO - Redo the last undone change (versioned backend only)")
+        print("USE list - Switch to a named task list, creating it if needed")
+        print("LISTS - Show every task list, marking the active one with *")
+        print("PROFILE ON [file] | OFF - Record command latencies and allocations, optionally with cProfile")
+        print("STATS - Show the list size and the recorded command statistics")
         print("HELP - Show this help message")
         print("EXIT - Quit the application\n")
 
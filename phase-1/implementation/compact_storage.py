@@ -0,0 +1,326 @@
+"""
+Compact columnar storage backend for the todo application.
+
+Instead of keeping one Todo dataclass instance per task, the columnar store
+packs every task into a handful of array-backed columns and a single UTF-8
+string arena. Tasks are handed out as lightweight TodoView objects that read
+and write through to the columns.
+"""
+from array import array
+from collections.abc import MutableMapping
+from typing import Iterable, Iterator, Optional, Tuple
+try:
+    from implementation.repository import BulkResult, TodoRepository
+    from implementation.todo_model import Todo
+except ImportError:
+    from repository import BulkResult, TodoRepository
+    from todo_model import Todo
+
+# Values stored in the state column
+_ABSENT = -1
+_PENDING = 0
+_COMPLETED = 1
+
+
+class TodoView:
+    """
+    A slotted, read/write view onto a single row of a ColumnarTodoStore.
+
+    The view exposes the same attributes and behaviour as Todo, so callers
+    cannot tell the two apart.
+    """
+    __slots__ = ("_store", "id")
+
+    def __init__(self, store: "ColumnarTodoStore", todo_id: int):
+        """
+        Initialize the view.
+
+        Args:
+            store: The store holding the task's columns
+            todo_id: The ID of the task this view refers to
+        """
+        self._store = store
+        self.id = todo_id
+
+    @property
+    def title(self) -> str:
+        """The title of the task."""
+        return self._store._read_title(self.id - 1)
+
+    @title.setter
+    def title(self, value: str):
+        self._store._write_title(self.id - 1, value)
+
+    @property
+    def description(self) -> Optional[str]:
+        """The optional description of the task."""
+        return self._store._read_description(self.id - 1)
+
+    @description.setter
+    def description(self, value: Optional[str]):
+        self._store._write_description(self.id - 1, value)
+
+    @property
+    def completed(self) -> bool:
+        """The completion status of the task."""
+        return self._store._state[self.id - 1] == _COMPLETED
+
+    @completed.setter
+    def completed(self, value: bool):
+        self._store._state[self.id - 1] = _COMPLETED if value else _PENDING
+
+    def toggle_completion(self) -> 'TodoView':
+        """Toggle the completion status of the task."""
+        self.completed = not self.completed
+        return self
+
+    def to_todo(self) -> Todo:
+        """Materialize the view as a standalone Todo object."""
+        return Todo(id=self.id, title=self.title,
+                    description=self.description, completed=self.completed)
+
+    def __eq__(self, other) -> bool:
+        """Compare by field values, so views and Todo objects are interchangeable."""
+        if not isinstance(other, (TodoView, Todo)):
+            return NotImplemented
+        return (self.id, self.title, self.description, self.completed) == \
+               (other.id, other.title, other.description, other.completed)
+
+    def __repr__(self) -> str:
+        """Debug representation mirroring the Todo dataclass."""
+        return (f"TodoView(id={self.id!r}, title={self.title!r}, "
+                f"description={self.description!r}, completed={self.completed!r})")
+
+    def __str__(self) -> str:
+        """String representation of the task."""
+        status = "x" if self.completed else " "
+        description = self.description
+        return f"{self.id}. [{status}] {self.title}" + \
+               (f" - {description}" if description else "")
+
+
+class ColumnarTodoStore(MutableMapping):
+    """
+    Mapping of task ID to TodoView backed by array columns.
+
+    IDs are dense and assigned sequentially by the repository, so a task's
+    ID doubles as its row number (row = id - 1) and never has to be stored.
+    Each row costs a fixed 25 bytes across the columns plus the UTF-8 bytes
+    of its strings:
+
+        _state        int8   -1 absent, 0 pending, 1 completed
+        _title_off    int64  offset of the title in the arena
+        _title_len    int32  length of the encoded title
+        _desc_off     int64  offset of the description in the arena
+        _desc_len     int32  length of the encoded description, -1 for None
+
+    Updating a string appends the new bytes to the arena; the old bytes
+    become garbage that is reclaimed by compact().
+    """
+
+    def __init__(self):
+        """Initialize empty columns and an empty string arena."""
+        self._state = array('b')
+        self._title_off = array('q')
+        self._title_len = array('i')
+        self._desc_off = array('q')
+        self._desc_len = array('i')
+        self._arena = bytearray()
+        self._garbage = 0
+        self._count = 0
+
+    # -- string arena -----------------------------------------------------
+
+    def _append_string(self, value: str):
+        """Append a string to the arena, returning (offset, length)."""
+        encoded = value.encode("utf-8")
+        offset = len(self._arena)
+        self._arena += encoded
+        return offset, len(encoded)
+
+    def _read_title(self, row: int) -> str:
+        offset = self._title_off[row]
+        return self._arena[offset:offset + self._title_len[row]].decode("utf-8")
+
+    def _read_description(self, row: int) -> Optional[str]:
+        length = self._desc_len[row]
+        if length < 0:
+            return None
+        offset = self._desc_off[row]
+        return self._arena[offset:offset + length].decode("utf-8")
+
+    def _write_title(self, row: int, value: str):
+        self._garbage += self._title_len[row]
+        self._title_off[row], self._title_len[row] = self._append_string(value)
+        self._maybe_compact()
+
+    def _write_description(self, row: int, value: Optional[str]):
+        self._garbage += max(self._desc_len[row], 0)
+        if value is None:
+            self._desc_off[row], self._desc_len[row] = 0, -1
+        else:
+            self._desc_off[row], self._desc_len[row] = self._append_string(value)
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        """Compact the arena once more than half of it is garbage."""
+        if self._garbage > 4096 and self._garbage * 2 > len(self._arena):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the string arena, dropping bytes no live row refers to."""
+        arena = bytearray()
+        for row in range(len(self._state)):
+            if self._state[row] == _ABSENT:
+                continue
+            offset, length = self._title_off[row], self._title_len[row]
+            self._title_off[row] = len(arena)
+            arena += self._arena[offset:offset + length]
+            length = self._desc_len[row]
+            if length >= 0:
+                offset = self._desc_off[row]
+                self._desc_off[row] = len(arena)
+                arena += self._arena[offset:offset + length]
+        self._arena = arena
+        self._garbage = 0
+
+    # -- mapping protocol -------------------------------------------------
+
+    def _row(self, todo_id: int) -> int:
+        """Translate an ID into a live row number, raising KeyError if absent."""
+        if todo_id not in self:
+            raise KeyError(todo_id)
+        return todo_id - 1
+
+    def __getitem__(self, todo_id: int) -> TodoView:
+        self._row(todo_id)
+        return TodoView(self, todo_id)
+
+    def __setitem__(self, todo_id: int, todo):
+        """Pack a Todo (or TodoView) into the row for its ID."""
+        row = todo_id - 1
+        if row < 0:
+            raise KeyError(todo_id)
+        # Grow the columns with absent rows up to the requested one
+        while len(self._state) <= row:
+            self._state.append(_ABSENT)
+            self._title_off.append(0)
+            self._title_len.append(0)
+            self._desc_off.append(0)
+            self._desc_len.append(-1)
+
+        title, description = todo.title, todo.description
+        if self._state[row] == _ABSENT:
+            self._count += 1
+        else:
+            self._garbage += self._title_len[row] + max(self._desc_len[row], 0)
+        self._title_off[row], self._title_len[row] = self._append_string(title)
+        if description is None:
+            self._desc_off[row], self._desc_len[row] = 0, -1
+        else:
+            self._desc_off[row], self._desc_len[row] = self._append_string(description)
+        self._state[row] = _COMPLETED if todo.completed else _PENDING
+
+    def __delitem__(self, todo_id: int):
+        row = self._row(todo_id)
+        self._garbage += self._title_len[row] + max(self._desc_len[row], 0)
+        self._state[row] = _ABSENT
+        self._desc_len[row] = -1
+        self._title_len[row] = 0
+        self._count -= 1
+        self._maybe_compact()
+
+    def pop(self, todo_id: int, *default):
+        """
+        Remove a row and return its contents as a standalone Todo.
+
+        A view would be useless here, since the row it refers to is gone.
+        """
+        if todo_id not in self:
+            if default:
+                return default[0]
+            raise KeyError(todo_id)
+        todo = TodoView(self, todo_id).to_todo()
+        del self[todo_id]
+        return todo
+
+    def __contains__(self, todo_id) -> bool:
+        row = todo_id - 1 if isinstance(todo_id, int) else -1
+        return 0 <= row < len(self._state) and self._state[row] != _ABSENT
+
+    def __iter__(self) -> Iterator[int]:
+        state = self._state
+        for row in range(len(state)):
+            if state[row] != _ABSENT:
+                yield row + 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def irange(self, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[int]:
+        """
+        Iterate over the stored IDs between start and end (inclusive) in order.
+
+        Rows are addressed by ID, so the range maps straight onto a slice
+        of the state column.
+        """
+        state = self._state
+        first = max(start or 1, 1) - 1
+        last = len(state) if end is None else min(end, len(state))
+        for row in range(first, last):
+            if state[row] != _ABSENT:
+                yield row + 1
+
+    def nbytes(self) -> int:
+        """Return the number of bytes held by the columns and the arena."""
+        columns = (self._state, self._title_off, self._title_len,
+                   self._desc_off, self._desc_len)
+        return sum(len(col) * col.itemsize for col in columns) + len(self._arena)
+
+
+class CompactTodoRepository(TodoRepository):
+    """
+    TodoRepository variant that keeps its tasks in a ColumnarTodoStore.
+
+    The public API is identical to TodoRepository; get_todo, list_todos and
+    the mutation methods hand out TodoView objects instead of Todo objects.
+    """
+
+    def __init__(self):
+        """Initialize the repository with an empty columnar store."""
+        super().__init__()
+        self._storage = ColumnarTodoStore()
+        # The rows are already ordered by ID, so no separate ID index is kept
+        self._id_index = None
+
+    def _ids_between(self, start_id: Optional[int], end_id: Optional[int]) -> Iterator[int]:
+        """Iterate over the stored IDs between start_id and end_id by scanning the rows."""
+        return self._storage.irange(start_id, end_id)
+
+    def add_todo(self, title: str, description: Optional[str] = None) -> TodoView:
+        """
+        Add a new todo to the repository.
+
+        Args:
+            title: The title of the todo
+            description: Optional description of the todo
+
+        Returns:
+            A TodoView onto the newly stored task
+        """
+        todo = super().add_todo(title, description)
+        return self._storage[todo.id]
+
+    def add_many(self, items: Iterable[Tuple[str, Optional[str]]]) -> BulkResult:
+        """
+        Add many todos at once.
+
+        Args:
+            items: (title, description) pairs
+
+        Returns:
+            A BulkResult whose created todos are TodoViews onto the new rows
+        """
+        result = super().add_many(items)
+        result.succeeded = [self._storage[todo.id] for todo in result.succeeded]
+        return result
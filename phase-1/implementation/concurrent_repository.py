@@ -0,0 +1,247 @@
+"""
+Thread-safe task repository for the todo application.
+"""
+import threading
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+try:
+    from implementation.range_index import SortedIdIndex
+    from implementation.repository import TodoRepository
+    from implementation.search_index import InvertedIndex
+    from implementation.todo_model import Todo
+    from implementation.validation import validate_task_title
+except ImportError:
+    from range_index import SortedIdIndex
+    from repository import TodoRepository
+    from search_index import InvertedIndex
+    from todo_model import Todo
+    from validation import validate_task_title
+
+
+class IdAllocator:
+    """
+    Hands out unique, increasing task IDs to concurrent callers.
+    """
+
+    def __init__(self, start: int = 1):
+        """
+        Initialize the allocator.
+
+        Args:
+            start: The first ID to hand out
+        """
+        self._next = start
+        self._lock = threading.Lock()
+
+    def allocate(self) -> int:
+        """Reserve and return the next ID."""
+        with self._lock:
+            todo_id = self._next
+            self._next += 1
+            return todo_id
+
+    def allocate_block(self, count: int) -> range:
+        """
+        Reserve a contiguous block of IDs.
+
+        Args:
+            count: The number of IDs to reserve
+
+        Returns:
+            The reserved IDs
+        """
+        with self._lock:
+            start = self._next
+            self._next += count
+            return range(start, start + count)
+
+    @property
+    def next_id(self) -> int:
+        """The ID the next call to allocate() will return."""
+        return self._next
+
+
+class SynchronizedIndex(InvertedIndex):
+    """InvertedIndex whose operations are serialized by an internal lock."""
+
+    def __init__(self):
+        """Initialize an empty index and its lock."""
+        super().__init__()
+        self._lock = threading.Lock()
+
+    def add(self, doc_id: int, text: str):
+        """Index the tokens of a document."""
+        with self._lock:
+            super().add(doc_id, text)
+
+    def remove(self, doc_id: int, text: str):
+        """Remove a document from the index."""
+        with self._lock:
+            super().remove(doc_id, text)
+
+    def search(self, query: str) -> List[int]:
+        """Find documents matching every term of a query."""
+        with self._lock:
+            return super().search(query)
+
+
+class SynchronizedIdIndex(SortedIdIndex):
+    """SortedIdIndex whose operations are serialized by an internal lock."""
+
+    # Number of IDs copied out per lock acquisition while iterating
+    BATCH = 256
+
+    def __init__(self):
+        """Initialize an empty index and its lock."""
+        super().__init__()
+        self._lock = threading.Lock()
+
+    def add(self, todo_id: int):
+        """Add an ID to the index."""
+        with self._lock:
+            super().add(todo_id)
+
+    def discard(self, todo_id: int):
+        """Remove an ID from the index if it is present."""
+        with self._lock:
+            super().discard(todo_id)
+
+    def irange(self, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[int]:
+        """
+        Iterate over the IDs between start and end while other threads keep changing the index.
+
+        IDs are copied out in batches under the lock, and each batch resumes
+        after the last ID of the previous one.
+        """
+        while True:
+            with self._lock:
+                batch = list(islice(super().irange(start, end), self.BATCH))
+            yield from batch
+            if len(batch) < self.BATCH:
+                return
+            start = batch[-1] + 1
+
+
+class ConcurrentTodoRepository(TodoRepository):
+    """
+    TodoRepository that can be shared by several threads.
+
+    IDs come from an IdAllocator, and every mutation of a task runs under
+    one of `stripes` locks, chosen by the block of `stripe_width`
+    consecutive IDs the task belongs to. Mutations of tasks in different
+    stripes therefore never wait for each other. The storage dictionary and
+    the completion index sets are only touched with single dict/set
+    operations, which are atomic in CPython, while the full-text index has
+    its own lock because its updates span several structures.
+    """
+
+    def __init__(self, stripes: int = 64, stripe_width: int = 16):
+        """
+        Initialize the repository.
+
+        Args:
+            stripes: Number of locks guarding task mutations
+            stripe_width: Number of consecutive IDs that share a lock
+        """
+        super().__init__()
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        self._stripe_width = stripe_width
+        # Built eagerly: building lazily would race with concurrent inserts
+        self._search_index = SynchronizedIndex()
+        self._id_index = SynchronizedIdIndex()
+
+    def _lock_for(self, todo_id: int) -> threading.Lock:
+        """Return the lock guarding the stripe a task ID belongs to."""
+        return self._stripes[(todo_id // self._stripe_width) % len(self._stripes)]
+
+    @property
+    def _next_id(self) -> int:
+        """The next ID to be allocated, as tracked by TodoRepository."""
+        return self._ids.next_id
+
+    @_next_id.setter
+    def _next_id(self, value: int):
+        # Assigning the next ID (as TodoRepository.__init__ does) restarts the allocator
+        self._ids = IdAllocator(value)
+
+    def add_todo(self, title: str, description: Optional[str] = None) -> Todo:
+        """
+        Add a new todo to the repository.
+
+        Args:
+            title: The title of the todo
+            description: Optional description of the todo
+
+        Returns:
+            The created Todo object with assigned ID
+        """
+        # Validate before allocating, so rejected titles do not burn IDs
+        if not validate_task_title(title):
+            raise ValueError("Title cannot be empty or whitespace only")
+        todo_id = self._ids.allocate()
+        todo = Todo(id=todo_id, title=title, description=description, completed=False)
+        self._insert_todo(todo)
+        return todo
+
+    def _insert_todo(self, todo: Todo):
+        """Store and index a new todo under its stripe lock, including for add_many."""
+        with self._lock_for(todo.id):
+            super()._insert_todo(todo)
+
+    def _allocate_ids(self, count: int) -> range:
+        """Reserve a contiguous block of IDs from the shared allocator."""
+        return self._ids.allocate_block(count)
+
+    def _apply_update(self, todo_id: int, title: Optional[str],
+                      description: Optional[str]) -> Optional[Todo]:
+        """Write field changes to a todo under its stripe lock."""
+        with self._lock_for(todo_id):
+            return super()._apply_update(todo_id, title, description)
+
+    def _remove_todo(self, todo_id: int) -> Optional[Todo]:
+        """Remove a todo under its stripe lock."""
+        with self._lock_for(todo_id):
+            return super()._remove_todo(todo_id)
+
+    def _set_completed(self, todo_id: int, completed: bool) -> Optional[Todo]:
+        """Set a todo's completion status under its stripe lock."""
+        with self._lock_for(todo_id):
+            return super()._set_completed(todo_id, completed)
+
+    def toggle_completion(self, todo_id: int) -> Optional[Todo]:
+        """Toggle a todo's completion status under its stripe lock."""
+        with self._lock_for(todo_id):
+            return super().toggle_completion(todo_id)
+
+    def _todos_for(self, todo_ids: Iterable[int]) -> List[Todo]:
+        """Look up the todos for indexed IDs, leaving out any deleted meanwhile by another thread."""
+        return [todo for todo in map(self._storage.get, todo_ids) if todo is not None]
+
+    def iter_todos(self) -> Iterator[Todo]:
+        """
+        Iterate over all todos while other threads keep changing the repository.
+
+        Todos added after the iteration starts are not visited, and todos
+        deleted before they are reached are skipped.
+
+        Returns:
+            An iterator over the Todo objects, ordered by ID
+        """
+        storage = self._storage
+        for todo_id in list(storage):
+            todo = storage.get(todo_id)
+            if todo is not None:
+                yield todo
+
+    def search_todos(self, query: str) -> List[Todo]:
+        """
+        Find todos whose title or description matches every query term.
+
+        Args:
+            query: The free-text query
+
+        Returns:
+            The matching Todo objects, ordered by ID
+        """
+        ids = self._search_index.search(query)
+        return [todo for todo in map(self._storage.get, ids) if todo is not None]
@@ -2,16 +2,157 @@
 """
 Main entry point for the in-memory console todo application.
 """
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+from typing import Iterable, List, TextIO
+
+if not __package__:
+    # Run as a script: put the package's parent on the path so the imports
+    # below resolve on their first try instead of failing over to flat names
+    sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 try:
     from implementation.cli import TodoCLI
+    from implementation.service import TodoService
 except ImportError:
     from cli import TodoCLI
+    from service import TodoService
+
+BACKENDS = ("dict", "compact", "concurrent", "versioned", "durable", "sqlite")
+# Command-line option name -> attribute of the parsed options
+_OPTIONS = {"--backend": "backend", "--data-dir": "data_dir", "--batch": "batch"}
+
+
+def _parse_with_argparse(argv: List[str]):
+    """Parse the options with argparse, which also handles --help and usage errors."""
+    import argparse
+    parser = argparse.ArgumentParser(description="In-memory console todo application")
+    parser.add_argument("--backend", choices=BACKENDS,
+                        help="storage backend (default: $TODO_BACKEND, or 'durable' with "
+                             "--data-dir, else 'dict'; 'versioned' enables UNDO/REDO)")
+    parser.add_argument("--data-dir",
+                        help="persist tasks to this directory (default: $TODO_DATA_DIR)")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run commands from FILE ('-' for stdin) without prompting")
+    return parser.parse_args(argv)
+
+
+def parse_args(argv=None):
+    """
+    Parse the command-line options.
+
+    Well-formed option lists are parsed by hand, so argparse, the largest
+    import on the startup path, is only loaded for --help and usage errors.
+
+    Args:
+        argv: The arguments to parse (defaults to sys.argv[1:])
+
+    Returns:
+        A namespace with backend, data_dir and batch attributes
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    options = dict.fromkeys(_OPTIONS.values())
+    position = 0
+    while position < len(argv):
+        name, has_value, value = argv[position].partition("=")
+        if name not in _OPTIONS:
+            return _parse_with_argparse(argv)
+        if not has_value:
+            position += 1
+            if position == len(argv) or argv[position].startswith("--"):
+                return _parse_with_argparse(argv)
+            value = argv[position]
+        options[_OPTIONS[name]] = value
+        position += 1
+    if options["backend"] is not None and options["backend"] not in BACKENDS:
+        return _parse_with_argparse(argv)
+    return SimpleNamespace(**options)
+
+
+def run_batch(cli: TodoCLI, lines: Iterable[str], output: TextIO,
+              flush_every: int = 4096) -> int:
+    """
+    Dispatch a stream of commands through the CLI without prompting.
+
+    Command output is collected in memory and written to `output` in blocks
+    of `flush_every` commands instead of one print per line, and each block
+    runs in one service transaction. Blank lines and lines starting with '#'
+    are skipped, and an EXIT command stops the run.
+
+    Args:
+        cli: The CLI to dispatch the commands through
+        lines: The command lines to run
+        output: Stream that receives the buffered command output
+        flush_every: Number of commands between writes to `output`
+
+    Returns:
+        The number of commands executed
+    """
+    executed = 0
+    buffer = io.StringIO()
+    lines = iter(lines)
+    with redirect_stdout(buffer):
+        while cli.running:
+            block = 0
+            with cli.service.transaction():
+                for line in lines:
+                    command_line = line.strip()
+                    if not command_line or command_line.startswith("#"):
+                        continue
+                    cli.process_command(command_line)
+                    block += 1
+                    if block == flush_every or not cli.running:
+                        break
+            executed += block
+            output.write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+            if block < flush_every:
+                break
+    output.flush()
+    return executed
+
+
+def main_batch(cli: TodoCLI, path: str):
+    """
+    Run a command script and print a throughput summary to stderr.
+
+    Args:
+        cli: The CLI to dispatch the commands through
+        path: Path of the script, or '-' to read from stdin
+    """
+    start = time.perf_counter()
+    if path == "-":
+        executed = run_batch(cli, sys.stdin, sys.stdout)
+    else:
+        with open(path, "r", encoding="utf-8") as script:
+            executed = run_batch(cli, script, sys.stdout)
+    elapsed = time.perf_counter() - start
+    task_count = cli.service.count_tasks()
+    cli.close()
+
+    rate = executed / elapsed if elapsed > 0 else float("inf")
+    print(f"Batch complete: {executed} commands in {elapsed:.3f}s "
+          f"({rate:,.0f} commands/s, {task_count} tasks)",
+          file=sys.stderr)
 
 
-def main():
+def main(argv=None):
     """Entry point for the application."""
-    cli = TodoCLI()
-    cli.run()
+    args = parse_args(argv)
+    backend = args.backend
+    if backend is None and args.data_dir and "TODO_BACKEND" not in os.environ:
+        backend = "durable"
+    service = TodoService(backend=backend, data_dir=args.data_dir)
+    cli = TodoCLI(service)
+    if args.batch:
+        main_batch(cli, args.batch)
+    else:
+        cli.run()
 
 
 if __name__ == "__main__":
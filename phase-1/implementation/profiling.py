@@ -0,0 +1,221 @@
+"""
+Command profiling for the todo application: latencies, allocations and sizes.
+
+A CommandProfiler times every command dispatched while it is active into a
+per-command histogram of power-of-two microsecond buckets, and measures the
+memory each command allocates with tracemalloc. It can also run cProfile
+for the whole session and write the result to a file for pstats or
+snakeviz. None of this costs anything while profiling is off.
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from types import BuiltinFunctionType, FunctionType, ModuleType
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Number of latency buckets; bucket k holds latencies below 2**k microseconds
+# and the last one everything slower
+HISTOGRAM_BUCKETS = 24
+# Frames kept per traced allocation
+TRACE_FRAMES = 1
+# Objects shared by every instance rather than owned by one
+_SHARED_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType)
+# Allocations inside the application's own modules
+_PACKAGE_FILES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "*")
+
+
+def deep_size(root: object) -> int:
+    """
+    Estimate the memory held by an object and everything it references.
+
+    Classes, modules and functions are shared rather than owned, so they
+    are neither counted nor followed. The walk visits every reachable
+    object once, so it takes time proportional to their number.
+
+    Args:
+        root: The object to measure
+
+    Returns:
+        The summed sys.getsizeof of every reachable object, in bytes
+    """
+    seen = {id(root)}
+    pending = [root]
+    total = 0
+    while pending:
+        obj = pending.pop()
+        total += sys.getsizeof(obj)
+        for referent in gc.get_referents(obj):
+            if id(referent) not in seen and not isinstance(referent, _SHARED_TYPES):
+                seen.add(id(referent))
+                pending.append(referent)
+    return total
+
+
+class CommandStats:
+    """
+    Latency and allocation totals of one command.
+
+    Attributes:
+        count: Number of times the command ran
+        total_ns: Summed latency in nanoseconds
+        buckets: Latency histogram; buckets[k] counts runs faster than
+            2**k microseconds (and not faster than 2**(k-1))
+        allocated: Summed net bytes allocated (negative when freed)
+        peak: Largest extra memory in use during a single run, in bytes
+    """
+
+    __slots__ = ("count", "total_ns", "buckets", "allocated", "peak")
+
+    def __init__(self):
+        """Initialize empty totals."""
+        self.count = 0
+        self.total_ns = 0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.allocated = 0
+        self.peak = 0
+
+    def record(self, elapsed_ns: int, allocated: int, peak: int):
+        """
+        Add one run of the command.
+
+        Args:
+            elapsed_ns: Latency of the run in nanoseconds
+            allocated: Net bytes allocated by the run
+            peak: Extra memory in use at the peak of the run, in bytes
+        """
+        self.count += 1
+        self.total_ns += elapsed_ns
+        self.buckets[min((elapsed_ns // 1000).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        self.allocated += allocated
+        if peak > self.peak:
+            self.peak = peak
+
+    def percentile(self, fraction: float) -> int:
+        """
+        Return an upper bound of a latency percentile from the histogram.
+
+        Args:
+            fraction: The percentile as a fraction, e.g. 0.99
+
+        Returns:
+            The upper bound, in microseconds, of the bucket holding the percentile
+        """
+        rank = max(1, round(self.count * fraction))
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return 2 ** bucket
+        return 2 ** (HISTOGRAM_BUCKETS - 1)
+
+
+class CommandProfiler:
+    """
+    Records per-command statistics between start() and stop().
+
+    Latencies are measured with tracemalloc running, which slows every
+    allocation down, so they are best compared with each other rather
+    than with unprofiled runs.
+    """
+
+    def __init__(self, profile_path: Optional[str] = None):
+        """
+        Initialize the profiler.
+
+        Args:
+            profile_path: If given, also run cProfile and write its
+                statistics to this file when profiling stops
+        """
+        self.profile_path = profile_path
+        self.commands: Dict[str, CommandStats] = {}
+        self.active = False
+        self._started = 0.0
+        self._stopped: Optional[float] = None
+        self._owns_tracing = False
+        self._cprofile = None
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def start(self):
+        """Start tracing allocations and, with a profile path, cProfile."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._owns_tracing = True
+        if self.profile_path:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._started = time.perf_counter()
+        self.active = True
+
+    def stop(self) -> Optional[str]:
+        """
+        Stop profiling, keeping the statistics recorded so far.
+
+        Returns:
+            The path the cProfile statistics were written to, if any
+
+        Raises:
+            OSError: If the cProfile statistics cannot be written
+        """
+        if not self.active:
+            return None
+        self.active = False
+        self._stopped = time.perf_counter()
+        # Keep the allocation sites for STATS after tracing is turned off
+        self._snapshot = tracemalloc.take_snapshot()
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        if self._cprofile is None:
+            return None
+        self._cprofile.disable()
+        self._cprofile.dump_stats(self.profile_path)
+        self._cprofile = None
+        return self.profile_path
+
+    def measure(self, name: str, handler: Callable[[str], None], args: str):
+        """
+        Run a command handler and record its latency and allocations.
+
+        Args:
+            name: The command name the statistics are kept under
+            handler: The handler to run
+            args: The arguments passed to the handler
+        """
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        start = time.perf_counter_ns()
+        try:
+            handler(args)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            current, peak = tracemalloc.get_traced_memory()
+            stats = self.commands.get(name)
+            if stats is None:
+                stats = self.commands[name] = CommandStats()
+            stats.record(elapsed, current - before, peak - before)
+
+    def elapsed(self) -> float:
+        """Return the seconds spent profiling so far."""
+        end = time.perf_counter() if self._stopped is None or self.active else self._stopped
+        return end - self._started
+
+    def top_allocations(self, limit: int = 5) -> List[Tuple[str, int, int]]:
+        """
+        List the application source lines holding the most memory allocated while profiling.
+
+        Args:
+            limit: Maximum number of lines to list
+
+        Returns:
+            (file:line, live allocation count, bytes) tuples, largest first
+        """
+        snapshot = tracemalloc.take_snapshot() if self.active else self._snapshot
+        if snapshot is None:
+            return []
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(True, _PACKAGE_FILES)])
+        return [(f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                 stat.count, stat.size)
+                for stat in snapshot.statistics("lineno")[:limit]]
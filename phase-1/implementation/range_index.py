@@ -0,0 +1,109 @@
+"""
+Ordered index of task IDs for range queries in the todo application.
+"""
+from bisect import bisect_left, insort
+from typing import Iterator, List, Optional
+
+
+class SortedIdIndex:
+    """
+    Keeps task IDs in ascending order for range scans.
+
+    IDs are stored in a list of sorted blocks of at most 2 * LOAD entries,
+    together with the largest ID of every block. A lookup is a binary search
+    over the block maxima followed by one inside a block, so finding where a
+    range starts costs O(log n) and walking k IDs from there costs O(k).
+    Inserts and deletes only shift entries within one block. New IDs are
+    almost always larger than every stored one, so they are appended to the
+    last block without any search.
+    """
+
+    # Target number of IDs per block
+    LOAD = 512
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._blocks: List[List[int]] = []
+        self._maxes: List[int] = []
+        self._len = 0
+
+    def add(self, todo_id: int):
+        """
+        Add an ID to the index.
+
+        Args:
+            todo_id: An ID that is not already in the index
+        """
+        maxes = self._maxes
+        self._len += 1
+        if not maxes or todo_id > maxes[-1]:
+            if maxes and len(self._blocks[-1]) < self.LOAD:
+                self._blocks[-1].append(todo_id)
+                maxes[-1] = todo_id
+            else:
+                self._blocks.append([todo_id])
+                maxes.append(todo_id)
+            return
+
+        index = bisect_left(maxes, todo_id)
+        block = self._blocks[index]
+        insort(block, todo_id)
+        if len(block) > 2 * self.LOAD:
+            half = len(block) // 2
+            self._blocks[index:index + 1] = [block[:half], block[half:]]
+            maxes[index:index + 1] = [block[half - 1], block[-1]]
+
+    def discard(self, todo_id: int):
+        """
+        Remove an ID from the index if it is present.
+
+        Args:
+            todo_id: The ID to remove
+        """
+        maxes = self._maxes
+        index = bisect_left(maxes, todo_id)
+        if index == len(maxes):
+            return
+        block = self._blocks[index]
+        position = bisect_left(block, todo_id)
+        if position == len(block) or block[position] != todo_id:
+            return
+        del block[position]
+        self._len -= 1
+        if block:
+            maxes[index] = block[-1]
+        else:
+            del self._blocks[index]
+            del maxes[index]
+
+    def irange(self, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[int]:
+        """
+        Iterate over the IDs between start and end (both inclusive) in order.
+
+        The index must not be changed while the iteration is running.
+
+        Args:
+            start: The smallest ID to return, or None for no lower bound
+            end: The largest ID to return, or None for no upper bound
+
+        Returns:
+            An iterator over the matching IDs
+        """
+        if start is None:
+            index = position = 0
+        else:
+            index = bisect_left(self._maxes, start)
+            if index == len(self._maxes):
+                return
+            position = bisect_left(self._blocks[index], start)
+        blocks = self._blocks
+        for index in range(index, len(blocks)):
+            block = blocks[index]
+            if end is not None and block[-1] > end:
+                yield from block[position:bisect_left(block, end + 1)]
+                return
+            yield from block[position:] if position else block
+            position = 0
+
+    def __len__(self) -> int:
+        return self._len
@@ -1,11 +1,49 @@
 """
 In-memory task repository for the todo application.
 """
-from typing import Dict, List, Optional
+import sys
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 try:
+    from implementation.range_index import SortedIdIndex
     from implementation.todo_model import Todo
+    from implementation.validation import validate_task_title
 except ImportError:
+    from range_index import SortedIdIndex
     from todo_model import Todo
+    from validation import validate_task_title
+
+EMPTY_TITLE_ERROR = "Title cannot be empty or whitespace only"
+
+
+def _new_search_index():
+    """Create an InvertedIndex, importing it on first use to keep it off the startup path."""
+    try:
+        from implementation.search_index import InvertedIndex
+    except ImportError:
+        from search_index import InvertedIndex
+    return InvertedIndex()
+
+
+def _searchable_text(title: str, description: Optional[str]) -> str:
+    """Combine the fields of a todo that are covered by full-text search."""
+    return f"{title} {description}" if description else title
+
+
+@dataclass
+class BulkResult:
+    """
+    Outcome of a bulk operation.
+
+    Attributes:
+        succeeded: The todos that were created, changed or deleted
+        failed: (key, error message) pairs for the items that were rejected,
+            where the key is the item's position for add_many and its ID
+            for every other bulk operation
+    """
+    succeeded: List[Todo] = field(default_factory=list)
+    failed: List[Tuple[Any, str]] = field(default_factory=list)
 
 
 class TodoRepository:
@@ -17,9 +55,16 @@ class TodoRepository:
     """
 
     def __init__(self):
-        """Initialize the repository with an empty storage and ID counter."""
+        """Initialize the repository with an empty storage, ID counter and indexes."""
         self._storage: Dict[int, Todo] = {}
         self._next_id = 1
+        # Secondary indexes on completion status, kept in step with _storage
+        self._completed_ids: Set[int] = set()
+        self._pending_ids: Set[int] = set()
+        # Ordered index of every stored ID, for range queries
+        self._id_index: Optional[SortedIdIndex] = SortedIdIndex()
+        # Full-text index over titles and descriptions, built on first search
+        self._search_index = None
 
     def add_todo(self, title: str, description: Optional[str] = None) -> Todo:
         """
@@ -33,10 +78,88 @@ class TodoRepository:
             The created Todo object with assigned ID
         """
         todo = Todo(id=self._next_id, title=title, description=description, completed=False)
-        self._storage[self._next_id] = todo
+        self._insert_todo(todo)
         self._next_id += 1
         return todo
 
+    def _insert_todo(self, todo: Todo):
+        """
+        Store a todo under its ID and add it to the secondary indexes.
+
+        Args:
+            todo: The todo to store; its ID must not be in use
+        """
+        self._storage[todo.id] = todo
+        self._index_todo(todo)
+
+    def _index_todo(self, todo: Todo):
+        """Add a stored todo to the secondary indexes."""
+        (self._completed_ids if todo.completed else self._pending_ids).add(todo.id)
+        if self._id_index is not None:
+            self._id_index.add(todo.id)
+        if self._search_index is not None:
+            self._search_index.add(todo.id, _searchable_text(todo.title, todo.description))
+
+    def _unindex_todo(self, todo: Todo):
+        """Remove a todo from the secondary indexes."""
+        if self._search_index is not None:
+            self._search_index.remove(todo.id, _searchable_text(todo.title, todo.description))
+        self._completed_ids.discard(todo.id)
+        self._pending_ids.discard(todo.id)
+        if self._id_index is not None:
+            self._id_index.discard(todo.id)
+
+    def _writable(self, todo_id: int) -> Optional[Todo]:
+        """
+        Return the stored todo that is about to be modified in place.
+
+        Mutations fetch todos through this hook so that storage which shares
+        todos between versions can hand out a private copy first.
+        """
+        return self._storage.get(todo_id)
+
+    def _allocate_ids(self, count: int) -> range:
+        """
+        Reserve a contiguous block of IDs.
+
+        Args:
+            count: The number of IDs to reserve
+
+        Returns:
+            The reserved IDs
+        """
+        start = self._next_id
+        self._next_id += count
+        return range(start, start + count)
+
+    def add_many(self, items: Iterable[Tuple[str, Optional[str]]]) -> BulkResult:
+        """
+        Add many todos at once.
+
+        All titles are validated in a single pass before anything is stored,
+        and the valid items receive one contiguous block of IDs.
+
+        Args:
+            items: (title, description) pairs
+
+        Returns:
+            A BulkResult with the created todos and the rejected positions
+        """
+        result = BulkResult()
+        valid = []
+        for position, (title, description) in enumerate(items):
+            if validate_task_title(title):
+                valid.append((title, description))
+            else:
+                result.failed.append((position, EMPTY_TITLE_ERROR))
+
+        from_validated = Todo.from_validated
+        for todo_id, (title, description) in zip(self._allocate_ids(len(valid)), valid):
+            todo = from_validated(todo_id, title, description)
+            self._insert_todo(todo)
+            result.succeeded.append(todo)
+        return result
+
     def get_todo(self, todo_id: int) -> Optional[Todo]:
         """
         Retrieve a todo by its ID.
@@ -49,14 +172,72 @@ class TodoRepository:
         """
         return self._storage.get(todo_id)
 
-    def list_todos(self) -> List[Todo]:
+    def list_todos(self, completed: Optional[bool] = None, start_id: Optional[int] = None,
+                   end_id: Optional[int] = None, limit: Optional[int] = None) -> List[Todo]:
         """
-        Get all todos in the repository.
+        Get all todos in the repository, optionally filtered by status and ID range.
+
+        Status-filtered listings are served from the completion indexes, so
+        their cost depends on the number of matching todos rather than the
+        total. Ranged or limited listings walk the ordered ID index from
+        start_id, costing O(log n + k) for k returned todos (plus the
+        non-matching IDs skipped when a status is also given).
+
+        Args:
+            completed: If given, only return todos with this completion status
+            start_id: If given, only return todos with at least this ID
+            end_id: If given, only return todos with at most this ID
+            limit: If given, return at most this many todos
 
         Returns:
-            A list of all Todo objects
+            A list of matching Todo objects, ordered by ID
         """
-        return list(self._storage.values())
+        if start_id is not None or end_id is not None or limit is not None:
+            ids = self._ids_between(start_id, end_id)
+            if completed is not None:
+                status_ids = self._completed_ids if completed else self._pending_ids
+                ids = (todo_id for todo_id in ids if todo_id in status_ids)
+            if limit is not None:
+                # islice takes at most sys.maxsize; no list gets that long
+                ids = islice(ids, min(max(limit, 0), sys.maxsize))
+            return self._todos_for(ids)
+        if completed is None:
+            return list(self._storage.values())
+        return self._todos_for(sorted(self._completed_ids if completed else self._pending_ids))
+
+    def _todos_for(self, todo_ids: Iterable[int]) -> List[Todo]:
+        """Look up the todos for IDs taken from one of the indexes."""
+        storage = self._storage
+        return [storage[todo_id] for todo_id in todo_ids]
+
+    def _ids_between(self, start_id: Optional[int], end_id: Optional[int]) -> Iterator[int]:
+        """Iterate over the stored IDs between start_id and end_id (inclusive) in order."""
+        return self._id_index.irange(start_id, end_id)
+
+    def iter_todos(self) -> Iterator[Todo]:
+        """
+        Iterate over all todos without building a list of them.
+
+        The repository must not be changed while the iteration is running.
+
+        Returns:
+            An iterator over the Todo objects, ordered by ID
+        """
+        return iter(self._storage.values())
+
+    def count_todos(self, completed: Optional[bool] = None) -> int:
+        """
+        Count the todos in the repository, optionally filtered by status.
+
+        Args:
+            completed: If given, only count todos with this completion status
+
+        Returns:
+            The number of matching todos
+        """
+        if completed is None:
+            return len(self._storage)
+        return len(self._completed_ids if completed else self._pending_ids)
 
     def update_todo(self, todo_id: int, title: Optional[str] = None,
                     description: Optional[str] = None) -> Optional[Todo]:
@@ -74,20 +255,92 @@ class TodoRepository:
         if todo_id not in self._storage:
             return None
 
-        todo = self._storage[todo_id]
-
         if title is not None:
             # Validate that title is not empty after stripping whitespace
             if not title or not title.strip():
-                raise ValueError("Title cannot be empty or whitespace only")
+                raise ValueError(EMPTY_TITLE_ERROR)
+
+        return self._apply_update(todo_id, title, description)
+
+    def _apply_update(self, todo_id: int, title: Optional[str],
+                      description: Optional[str]) -> Optional[Todo]:
+        """
+        Write already-validated field changes to a todo and its search entry.
+
+        Returns:
+            The updated Todo object, or None if the todo doesn't exist
+        """
+        todo = self._writable(todo_id)
+        if todo is None:
+            return None
+
+        search_index = self._search_index
+        if search_index is not None:
+            search_index.remove(todo_id, _searchable_text(todo.title, todo.description))
+
+        if title is not None:
             todo.title = title
 
         if description is not None:
             todo.description = description
 
+        if search_index is not None:
+            search_index.add(todo_id, _searchable_text(todo.title, todo.description))
         return todo
 
-    def delete_todo(self, todo_id: int) -> bool:
+    def update_many(self, updates: Iterable[Tuple[int, Optional[str], Optional[str]]]) -> BulkResult:
+        """
+        Update many todos at once.
+
+        Every update is checked in a single pass before any is applied.
+
+        Args:
+            updates: (id, new title or None, new description or None) triples
+
+        Returns:
+            A BulkResult with the updated todos and the rejected IDs
+        """
+        result = BulkResult()
+        valid = []
+        exists = self.exists
+        for todo_id, title, description in updates:
+            if not exists(todo_id):
+                result.failed.append((todo_id, f"Task with ID {todo_id} does not exist"))
+            elif title is not None and not validate_task_title(title):
+                result.failed.append((todo_id, EMPTY_TITLE_ERROR))
+            else:
+                valid.append((todo_id, title, description))
+
+        for todo_id, title, description in valid:
+            todo = self._apply_update(todo_id, title, description)
+            if todo is None:
+                result.failed.append((todo_id, f"Task with ID {todo_id} does not exist"))
+            else:
+                result.succeeded.append(todo)
+        return result
+
+    def search_todos(self, query: str) -> List[Todo]:
+        """
+        Find todos whose title or description matches every query term.
+
+        Terms are matched case-insensitively as word prefixes, so "gro" finds
+        "Buy groceries".
+
+        Args:
+            query: The free-text query
+
+        Returns:
+            The matching Todo objects, ordered by ID
+        """
+        if self._search_index is None:
+            # Build the index on first use, so stores that are never searched
+            # (or are being bulk-loaded) do not pay for tokenizing every task
+            self._search_index = _new_search_index()
+            for todo in self._storage.values():
+                self._search_index.add(todo.id, _searchable_text(todo.title, todo.description))
+        return [self._storage[todo_id] for todo_id in self._search_index.search(query)]
+
+    def delete_todo(self, todo_id: int) -> Optional[Todo]:
         """
         Delete a todo by its ID.
 
@@ -95,13 +348,38 @@ class TodoRepository:
             todo_id: The ID of the todo to delete
 
         Returns:
-            True if the todo was deleted, False if it didn't exist
+            The deleted Todo object, or None if it didn't exist
         """
-        if todo_id not in self._storage:
-            return False
+        return self._remove_todo(todo_id)
 
-        del self._storage[todo_id]
-        return True
+    def _remove_todo(self, todo_id: int) -> Optional[Todo]:
+        """Remove a todo from storage and every index, returning it if it existed."""
+        todo = self._storage.pop(todo_id, None)
+        if todo is None:
+            return None
+
+        self._unindex_todo(todo)
+        return todo
+
+    def delete_many(self, todo_ids: Iterable[int]) -> BulkResult:
+        """
+        Delete many todos at once.
+
+        Args:
+            todo_ids: The IDs of the todos to delete
+
+        Returns:
+            A BulkResult with the deleted todos and the IDs that didn't exist
+        """
+        result = BulkResult()
+        remove = self._remove_todo
+        for todo_id in todo_ids:
+            todo = remove(todo_id)
+            if todo is None:
+                result.failed.append((todo_id, f"Task with ID {todo_id} does not exist"))
+            else:
+                result.succeeded.append(todo)
+        return result
 
     def toggle_completion(self, todo_id: int) -> Optional[Todo]:
         """
@@ -113,13 +391,56 @@ class TodoRepository:
         Returns:
             The updated Todo object if successful, None if todo doesn't exist
         """
-        if todo_id not in self._storage:
+        todo = self._writable(todo_id)
+        if todo is None:
             return None
 
-        todo = self._storage[todo_id]
         todo.toggle_completion()
+        self._reindex_status(todo_id, todo.completed)
         return todo
 
+    def _reindex_status(self, todo_id: int, completed: bool):
+        """Move a todo ID to the completion index matching its new status."""
+        if completed:
+            self._pending_ids.discard(todo_id)
+            self._completed_ids.add(todo_id)
+        else:
+            self._completed_ids.discard(todo_id)
+            self._pending_ids.add(todo_id)
+
+    def _set_completed(self, todo_id: int, completed: bool) -> Optional[Todo]:
+        """Set a todo's completion status, returning it if it exists."""
+        todo = self._writable(todo_id)
+        if todo is None:
+            return None
+        todo.completed = completed
+        self._reindex_status(todo_id, completed)
+        return todo
+
+    def complete_many(self, todo_ids: Iterable[int], completed: bool = True) -> BulkResult:
+        """
+        Set the completion status of many todos at once.
+
+        Unlike toggle_completion this sets an explicit status, so repeating
+        the call is harmless.
+
+        Args:
+            todo_ids: The IDs of the todos to change
+            completed: The status to set
+
+        Returns:
+            A BulkResult with the changed todos and the IDs that didn't exist
+        """
+        result = BulkResult()
+        set_completed = self._set_completed
+        for todo_id in todo_ids:
+            todo = set_completed(todo_id, completed)
+            if todo is None:
+                result.failed.append((todo_id, f"Task with ID {todo_id} does not exist"))
+            else:
+                result.succeeded.append(todo)
+        return result
+
     def exists(self, todo_id: int) -> bool:
         """
         Check if a todo with the given ID exists.
@@ -130,4 +451,23 @@ class TodoRepository:
         Returns:
             True if the todo exists, False otherwise
         """
-        return todo_id in self._storage
\ No newline at end of file
+        return todo_id in self._storage
+
+    def storage_bytes(self) -> int:
+        """
+        Estimate the memory held by the repository, including its indexes.
+
+        This walks every object the repository references, so it takes
+        time proportional to the number of tasks.
+
+        Returns:
+            The estimated size in bytes
+        """
+        try:
+            from implementation.profiling import deep_size
+        except ImportError:
+            from profiling import deep_size
+        return deep_size(self)
+
+    def close(self):
+        """Release any resources held by the repository."""
@@ -0,0 +1,133 @@
+"""
+Inverted full-text index for the todo application.
+"""
+import re
+from bisect import bisect_left
+from typing import Dict, List, Set
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> Set[str]:
+    """
+    Split text into a set of lowercase word tokens.
+
+    Args:
+        text: The text to tokenize
+
+    Returns:
+        The distinct tokens found in the text
+    """
+    return set(_TOKEN_PATTERN.findall(text.lower())) if text else set()
+
+
+class InvertedIndex:
+    """
+    Maps word tokens to the IDs of the todos that contain them.
+
+    Alongside the postings the index keeps a sorted vocabulary, so prefix
+    queries are answered with a binary search instead of a scan over every
+    token. New tokens are collected in a small unsorted buffer and merged
+    into the vocabulary in batches, and tokens that lose their last posting
+    are dropped lazily, so indexing never pays for a list insertion.
+    """
+
+    # Number of buffered new tokens that triggers a merge into the vocabulary
+    MERGE_THRESHOLD = 1024
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._postings: Dict[str, Set[int]] = {}
+        self._vocabulary: List[str] = []
+        self._new_tokens: Set[str] = set()
+        self._stale_tokens = 0
+
+    def add(self, doc_id: int, text: str):
+        """
+        Index the tokens of a document.
+
+        Args:
+            doc_id: The ID of the todo being indexed
+            text: The searchable text of the todo
+        """
+        for token in tokenize(text):
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = {doc_id}
+                self._new_tokens.add(token)
+            else:
+                postings.add(doc_id)
+
+    def remove(self, doc_id: int, text: str):
+        """
+        Remove a document from the index.
+
+        Args:
+            doc_id: The ID of the todo to remove
+            text: The text the todo was indexed with
+        """
+        for token in tokenize(text):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[token]
+                if token in self._new_tokens:
+                    self._new_tokens.discard(token)
+                else:
+                    self._stale_tokens += 1
+
+    def _sorted_vocabulary(self) -> List[str]:
+        """Return the vocabulary, merging buffered tokens if there are many."""
+        if len(self._new_tokens) > self.MERGE_THRESHOLD or \
+                self._stale_tokens * 2 > len(self._vocabulary) > 0:
+            # Both inputs are sorted runs, which the sort merges in linear time
+            merged = sorted(self._vocabulary + sorted(self._new_tokens))
+            # Drop tokens without postings and the duplicates left behind when
+            # a dropped token was indexed again
+            postings = self._postings
+            self._vocabulary = [t for i, t in enumerate(merged)
+                                if t in postings and (i == 0 or merged[i - 1] != t)]
+            self._new_tokens = set()
+            self._stale_tokens = 0
+        return self._vocabulary
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        """Return the IDs of documents containing a token starting with prefix."""
+        vocabulary = self._sorted_vocabulary()
+        postings = self._postings
+        tokens = []
+        position = bisect_left(vocabulary, prefix)
+        while position < len(vocabulary) and vocabulary[position].startswith(prefix):
+            if vocabulary[position] in postings:
+                tokens.append(vocabulary[position])
+            position += 1
+        tokens.extend(t for t in self._new_tokens if t.startswith(prefix))
+
+        if len(tokens) == 1:
+            # A single matching token needs no union
+            return postings[tokens[0]]
+        matches: Set[int] = set()
+        for token in tokens:
+            matches |= postings[token]
+        return matches
+
+    def search(self, query: str) -> List[int]:
+        """
+        Find documents matching every term of a query.
+
+        Each query term matches any token it is a prefix of, and a document
+        must match all terms (AND semantics).
+
+        Args:
+            query: The free-text query
+
+        Returns:
+            The matching document IDs in ascending order
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        candidates = sorted((self._prefix_matches(term) for term in terms), key=len)
+        return sorted(candidates[0].intersection(*candidates[1:]))
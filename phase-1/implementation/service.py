@@ -1,14 +1,100 @@
 """
 Application service layer for the todo application.
 """
-from typing import List, Optional
+import os
+import re
+from contextlib import ExitStack, contextmanager, nullcontext
+from typing import ContextManager, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 try:
-    from implementation.repository import TodoRepository
+    from implementation.repository import BulkResult, TodoRepository
     from implementation.todo_model import Todo
 except ImportError:
-    from repository import TodoRepository
+    from repository import BulkResult, TodoRepository
     from todo_model import Todo
 
+# Number of records inserted per bulk call while importing
+IMPORT_CHUNK = 1000
+# Name of the list a service starts on
+DEFAULT_LIST = "default"
+# Subdirectory of the data directory holding the other lists
+LISTS_DIRNAME = "lists"
+# List names double as directory names, so keep them to a safe alphabet
+_LIST_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+def _transfer():
+    """Import the export/import module on first use, keeping it off the startup path."""
+    try:
+        from implementation import transfer
+    except ImportError:
+        import transfer
+    return transfer
+
+
+def create_repository(backend: str = "dict", data_dir: Optional[str] = None) -> TodoRepository:
+    """
+    Create a repository for the named storage backend.
+
+    Args:
+        backend: "dict" for TodoRepository, "compact" for CompactTodoRepository,
+            "concurrent" for ConcurrentTodoRepository, "versioned" for
+            VersionedTodoRepository, "shared" for SharedMemoryTodoRepository,
+            "durable" for DurableTodoRepository or "sqlite" for
+            SqliteTodoRepository
+        data_dir: Data directory of the durable and sqlite backends
+
+    Returns:
+        A new repository; durable repositories are recovered from data_dir
+
+    Raises:
+        ValueError: If the backend name is not recognised or data_dir is
+            missing for the durable or sqlite backend
+    """
+    if backend == "dict":
+        return TodoRepository()
+    if backend == "compact":
+        try:
+            from implementation.compact_storage import CompactTodoRepository
+        except ImportError:
+            from compact_storage import CompactTodoRepository
+        return CompactTodoRepository()
+    if backend == "concurrent":
+        try:
+            from implementation.concurrent_repository import ConcurrentTodoRepository
+        except ImportError:
+            from concurrent_repository import ConcurrentTodoRepository
+        return ConcurrentTodoRepository()
+    if backend == "versioned":
+        try:
+            from implementation.versioned_repository import VersionedTodoRepository
+        except ImportError:
+            from versioned_repository import VersionedTodoRepository
+        return VersionedTodoRepository()
+    if backend == "shared":
+        try:
+            from implementation.shared_memory_repository import SharedMemoryTodoRepository
+        except ImportError:
+            from shared_memory_repository import SharedMemoryTodoRepository
+        return SharedMemoryTodoRepository()
+    if backend == "durable":
+        if not data_dir:
+            raise ValueError("The durable backend requires a data directory")
+        try:
+            from implementation.persistence import DurableTodoRepository
+        except ImportError:
+            from persistence import DurableTodoRepository
+        return DurableTodoRepository(data_dir)
+    if backend == "sqlite":
+        if not data_dir:
+            raise ValueError("The sqlite backend requires a data directory")
+        try:
+            from implementation.sqlite_repository import DATABASE_FILENAME, SqliteTodoRepository
+        except ImportError:
+            from sqlite_repository import DATABASE_FILENAME, SqliteTodoRepository
+        os.makedirs(data_dir, exist_ok=True)
+        return SqliteTodoRepository(os.path.join(data_dir, DATABASE_FILENAME))
+    raise ValueError(f"Unknown storage backend: {backend}")
+
 
 class TodoService:
     """
@@ -16,11 +102,99 @@ class TodoService:
 
     The service layer provides a clean interface for todo operations
     while handling validation and error cases.
+
+    A service holds any number of named lists. Each list is a repository of
+    its own, with its own ID counter and indexes, and every task operation
+    goes to the active list, so its cost does not depend on the other lists.
     """
 
-    def __init__(self):
-        """Initialize the service with a repository instance."""
-        self.repository = TodoRepository()
+    def __init__(self, backend: Optional[str] = None, repository: Optional[TodoRepository] = None,
+                 data_dir: Optional[str] = None):
+        """
+        Initialize the service with a repository instance.
+
+        Args:
+            backend: Storage backend to create the repository with: "dict"
+                (one Todo object per task), "compact" (columnar store),
+                "concurrent" (thread-safe), "versioned" (copy-on-write versions
+                with undo/redo), "shared" (shared memory, usable from forked
+                worker processes), "durable" (logged to data_dir) or "sqlite"
+                (database in data_dir). Defaults to the TODO_BACKEND
+                environment variable, or "dict" if it is not set
+            repository: An existing repository to use for the default list
+                instead of creating one
+            data_dir: Data directory of the durable and sqlite backends.
+                Defaults to the TODO_DATA_DIR environment variable. The
+                default list is stored in it directly and every other list
+                in its own subdirectory of data_dir/lists
+
+        Raises:
+            ValueError: If the backend name is not recognised
+        """
+        if backend is None:
+            backend = os.environ.get("TODO_BACKEND", "dict")
+        if data_dir is None:
+            data_dir = os.environ.get("TODO_DATA_DIR")
+        self._backend = backend
+        self._data_dir = data_dir
+        if repository is None:
+            repository = create_repository(backend, data_dir)
+        self.repository = repository
+        self.current_list = DEFAULT_LIST
+        self._lists: Dict[str, TodoRepository] = {DEFAULT_LIST: repository}
+        # Open transactions while a transaction() block runs, so lists
+        # switched to inside the block join it
+        self._transactions: Optional[ExitStack] = None
+        self._in_transaction: Set[str] = set()
+
+    def use_list(self, name: str) -> bool:
+        """
+        Make a named list the active one, creating it if needed.
+
+        Args:
+            name: The list name: 1-64 letters, digits, '-' or '_'
+
+        Returns:
+            True if the list was created, False if it already existed
+
+        Raises:
+            ValueError: If the name is invalid
+        """
+        if not _LIST_NAME_PATTERN.match(name):
+            raise ValueError("List names may only contain letters, digits, '-' and '_'")
+        repository = self._lists.get(name)
+        created = False
+        if repository is None:
+            list_dir = self._list_data_dir(name)
+            created = list_dir is None or not os.path.isdir(list_dir)
+            repository = create_repository(self._backend, list_dir)
+            self._lists[name] = repository
+        self.repository = repository
+        self.current_list = name
+        self._join_transaction()
+        return created
+
+    def list_names(self) -> List[str]:
+        """
+        Name every list, including those stored in the data directory but not opened yet.
+
+        Returns:
+            The list names, sorted
+        """
+        names = set(self._lists)
+        if self._data_dir:
+            lists_dir = os.path.join(self._data_dir, LISTS_DIRNAME)
+            if os.path.isdir(lists_dir):
+                names.update(entry for entry in os.listdir(lists_dir)
+                             if _LIST_NAME_PATTERN.match(entry)
+                             and os.path.isdir(os.path.join(lists_dir, entry)))
+        return sorted(names)
+
+    def _list_data_dir(self, name: str) -> Optional[str]:
+        """Return the data directory of a list, or None without a data directory."""
+        if not self._data_dir or name == DEFAULT_LIST:
+            return self._data_dir
+        return os.path.join(self._data_dir, LISTS_DIRNAME, name)
 
     def add_task(self, title: str, description: Optional[str] = None) -> Todo:
         """
@@ -38,17 +212,65 @@ class TodoService:
         """
         return self.repository.add_todo(title, description)
 
-    def list_tasks(self) -> List[Todo]:
+    def list_tasks(self, completed: Optional[bool] = None, start_id: Optional[int] = None,
+                   end_id: Optional[int] = None, limit: Optional[int] = None) -> List[Todo]:
         """
-        List all tasks in the todo list.
+        List tasks in the todo list, optionally filtered by completion status and ID range.
+
+        Args:
+            completed: True for completed tasks only, False for pending tasks
+                only, None for all tasks
+            start_id: If given, only list tasks with at least this ID
+            end_id: If given, only list tasks with at most this ID
+            limit: If given, list at most this many tasks
 
         Returns:
-            A list of all Todo objects
+            A list of matching Todo objects, ordered by ID
         """
-        return self.repository.list_todos()
+        return self.repository.list_todos(completed, start_id, end_id, limit)
+
+    def count_tasks(self, completed: Optional[bool] = None) -> int:
+        """
+        Count tasks in the todo list, optionally filtered by completion status.
+
+        Args:
+            completed: True for completed tasks only, False for pending tasks
+                only, None for all tasks
+
+        Returns:
+            The number of matching tasks
+        """
+        return self.repository.count_todos(completed)
+
+    def search(self, query: str) -> List[Todo]:
+        """
+        Search tasks by title and description.
+
+        Every word of the query must match (AND semantics), and each word
+        matches as a case-insensitive prefix of a word in the task.
+
+        Args:
+            query: The free-text query
+
+        Returns:
+            The matching Todo objects, ordered by ID
+        """
+        return self.repository.search_todos(query)
+
+    def get_task(self, task_id: int) -> Optional[Todo]:
+        """
+        Retrieve a single task by its ID.
+
+        Args:
+            task_id: The ID of the task to retrieve
+
+        Returns:
+            The Todo object, or None if the task doesn't exist
+        """
+        return self.repository.get_todo(task_id)
 
     def update_task(self, task_id: int, title: Optional[str] = None,
-                    description: Optional[str] = None) -> bool:
+                    description: Optional[str] = None) -> Optional[Todo]:
         """
         Update an existing task.
 
@@ -58,15 +280,14 @@ class TodoService:
             description: New description for the task (optional)
 
         Returns:
-            True if the update was successful, False if task doesn't exist
+            The updated Todo object, or None if the task doesn't exist
 
         Raises:
             ValueError: If title is empty or contains only whitespace
         """
-        result = self.repository.update_todo(task_id, title, description)
-        return result is not None
+        return self.repository.update_todo(task_id, title, description)
 
-    def delete_task(self, task_id: int) -> bool:
+    def delete_task(self, task_id: int) -> Optional[Todo]:
         """
         Delete a task by its ID.
 
@@ -74,11 +295,11 @@ class TodoService:
             task_id: The ID of the task to delete
 
         Returns:
-            True if the deletion was successful, False if task doesn't exist
+            The deleted Todo object, or None if the task doesn't exist
         """
         return self.repository.delete_todo(task_id)
 
-    def complete_task(self, task_id: int) -> bool:
+    def complete_task(self, task_id: int) -> Optional[Todo]:
         """
         Toggle the completion status of a task.
 
@@ -86,10 +307,136 @@ class TodoService:
             task_id: The ID of the task to toggle
 
         Returns:
-            True if the toggle was successful, False if task doesn't exist
+            The updated Todo object, or None if the task doesn't exist
+        """
+        return self.repository.toggle_completion(task_id)
+
+    def add_many(self, items: Iterable[Tuple[str, Optional[str]]]) -> BulkResult:
+        """
+        Add many tasks at once.
+
+        Titles are validated in one pass and the valid tasks receive one
+        contiguous block of IDs; invalid items are reported, not raised.
+
+        Args:
+            items: (title, description) pairs
+
+        Returns:
+            A BulkResult with the created tasks and the rejected positions
+        """
+        return self.repository.add_many(items)
+
+    def update_many(self, updates: Iterable[Tuple[int, Optional[str], Optional[str]]]) -> BulkResult:
         """
-        result = self.repository.toggle_completion(task_id)
-        return result is not None
+        Update many tasks at once.
+
+        Args:
+            updates: (task ID, new title or None, new description or None) triples
+
+        Returns:
+            A BulkResult with the updated tasks and the rejected IDs
+        """
+        return self.repository.update_many(updates)
+
+    def complete_many(self, task_ids: Iterable[int], completed: bool = True) -> BulkResult:
+        """
+        Mark many tasks as complete (or incomplete) at once.
+
+        Args:
+            task_ids: The IDs of the tasks to change
+            completed: The status to set
+
+        Returns:
+            A BulkResult with the changed tasks and the IDs that don't exist
+        """
+        return self.repository.complete_many(task_ids, completed)
+
+    def delete_many(self, task_ids: Iterable[int]) -> BulkResult:
+        """
+        Delete many tasks at once.
+
+        Args:
+            task_ids: The IDs of the tasks to delete
+
+        Returns:
+            A BulkResult with the deleted tasks and the IDs that don't exist
+        """
+        return self.repository.delete_many(task_ids)
+
+    def export_tasks(self, path: str, format: Optional[str] = None) -> int:
+        """
+        Stream every task to a JSON or CSV file.
+
+        Tasks are written one at a time as the repository yields them, so
+        the export never holds the whole document in memory.
+
+        Args:
+            path: The file to write
+            format: "json" or "csv"; inferred from the extension if omitted
+
+        Returns:
+            The number of tasks exported
+
+        Raises:
+            ValueError: If the format is unknown
+            OSError: If the file cannot be written
+        """
+        transfer = _transfer()
+        format = transfer.detect_format(path, format)
+        with open(path, "w", encoding="utf-8", newline="") as output:
+            if format == "json":
+                return transfer.write_json(self.repository.iter_todos(), output)
+            return transfer.write_csv(self.repository.iter_todos(), output)
+
+    def import_tasks(self, path: str, format: Optional[str] = None,
+                     chunk_size: int = IMPORT_CHUNK) -> Tuple[int, int]:
+        """
+        Add the tasks from a JSON or CSV file, as written by export_tasks.
+
+        The file is parsed incrementally and inserted `chunk_size` records
+        at a time through the bulk operations. Imported tasks get new IDs;
+        their titles, descriptions and completion status are kept.
+
+        Args:
+            path: The file to read
+            format: "json" or "csv"; inferred from the extension if omitted
+            chunk_size: Number of records per bulk insert
+
+        Returns:
+            The number of tasks imported and the number of records rejected
+            for an empty title
+
+        Raises:
+            ValueError: If the format is unknown or the file is malformed;
+                the chunks before the malformed record stay imported
+            OSError: If the file cannot be read
+        """
+        transfer = _transfer()
+        format = transfer.detect_format(path, format)
+        imported = rejected = 0
+        with open(path, "r", encoding="utf-8", newline="") as source:
+            records = transfer.read_json(source) if format == "json" else transfer.read_csv(source)
+            chunk = []
+            for record in records:
+                chunk.append(record)
+                if len(chunk) >= chunk_size:
+                    imported, rejected = self._import_chunk(chunk, imported, rejected)
+                    chunk = []
+            imported, rejected = self._import_chunk(chunk, imported, rejected)
+        return imported, rejected
+
+    def _import_chunk(self, chunk: list, imported: int, rejected: int) -> Tuple[int, int]:
+        """Insert one chunk of imported records, returning the updated totals."""
+        if not chunk:
+            return imported, rejected
+        result = self.repository.add_many((title, description) for title, description, _ in chunk)
+        failed = {position for position, _ in result.failed}
+        accepted = (record for position, record in enumerate(chunk) if position not in failed)
+        completed_ids = [todo.id for todo, (_, _, completed) in zip(result.succeeded, accepted)
+                         if completed]
+        if completed_ids:
+            self.repository.complete_many(completed_ids)
+        return imported + len(result.succeeded), rejected + len(result.failed)
 
     def task_exists(self, task_id: int) -> bool:
         """
@@ -101,4 +448,84 @@ class TodoService:
         Returns:
             True if the task exists, False otherwise
         """
-        return self.repository.exists(task_id)
\ No newline at end of file
+        return self.repository.exists(task_id)
+
+    def storage_bytes(self) -> int:
+        """
+        Estimate the storage used by the active list.
+
+        Returns:
+            The size in bytes: memory for the in-memory backends, database
+            pages for sqlite and the used part of the segment for shared
+        """
+        return self.repository.storage_bytes()
+
+    def transaction(self) -> ContextManager:
+        """
+        Group the changes made inside a with-block into one commit.
+
+        Backends without transactions apply every change immediately, so
+        for them this is a no-op context manager. Lists switched to inside
+        the block join it, and each commits when the block ends.
+        """
+        if self._transactions is not None:
+            return nullcontext()
+        return self._transaction()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Run a with-block inside a transaction of every list it uses."""
+        with ExitStack() as stack:
+            self._transactions = stack
+            try:
+                self._join_transaction()
+                yield
+            finally:
+                self._transactions = None
+                self._in_transaction.clear()
+
+    def _join_transaction(self):
+        """Enter a transaction of the active list if a transaction() block is running."""
+        if self._transactions is None or self.current_list in self._in_transaction:
+            return
+        self._in_transaction.add(self.current_list)
+        transaction = getattr(self.repository, "transaction", None)
+        if transaction is not None:
+            self._transactions.enter_context(transaction())
+
+    def supports_history(self) -> bool:
+        """Check whether the repository keeps versions that can be undone."""
+        return hasattr(self.repository, "undo")
+
+    def undo(self) -> bool:
+        """
+        Undo the last change to the task list.
+
+        Returns:
+            True if a change was undone, False if there was nothing to undo
+
+        Raises:
+            ValueError: If the storage backend does not keep versions
+        """
+        if not self.supports_history():
+            raise ValueError("Undo requires the versioned storage backend")
+        return self.repository.undo()
+
+    def redo(self) -> bool:
+        """
+        Redo the last undone change to the task list.
+
+        Returns:
+            True if a change was redone, False if there was nothing to redo
+
+        Raises:
+            ValueError: If the storage backend does not keep versions
+        """
+        if not self.supports_history():
+            raise ValueError("Redo requires the versioned storage backend")
+        return self.repository.redo()
+
+    def close(self):
+        """Flush and release the repository of every open list."""
+        for repository in self._lists.values():
+            repository.close()
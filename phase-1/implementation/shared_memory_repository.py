@@ -0,0 +1,507 @@
+"""
+Shared-memory task repository for the todo application.
+
+All tasks live in one multiprocessing.shared_memory segment, laid out as
+
+    header | per-stripe counters | fixed-width records | UTF-8 string arena
+
+so every process that maps the segment reads and updates the same task set
+in place: nothing is pickled or copied per process. Record `id - 1` holds the
+task with that ID.
+"""
+import multiprocessing
+import os
+import struct
+import sys
+import threading
+import time
+from itertools import islice
+from multiprocessing import shared_memory
+from typing import Iterator, List, Optional
+try:
+    from implementation.repository import EMPTY_TITLE_ERROR, TodoRepository
+    from implementation.search_index import tokenize
+    from implementation.todo_model import Todo
+    from implementation.validation import validate_task_title
+except ImportError:
+    from repository import EMPTY_TITLE_ERROR, TodoRepository
+    from search_index import tokenize
+    from todo_model import Todo
+    from validation import validate_task_title
+
+_MAGIC = b"TODOSHM1"
+# magic, capacity, arena size, stripes, next ID, arena bytes used
+_HEADER = struct.Struct("<8sqqqqq")
+# Number of tasks and of completed tasks in one stripe
+_COUNTERS = struct.Struct("<qq")
+# version (odd while being written), state, title offset, title length,
+# description length (-1 for None); the description follows the title
+_RECORD = struct.Struct("<IBxxxqii")
+_VERSION = struct.Struct("<I")
+
+# Values stored in the state field of a record
+_ABSENT = 0
+_PENDING = 1
+_COMPLETED = 2
+
+# Most arena bytes a process reserves at a time for the strings it writes
+ARENA_CHUNK = 64 * 1024
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Map an existing segment without handing its lifetime to this process."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    segment = shared_memory.SharedMemory(name=name)
+    # Before 3.13 every attaching process registers the segment with its
+    # resource tracker, which would unlink it when that process exits
+    from multiprocessing import resource_tracker
+    resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+class SharedMemoryTodoRepository(TodoRepository):
+    """
+    TodoRepository whose tasks live in shared memory, usable from many processes.
+
+    Create the repository in a parent process and hand it to workers, either
+    by forking or as a multiprocessing.Process argument (which transfers
+    only the segment name and the locks). IDs and arena space are handed
+    out under one allocation lock; each process reserves the arena in
+    ARENA_CHUNK pieces so writers rarely meet there. Task mutations run
+    under one of `stripes` locks chosen by ID block, as in
+    ConcurrentTodoRepository, and every record carries a version counter
+    (a seqlock), so reads never take a lock: a reader that overlaps a write
+    simply retries.
+
+    Updated strings are appended to the arena rather than overwritten, so
+    readers never see a half-written title; the arena is not compacted, and
+    adding to a full record table or arena raises ValueError. The status
+    and full-text queries scan the records, since per-process indexes would
+    miss changes made by other processes.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, arena_size: int = 128 * 1024 * 1024,
+                 stripes: int = 64, stripe_width: int = 16, name: Optional[str] = None,
+                 context=None):
+        """
+        Create a new shared segment.
+
+        Args:
+            capacity: Maximum number of task IDs the segment can hold
+            arena_size: Bytes reserved for titles and descriptions
+            stripes: Number of locks guarding task mutations
+            stripe_width: Number of consecutive IDs that share a lock
+            name: Name of the segment (a random one if omitted)
+            context: multiprocessing context the workers will be started
+                with, which must own the locks (the default context if omitted)
+        """
+        # TodoRepository.__init__ is not called: the tasks, the ID counter
+        # and the counters all live in the shared segment
+        size = _HEADER.size + stripes * _COUNTERS.size + capacity * _RECORD.size + arena_size
+        self._segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _HEADER.pack_into(self._segment.buf, 0, _MAGIC, capacity, arena_size, stripes, 1, 0)
+        context = context or multiprocessing.get_context()
+        self._alloc_lock = context.Lock()
+        self._stripes = [context.Lock() for _ in range(stripes)]
+        self._owner_pid = os.getpid()
+        self._setup(stripe_width)
+
+    def _setup(self, stripe_width: int):
+        """Initialize the per-process state over a mapped segment."""
+        self._buf = self._segment.buf
+        magic, self._capacity, self._arena_size, stripes, _, _ = _HEADER.unpack_from(self._buf, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{self._segment.name} is not a shared todo segment")
+        self._counters_offset = _HEADER.size
+        self._records_offset = self._counters_offset + stripes * _COUNTERS.size
+        self._arena_offset = self._records_offset + self._capacity * _RECORD.size
+        self._stripe_width = stripe_width
+        self._chunk_pid = None
+        self._chunk_lock = threading.Lock()
+        self._chunk_next = 0
+        self._chunk_end = 0
+
+    def __getstate__(self):
+        """Transfer only the segment name and the locks to another process."""
+        return (self._segment.name, self._alloc_lock, self._stripes,
+                self._stripe_width, self._owner_pid)
+
+    def __setstate__(self, state):
+        """Map the segment in the receiving process."""
+        name, self._alloc_lock, self._stripes, stripe_width, self._owner_pid = state
+        self._segment = _attach(name)
+        self._setup(stripe_width)
+
+    @property
+    def name(self) -> str:
+        """The name other processes can use to find the segment."""
+        return self._segment.name
+
+    # -- allocation -------------------------------------------------------
+
+    @property
+    def _next_id(self) -> int:
+        """The next ID to be allocated, shared by every process."""
+        return _HEADER.unpack_from(self._buf, 0)[4]
+
+    def _allocate_ids(self, count: int) -> range:
+        """
+        Reserve a contiguous block of IDs for all processes.
+
+        Raises:
+            ValueError: If the record table cannot hold that many more tasks
+        """
+        with self._alloc_lock:
+            magic, capacity, arena_size, stripes, start, used = _HEADER.unpack_from(self._buf, 0)
+            if start + count - 1 > capacity:
+                raise ValueError(f"The shared store is full ({capacity} tasks)")
+            _HEADER.pack_into(self._buf, 0, magic, capacity, arena_size, stripes,
+                              start + count, used)
+        return range(start, start + count)
+
+    def _allocate_text(self, size: int) -> int:
+        """
+        Reserve `size` arena bytes, returning their offset in the segment.
+
+        Raises:
+            ValueError: If the arena is full
+        """
+        if self._chunk_pid != os.getpid():
+            # A forked child inherits the parent's chunk, and perhaps its
+            # lock held by a thread that did not survive the fork
+            self._chunk_pid = os.getpid()
+            self._chunk_lock = threading.Lock()
+            self._chunk_next = self._chunk_end = 0
+        # Threads of one process share the chunk
+        with self._chunk_lock:
+            if self._chunk_next + size > self._chunk_end:
+                # Small arenas are handed out in smaller pieces, so one process
+                # cannot claim all of it
+                reserve = max(size, min(ARENA_CHUNK, self._arena_size // 64))
+                with self._alloc_lock:
+                    magic, capacity, arena_size, stripes, next_id, used = \
+                        _HEADER.unpack_from(self._buf, 0)
+                    if used + size > arena_size:
+                        raise ValueError(
+                            f"The shared store's string arena is full ({arena_size} bytes)")
+                    reserve = min(reserve, arena_size - used)
+                    _HEADER.pack_into(self._buf, 0, magic, capacity, arena_size, stripes,
+                                      next_id, used + reserve)
+                self._chunk_next = self._arena_offset + used
+                self._chunk_end = self._chunk_next + reserve
+            offset = self._chunk_next
+            self._chunk_next += size
+        return offset
+
+    # -- records ----------------------------------------------------------
+
+    def _record_position(self, todo_id: int) -> int:
+        """Return the offset of a task's record, or -1 if the ID is out of range."""
+        if not isinstance(todo_id, int) or todo_id < 1 or todo_id > self._capacity:
+            return -1
+        return self._records_offset + (todo_id - 1) * _RECORD.size
+
+    def _lock_for(self, todo_id: int):
+        """Return the lock guarding the stripe a task ID belongs to."""
+        return self._stripes[(todo_id // self._stripe_width) % len(self._stripes)]
+
+    def _adjust_counters(self, todo_id: int, tasks: int, completed: int):
+        """Change the counters of a task's stripe; the stripe lock must be held."""
+        position = self._counters_offset + \
+            ((todo_id // self._stripe_width) % len(self._stripes)) * _COUNTERS.size
+        count, done = _COUNTERS.unpack_from(self._buf, position)
+        _COUNTERS.pack_into(self._buf, position, count + tasks, done + completed)
+
+    def _read(self, todo_id: int) -> Optional[Todo]:
+        """Read a task without locking, retrying while a writer is active."""
+        position = self._record_position(todo_id)
+        if position < 0:
+            return None
+        buf = self._buf
+        while True:
+            version, state, offset, title_length, description_length = \
+                _RECORD.unpack_from(buf, position)
+            if not version & 1:
+                # Copy the raw bytes and decode only once the version shows
+                # they were not torn by a concurrent write
+                end = offset + title_length
+                title = bytes(buf[offset:end])
+                description = None if description_length < 0 else \
+                    bytes(buf[end:end + description_length])
+                if _VERSION.unpack_from(buf, position)[0] == version:
+                    if state == _ABSENT:
+                        return None
+                    return Todo.from_validated(
+                        todo_id, title.decode("utf-8"),
+                        None if description is None else description.decode("utf-8"),
+                        state == _COMPLETED)
+            # A writer is active; let it finish instead of spinning
+            time.sleep(0)
+
+    def _write(self, todo_id: int, state: int, title: Optional[str] = None,
+               description: Optional[str] = None, keep_text: bool = False):
+        """
+        Write a task's record; the stripe lock must be held.
+
+        Args:
+            todo_id: The task to write
+            state: The new state of the record
+            title: The new title, unless keep_text is set
+            description: The new description, unless keep_text is set
+            keep_text: Keep the strings currently referenced by the record
+        """
+        position = self._record_position(todo_id)
+        buf = self._buf
+        version, _, offset, title_length, description_length = _RECORD.unpack_from(buf, position)
+        if not keep_text:
+            encoded_title = title.encode("utf-8")
+            encoded_description = description.encode("utf-8") if description is not None else b""
+            size = len(encoded_title) + len(encoded_description)
+            offset = self._allocate_text(size)
+            buf[offset:offset + size] = encoded_title + encoded_description
+            title_length = len(encoded_title)
+            description_length = len(encoded_description) if description is not None else -1
+        _VERSION.pack_into(buf, position, version + 1)
+        _RECORD.pack_into(buf, position, version + 1, state, offset,
+                          title_length, description_length)
+        _VERSION.pack_into(buf, position, version + 2)
+
+    def _state(self, todo_id: int) -> int:
+        """Return the state of a task's record; the stripe lock must be held."""
+        position = self._record_position(todo_id)
+        return _ABSENT if position < 0 else _RECORD.unpack_from(self._buf, position)[1]
+
+    # -- repository operations --------------------------------------------
+
+    def add_todo(self, title: str, description: Optional[str] = None) -> Todo:
+        """
+        Add a new todo to the shared store.
+
+        Args:
+            title: The title of the todo
+            description: Optional description of the todo
+
+        Returns:
+            The created Todo object with assigned ID
+        """
+        # Validate before allocating, so rejected titles do not burn IDs
+        if not validate_task_title(title):
+            raise ValueError(EMPTY_TITLE_ERROR)
+        todo_id = self._allocate_ids(1)[0]
+        todo = Todo.from_validated(todo_id, title, description)
+        self._insert_todo(todo)
+        return todo
+
+    def _insert_todo(self, todo: Todo):
+        """Write a new task's record under its stripe lock."""
+        with self._lock_for(todo.id):
+            self._write(todo.id, _COMPLETED if todo.completed else _PENDING,
+                        todo.title, todo.description)
+            self._adjust_counters(todo.id, 1, 1 if todo.completed else 0)
+
+    def get_todo(self, todo_id: int) -> Optional[Todo]:
+        """
+        Retrieve a todo by its ID.
+
+        Args:
+            todo_id: The ID of the todo to retrieve
+
+        Returns:
+            The Todo object if found, None otherwise
+        """
+        return self._read(todo_id)
+
+    def iter_todos(self, start_id: Optional[int] = None,
+                   end_id: Optional[int] = None) -> Iterator[Todo]:
+        """
+        Read the stored tasks one at a time, ordered by ID.
+
+        Tasks other processes add after the iteration starts are not visited.
+
+        Args:
+            start_id: If given, start at this ID
+            end_id: If given, stop after this ID
+
+        Returns:
+            An iterator over the Todo objects
+        """
+        last = self._next_id - 1 if end_id is None else min(end_id, self._next_id - 1)
+        ids = range(max(start_id or 1, 1), last + 1)
+        return (todo for todo in map(self._read, ids) if todo is not None)
+
+    def list_todos(self, completed: Optional[bool] = None, start_id: Optional[int] = None,
+                   end_id: Optional[int] = None, limit: Optional[int] = None) -> List[Todo]:
+        """
+        Get all todos, optionally filtered by status and ID range.
+
+        Records are addressed by ID, so a range reads just its own slots.
+
+        Args:
+            completed: If given, only return todos with this completion status
+            start_id: If given, only return todos with at least this ID
+            end_id: If given, only return todos with at most this ID
+            limit: If given, return at most this many todos
+
+        Returns:
+            A list of matching Todo objects, ordered by ID
+        """
+        todos = self.iter_todos(start_id, end_id)
+        if completed is not None:
+            todos = (todo for todo in todos if todo.completed == completed)
+        if limit is not None:
+            todos = islice(todos, min(max(limit, 0), sys.maxsize))
+        return list(todos)
+
+    def count_todos(self, completed: Optional[bool] = None) -> int:
+        """
+        Count the todos from the per-stripe counters.
+
+        Args:
+            completed: If given, only count todos with this completion status
+
+        Returns:
+            The number of matching todos
+        """
+        count = done = 0
+        for stripe in range(len(self._stripes)):
+            tasks, finished = _COUNTERS.unpack_from(
+                self._buf, self._counters_offset + stripe * _COUNTERS.size)
+            count += tasks
+            done += finished
+        if completed is None:
+            return count
+        return done if completed else count - done
+
+    def update_todo(self, todo_id: int, title: Optional[str] = None,
+                    description: Optional[str] = None) -> Optional[Todo]:
+        """
+        Update an existing todo's title and/or description.
+
+        Args:
+            todo_id: The ID of the todo to update
+            title: New title (optional)
+            description: New description (optional)
+
+        Returns:
+            The updated Todo object if successful, None if todo doesn't exist
+        """
+        if not self.exists(todo_id):
+            return None
+        if title is not None and not validate_task_title(title):
+            raise ValueError(EMPTY_TITLE_ERROR)
+        return self._apply_update(todo_id, title, description)
+
+    def _apply_update(self, todo_id: int, title: Optional[str],
+                      description: Optional[str]) -> Optional[Todo]:
+        """Write already-validated field changes to a task under its stripe lock."""
+        if self._record_position(todo_id) < 0:
+            return None
+        with self._lock_for(todo_id):
+            todo = self._read(todo_id)
+            if todo is None:
+                return None
+            if title is not None:
+                todo.title = title
+            if description is not None:
+                todo.description = description
+            self._write(todo_id, _COMPLETED if todo.completed else _PENDING,
+                        todo.title, todo.description)
+        return todo
+
+    def search_todos(self, query: str) -> List[Todo]:
+        """
+        Find todos whose title or description matches every query term.
+
+        Args:
+            query: The free-text query
+
+        Returns:
+            The matching Todo objects, ordered by ID
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        matches = []
+        for todo in self.iter_todos():
+            tokens = tokenize(f"{todo.title} {todo.description}" if todo.description else todo.title)
+            if all(any(token.startswith(term) for token in tokens) for term in terms):
+                matches.append(todo)
+        return matches
+
+    def _remove_todo(self, todo_id: int) -> Optional[Todo]:
+        """Mark a task's record as absent, returning the task if it existed."""
+        if self._record_position(todo_id) < 0:
+            return None
+        with self._lock_for(todo_id):
+            todo = self._read(todo_id)
+            if todo is None:
+                return None
+            self._write(todo_id, _ABSENT, keep_text=True)
+            self._adjust_counters(todo_id, -1, -1 if todo.completed else 0)
+        return todo
+
+    def toggle_completion(self, todo_id: int) -> Optional[Todo]:
+        """
+        Toggle the completion status of a todo.
+
+        Args:
+            todo_id: The ID of the todo to toggle
+
+        Returns:
+            The updated Todo object if successful, None if todo doesn't exist
+        """
+        if self._record_position(todo_id) < 0:
+            return None
+        with self._lock_for(todo_id):
+            state = self._state(todo_id)
+            if state == _ABSENT:
+                return None
+            return self._store_status(todo_id, state != _COMPLETED)
+
+    def _set_completed(self, todo_id: int, completed: bool) -> Optional[Todo]:
+        """Set a todo's completion status, returning it if it exists."""
+        if self._record_position(todo_id) < 0:
+            return None
+        with self._lock_for(todo_id):
+            if self._state(todo_id) == _ABSENT:
+                return None
+            return self._store_status(todo_id, completed)
+
+    def _store_status(self, todo_id: int, completed: bool) -> Todo:
+        """Write an existing task's status; the stripe lock must be held."""
+        was_completed = self._state(todo_id) == _COMPLETED
+        self._write(todo_id, _COMPLETED if completed else _PENDING, keep_text=True)
+        self._adjust_counters(todo_id, 0, int(completed) - int(was_completed))
+        return self._read(todo_id)
+
+    def exists(self, todo_id: int) -> bool:
+        """
+        Check if a todo with the given ID exists.
+
+        Args:
+            todo_id: The ID to check
+
+        Returns:
+            True if the todo exists, False otherwise
+        """
+        position = self._record_position(todo_id)
+        return position >= 0 and _RECORD.unpack_from(self._buf, position)[1] != _ABSENT
+
+    def storage_bytes(self) -> int:
+        """
+        Return the part of the shared segment in use: header, records up to the last ID and arena.
+
+        Returns:
+            The size in bytes
+        """
+        next_id, used = _HEADER.unpack_from(self._buf, 0)[4:]
+        return self._records_offset + (next_id - 1) * _RECORD.size + used
+
+    def close(self):
+        """Unmap the segment, and remove it if this is the process that created it."""
+        self._buf = None
+        self._segment.close()
+        if os.getpid() == self._owner_pid:
+            self._segment.unlink()
+
@@ -0,0 +1,401 @@
+"""
+SQLite-backed task repository for the todo application.
+"""
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
+try:
+    from implementation.repository import BulkResult, EMPTY_TITLE_ERROR, TodoRepository
+    from implementation.search_index import tokenize
+    from implementation.todo_model import Todo
+    from implementation.validation import validate_task_title
+except ImportError:
+    from repository import BulkResult, EMPTY_TITLE_ERROR, TodoRepository
+    from search_index import tokenize
+    from todo_model import Todo
+    from validation import validate_task_title
+
+DATABASE_FILENAME = "todo.db"
+# Number of compiled statements kept by the connection's statement cache
+STATEMENT_CACHE_SIZE = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS todos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS todos_completed ON todos (completed, id);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts USING fts5(
+    title, description, content='todos', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 0'
+);
+CREATE TRIGGER IF NOT EXISTS todos_fts_insert AFTER INSERT ON todos BEGIN
+    INSERT INTO todos_fts (rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS todos_fts_delete AFTER DELETE ON todos BEGIN
+    INSERT INTO todos_fts (todos_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS todos_fts_update AFTER UPDATE OF title, description ON todos BEGIN
+    INSERT INTO todos_fts (todos_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO todos_fts (rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END;
+"""
+
+# Statements are module constants so that the connection's statement cache
+# compiles each of them once and reuses the prepared statement afterwards
+_INSERT = "INSERT INTO todos (id, title, description, completed) VALUES (?, ?, ?, ?)"
+_SELECT = "SELECT id, title, description, completed FROM todos WHERE id = ?"
+_EXISTS = "SELECT 1 FROM todos WHERE id = ?"
+_SELECT_ALL = "SELECT id, title, description, completed FROM todos ORDER BY id"
+_SELECT_BY_STATUS = ("SELECT id, title, description, completed FROM todos "
+                     "WHERE completed = ? ORDER BY id")
+# A LIMIT of -1 means no limit in SQLite
+_SELECT_RANGE = ("SELECT id, title, description, completed FROM todos "
+                 "WHERE id BETWEEN ? AND ? ORDER BY id LIMIT ?")
+_SELECT_RANGE_BY_STATUS = ("SELECT id, title, description, completed FROM todos "
+                           "WHERE completed = ? AND id BETWEEN ? AND ? ORDER BY id LIMIT ?")
+_COUNT = "SELECT COUNT(*) FROM todos"
+_COUNT_BY_STATUS = "SELECT COUNT(*) FROM todos WHERE completed = ?"
+_UPDATE_FIELDS = ("UPDATE todos SET title = COALESCE(?, title), "
+                  "description = COALESCE(?, description) WHERE id = ?")
+_SET_COMPLETED = "UPDATE todos SET completed = ? WHERE id = ?"
+_TOGGLE = "UPDATE todos SET completed = 1 - completed WHERE id = ?"
+_DELETE = "DELETE FROM todos WHERE id = ?"
+_SEARCH = ("SELECT t.id, t.title, t.description, t.completed FROM todos_fts "
+           "JOIN todos t ON t.id = todos_fts.rowid WHERE todos_fts MATCH ? ORDER BY t.id")
+_LAST_ID = "SELECT seq FROM sqlite_sequence WHERE name = 'todos'"
+# SQLite integers are signed 64-bit; larger IDs cannot be bound, nor stored
+_MAX_ID = 2 ** 63 - 1
+
+
+def _storable(todo_id: int) -> bool:
+    """Check whether an ID fits in a SQLite integer; no stored todo has any other ID."""
+    return -_MAX_ID - 1 <= todo_id <= _MAX_ID
+
+
+def _row_to_todo(row: tuple) -> Todo:
+    """Build a Todo from a (id, title, description, completed) row."""
+    return Todo.from_validated(row[0], row[1], row[2], bool(row[3]))
+
+
+class SqliteTodoRepository(TodoRepository):
+    """
+    TodoRepository that keeps its tasks in a SQLite database file.
+
+    Only the rows a call asks for are loaded, so the task list can be far
+    larger than memory. The database runs in WAL mode with synchronous=NORMAL,
+    so each commit is a sequential log append. Every single-task mutation is
+    its own transaction; bulk operations and transaction() blocks group many
+    changes into one commit. Full-text search uses an FTS5 table kept in step
+    by triggers, with a scan fallback when SQLite lacks FTS5.
+
+    Todos returned by the repository are copies of the stored rows; changing
+    them does not change the database.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the database.
+
+        Args:
+            path: Path of the database file, or ":memory:"
+        """
+        super().__init__()
+        self.path = path
+        # Autocommit mode: transactions are opened explicitly by transaction()
+        self._conn = sqlite3.connect(path, isolation_level=None,
+                                     cached_statements=STATEMENT_CACHE_SIZE,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self._has_fts = True
+        except sqlite3.OperationalError:
+            self._has_fts = False
+        self._transaction_depth = 0
+
+        row = self._conn.execute(_LAST_ID).fetchone()
+        self._next_id = row[0] + 1 if row else 1
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group the changes made inside the block into a single commit.
+
+        Blocks may be nested; only the outermost one commits. If the block
+        raises, every change made inside it is rolled back.
+        """
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield
+            finally:
+                self._transaction_depth -= 1
+            return
+
+        next_id = self._next_id
+        self._conn.execute("BEGIN")
+        self._transaction_depth = 1
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            self._next_id = next_id
+            raise
+        else:
+            self._conn.execute("COMMIT")
+        finally:
+            self._transaction_depth = 0
+
+    def add_todo(self, title: str, description: Optional[str] = None) -> Todo:
+        """
+        Add a new todo to the database.
+
+        Args:
+            title: The title of the todo
+            description: Optional description of the todo
+
+        Returns:
+            The created Todo object with assigned ID
+        """
+        todo = Todo(id=self._next_id, title=title, description=description, completed=False)
+        self._insert_todo(todo)
+        self._next_id += 1
+        return todo
+
+    def _insert_todo(self, todo: Todo):
+        """Insert a todo row under its ID."""
+        self._conn.execute(_INSERT, (todo.id, todo.title, todo.description, int(todo.completed)))
+
+    def add_many(self, items: Iterable[Tuple[str, Optional[str]]]) -> BulkResult:
+        """
+        Add many todos in a single transaction.
+
+        Args:
+            items: (title, description) pairs
+
+        Returns:
+            A BulkResult with the created todos and the rejected positions
+        """
+        result = BulkResult()
+        valid = []
+        for position, (title, description) in enumerate(items):
+            if validate_task_title(title):
+                valid.append((title, description))
+            else:
+                result.failed.append((position, EMPTY_TITLE_ERROR))
+
+        with self.transaction():
+            from_validated = Todo.from_validated
+            result.succeeded = [from_validated(todo_id, title, description)
+                                for todo_id, (title, description)
+                                in zip(self._allocate_ids(len(valid)), valid)]
+            self._conn.executemany(_INSERT, ((todo.id, todo.title, todo.description, 0)
+                                             for todo in result.succeeded))
+        return result
+
+    def get_todo(self, todo_id: int) -> Optional[Todo]:
+        """
+        Retrieve a todo by its ID.
+
+        Args:
+            todo_id: The ID of the todo to retrieve
+
+        Returns:
+            The Todo object if found, None otherwise
+        """
+        if not _storable(todo_id):
+            return None
+        row = self._conn.execute(_SELECT, (todo_id,)).fetchone()
+        return _row_to_todo(row) if row else None
+
+    def list_todos(self, completed: Optional[bool] = None, start_id: Optional[int] = None,
+                   end_id: Optional[int] = None, limit: Optional[int] = None) -> List[Todo]:
+        """
+        Get all todos, optionally filtered by status and ID range.
+
+        Ranges are answered from the primary key B-tree, and status filters
+        from the (completed, id) index.
+
+        Args:
+            completed: If given, only return todos with this completion status
+            start_id: If given, only return todos with at least this ID
+            end_id: If given, only return todos with at most this ID
+            limit: If given, return at most this many todos
+
+        Returns:
+            A list of matching Todo objects, ordered by ID
+        """
+        if start_id is not None or end_id is not None or limit is not None:
+            if start_id is not None and start_id > _MAX_ID:
+                return []
+            # Clamp the rest so that they can be bound; no ID lies beyond them
+            bounds = (0 if start_id is None else start_id,
+                      _MAX_ID if end_id is None else min(end_id, _MAX_ID),
+                      -1 if limit is None else min(max(limit, 0), _MAX_ID))
+            if completed is None:
+                cursor = self._conn.execute(_SELECT_RANGE, bounds)
+            else:
+                cursor = self._conn.execute(_SELECT_RANGE_BY_STATUS, (int(completed),) + bounds)
+        elif completed is None:
+            cursor = self._conn.execute(_SELECT_ALL)
+        else:
+            cursor = self._conn.execute(_SELECT_BY_STATUS, (int(completed),))
+        return [_row_to_todo(row) for row in cursor]
+
+    def iter_todos(self) -> Iterator[Todo]:
+        """
+        Stream all todos from the database, one row at a time.
+
+        Returns:
+            An iterator over the Todo objects, ordered by ID
+        """
+        return map(_row_to_todo, self._conn.execute(_SELECT_ALL))
+
+    def count_todos(self, completed: Optional[bool] = None) -> int:
+        """
+        Count the todos, optionally filtered by status.
+
+        Args:
+            completed: If given, only count todos with this completion status
+
+        Returns:
+            The number of matching todos
+        """
+        if completed is None:
+            return self._conn.execute(_COUNT).fetchone()[0]
+        return self._conn.execute(_COUNT_BY_STATUS, (int(completed),)).fetchone()[0]
+
+    def update_todo(self, todo_id: int, title: Optional[str] = None,
+                    description: Optional[str] = None) -> Optional[Todo]:
+        """
+        Update an existing todo's title and/or description.
+
+        Args:
+            todo_id: The ID of the todo to update
+            title: New title (optional)
+            description: New description (optional)
+
+        Returns:
+            The updated Todo object if successful, None if todo doesn't exist
+        """
+        if title is not None and not validate_task_title(title):
+            if not self.exists(todo_id):
+                return None
+            raise ValueError(EMPTY_TITLE_ERROR)
+        return self._apply_update(todo_id, title, description)
+
+    def _apply_update(self, todo_id: int, title: Optional[str],
+                      description: Optional[str]) -> Optional[Todo]:
+        """Write already-validated field changes to a todo row."""
+        if (not _storable(todo_id)
+                or self._conn.execute(_UPDATE_FIELDS, (title, description, todo_id)).rowcount == 0):
+            return None
+        return self.get_todo(todo_id)
+
+    def update_many(self, updates: Iterable[Tuple[int, Optional[str], Optional[str]]]) -> BulkResult:
+        """Update many todos in a single transaction."""
+        with self.transaction():
+            return super().update_many(updates)
+
+    def search_todos(self, query: str) -> List[Todo]:
+        """
+        Find todos whose title or description matches every query term.
+
+        Terms are matched case-insensitively as word prefixes.
+
+        Args:
+            query: The free-text query
+
+        Returns:
+            The matching Todo objects, ordered by ID
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        if self._has_fts:
+            match = " ".join(f'"{term}"*' for term in sorted(terms))
+            return [_row_to_todo(row) for row in self._conn.execute(_SEARCH, (match,))]
+
+        matches = []
+        for row in self._conn.execute(_SELECT_ALL):
+            tokens = tokenize(f"{row[1]} {row[2]}" if row[2] else row[1])
+            if all(any(token.startswith(term) for token in tokens) for term in terms):
+                matches.append(_row_to_todo(row))
+        return matches
+
+    def _remove_todo(self, todo_id: int) -> Optional[Todo]:
+        """Delete a todo row, returning the todo if it existed."""
+        todo = self.get_todo(todo_id)
+        if todo is not None:
+            self._conn.execute(_DELETE, (todo_id,))
+        return todo
+
+    def delete_many(self, todo_ids: Iterable[int]) -> BulkResult:
+        """Delete many todos in a single transaction."""
+        with self.transaction():
+            return super().delete_many(todo_ids)
+
+    def toggle_completion(self, todo_id: int) -> Optional[Todo]:
+        """
+        Toggle the completion status of a todo.
+
+        Args:
+            todo_id: The ID of the todo to toggle
+
+        Returns:
+            The updated Todo object if successful, None if todo doesn't exist
+        """
+        if not _storable(todo_id) or self._conn.execute(_TOGGLE, (todo_id,)).rowcount == 0:
+            return None
+        return self.get_todo(todo_id)
+
+    def _set_completed(self, todo_id: int, completed: bool) -> Optional[Todo]:
+        """Set a todo's completion status, returning it if it exists."""
+        if (not _storable(todo_id)
+                or self._conn.execute(_SET_COMPLETED, (int(completed), todo_id)).rowcount == 0):
+            return None
+        return self.get_todo(todo_id)
+
+    def complete_many(self, todo_ids: Iterable[int], completed: bool = True) -> BulkResult:
+        """Set the status of many todos in a single transaction."""
+        with self.transaction():
+            return super().complete_many(todo_ids, completed)
+
+    def exists(self, todo_id: int) -> bool:
+        """
+        Check if a todo with the given ID exists.
+
+        Args:
+            todo_id: The ID to check
+
+        Returns:
+            True if the todo exists, False otherwise
+        """
+        return _storable(todo_id) and self._conn.execute(_EXISTS, (todo_id,)).fetchone() is not None
+
+    def storage_bytes(self) -> int:
+        """
+        Return the size of the database pages, which hold the tasks and the search index.
+
+        Returns:
+            The database size in bytes
+        """
+        page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        return page_count * page_size
+
+    def close(self):
+        """Close the database, checkpointing its write-ahead log."""
+        self._conn.close()
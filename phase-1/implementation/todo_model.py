@@ -26,6 +26,22 @@ class Todo:
         if not self.title or not self.title.strip():
             raise ValueError("Title cannot be empty or whitespace only")
 
+    @classmethod
+    def from_validated(cls, id: int, title: str, description: Optional[str] = None,
+                       completed: bool = False) -> 'Todo':
+        """
+        Create a Todo from fields that have already been validated.
+
+        Bulk paths validate a whole batch up front, so this skips the
+        per-object __post_init__ check.
+        """
+        todo = cls.__new__(cls)
+        todo.id = id
+        todo.title = title
+        todo.description = description
+        todo.completed = completed
+        return todo
+
     def toggle_completion(self) -> 'Todo':
         """Toggle the completion status of the task."""
         self.completed = not self.completed
@@ -0,0 +1,204 @@
+"""
+Streaming JSON and CSV export/import for the todo application.
+
+Writers consume an iterator of todos and write each one as soon as it is
+produced; readers parse their input in fixed-size chunks and yield one
+record at a time. Neither ever holds a whole document in memory.
+"""
+import csv
+import json
+import os
+from typing import Iterable, Iterator, Optional, TextIO, Tuple
+
+FORMATS = ("json", "csv")
+CSV_FIELDS = ("id", "title", "description", "completed")
+# Characters read from the input per parsing step
+READ_CHUNK = 64 * 1024
+# Largest CSV field accepted on import; the csv module's default of 128 KiB
+# is smaller than descriptions the app itself exports. This is the largest
+# value every platform's C long can hold.
+CSV_FIELD_LIMIT = 2 ** 31 - 1
+
+# (title, description, completed) as read from an export file
+Record = Tuple[str, Optional[str], bool]
+
+
+def detect_format(path: str, format: Optional[str] = None) -> str:
+    """
+    Decide the file format from an explicit name or the file extension.
+
+    Args:
+        path: The file path
+        format: "json" or "csv", overriding the extension
+
+    Returns:
+        The format name
+
+    Raises:
+        ValueError: If the format is unknown or cannot be inferred
+    """
+    if format is None:
+        format = os.path.splitext(path)[1].lstrip(".")
+    format = format.lower()
+    if format not in FORMATS:
+        raise ValueError(f"Unknown file format for {path}; use json or csv")
+    return format
+
+
+def write_json(todos: Iterable, output: TextIO) -> int:
+    """
+    Write todos as a JSON array, one object per line.
+
+    Args:
+        todos: The todos to write
+        output: Text stream to write to
+
+    Returns:
+        The number of todos written
+    """
+    # Only the strings need escaping; the rest of each object is formatted
+    # directly, which is much faster than encoding a dict per task
+    quote = json.JSONEncoder(ensure_ascii=False).encode
+    separator = "\n"
+    count = 0
+    output.write("[")
+    for todo in todos:
+        description = "null" if todo.description is None else quote(todo.description)
+        completed = "true" if todo.completed else "false"
+        output.write(f'{separator}{{"id":{todo.id},"title":{quote(todo.title)},'
+                     f'"description":{description},"completed":{completed}}}')
+        separator = ",\n"
+        count += 1
+    output.write("\n]\n")
+    return count
+
+
+def write_csv(todos: Iterable, output: TextIO) -> int:
+    """
+    Write todos as CSV with a header row; a missing description is left empty.
+
+    Args:
+        todos: The todos to write
+        output: Text stream to write to (opened with newline="")
+
+    Returns:
+        The number of todos written
+    """
+    writer = csv.writer(output)
+    writer.writerow(CSV_FIELDS)
+    count = 0
+    for todo in todos:
+        writer.writerow((todo.id, todo.title, todo.description or "",
+                         "true" if todo.completed else "false"))
+        count += 1
+    return count
+
+
+def _parse_completed(value) -> bool:
+    """Interpret a completed flag from either format."""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("true", "1", "yes", "x")
+
+
+def read_json(source: TextIO) -> Iterator[Record]:
+    """
+    Incrementally parse a JSON array of task objects.
+
+    The input is read in READ_CHUNK pieces and each array element is decoded
+    as soon as it is complete, so memory use is bounded by the largest
+    single task rather than the file.
+
+    Args:
+        source: Text stream holding a JSON array of objects with a "title"
+            and optional "description" and "completed" keys
+
+    Yields:
+        (title, description, completed) for every element
+
+    Raises:
+        ValueError: If the input is not a JSON array of objects
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def fill() -> bool:
+        """Append the next chunk to the buffer, returning False at end of input."""
+        nonlocal buffer, position, eof
+        chunk = source.read(READ_CHUNK)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    def skip_whitespace():
+        """Advance past whitespace, reading more input as needed."""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or not fill():
+                return
+
+    skip_whitespace()
+    if position >= len(buffer) or buffer[position] != "[":
+        raise ValueError("Expected a JSON array of tasks")
+    position += 1
+    expect_item = True
+    while True:
+        skip_whitespace()
+        if position >= len(buffer):
+            raise ValueError("Unexpected end of JSON input")
+        if buffer[position] == "]":
+            return
+        if not expect_item:
+            if buffer[position] != ",":
+                raise ValueError(f"Expected ',' between tasks, found {buffer[position]!r}")
+            position += 1
+            skip_whitespace()
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+                break
+            except json.JSONDecodeError:
+                # Most likely the element continues in the next chunk
+                if eof or not fill():
+                    raise ValueError("Invalid JSON task record") from None
+        position = end
+        expect_item = False
+        if not isinstance(item, dict) or not isinstance(item.get("title"), str):
+            raise ValueError("Every JSON task must be an object with a string title")
+        description = item.get("description")
+        yield (item["title"], description if isinstance(description, str) and description else None,
+               _parse_completed(item.get("completed", False)))
+
+
+def read_csv(source: TextIO) -> Iterator[Record]:
+    """
+    Parse CSV rows with a header naming at least a title column.
+
+    Args:
+        source: Text stream (opened with newline="")
+
+    Yields:
+        (title, description, completed) for every row; an empty
+        description becomes None
+
+    Raises:
+        ValueError: If there is no title column or a row is malformed
+    """
+    if csv.field_size_limit() < CSV_FIELD_LIMIT:
+        csv.field_size_limit(CSV_FIELD_LIMIT)
+    reader = csv.DictReader(source, strict=True)
+    try:
+        if not reader.fieldnames or "title" not in reader.fieldnames:
+            raise ValueError("CSV input needs a header row with a title column")
+        for row in reader:
+            yield (row["title"] or "", row.get("description") or None,
+                   _parse_completed(row.get("completed") or False))
+    except csv.Error as e:
+        raise ValueError(f"Malformed CSV at line {reader.reader.line_num}: {e}") from None
@@ -1,6 +1,13 @@
 """
 Validation utilities for the todo application.
 """
+import re
+from typing import List
+
+_ID_RANGE_PATTERN = re.compile(r"^(\d+)(?:-(\d+))?$")
+# Most tasks one bulk command may name or create, so a typo cannot exhaust
+# memory
+MAX_BULK_TASKS = 1_000_000
 
 
 def validate_task_title(title: str) -> bool:
@@ -43,4 +50,55 @@ def sanitize_input(input_str: str) -> str:
     Returns:
         Sanitized string with whitespace stripped
     """
-    return input_str.strip() if input_str else ""
\ No newline at end of file
+    return input_str.strip() if input_str else ""
+
+
+def parse_id_ranges(spec: str) -> List[int]:
+    """
+    Parse a list of task IDs and inclusive ID ranges.
+
+    Items are separated by whitespace or commas, e.g. "1-5000 7,9-12".
+
+    Args:
+        spec: The ID specification to parse
+
+    Returns:
+        The IDs in the order given
+
+    Raises:
+        ValueError: If an item is not an ID or a valid range, or the items
+            add up to more than MAX_BULK_TASKS IDs
+    """
+    ids: List[int] = []
+    for item in spec.replace(",", " ").split():
+        match = _ID_RANGE_PATTERN.match(item)
+        if not match:
+            raise ValueError(f"Invalid task ID or range: {item}")
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else start
+        if end < start:
+            raise ValueError(f"Invalid task ID range: {item}")
+        # Checked before expanding, so a huge range is never built
+        if len(ids) + end - start + 1 > MAX_BULK_TASKS:
+            raise ValueError(f"Too many task IDs: at most {MAX_BULK_TASKS} per command")
+        ids.extend(range(start, end + 1))
+    return ids
+
+
+def numbered_titles(count: int, prefix: str) -> List[str]:
+    """
+    Build the titles "prefix 1" to "prefix count" for ADD-MANY.
+
+    Args:
+        count: How many titles to build
+        prefix: The text each title starts with
+
+    Returns:
+        The numbered titles
+
+    Raises:
+        ValueError: If count is more than MAX_BULK_TASKS
+    """
+    if count > MAX_BULK_TASKS:
+        raise ValueError(f"Too many tasks: at most {MAX_BULK_TASKS} per command")
+    return [f"{prefix} {i}" for i in range(1, count + 1)]
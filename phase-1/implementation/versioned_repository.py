@@ -0,0 +1,385 @@
+"""
+Versioned task repository with copy-on-write snapshots for the todo application.
+"""
+from collections.abc import MutableMapping
+from typing import Iterator, List, Optional, Set, Tuple
+try:
+    from implementation.repository import TodoRepository
+    from implementation.todo_model import Todo
+except ImportError:
+    from repository import TodoRepository
+    from todo_model import Todo
+
+# Number of consecutive IDs stored together in one page
+PAGE_SIZE = 256
+# Children of each node of the page table tree
+TABLE_FANOUT = 64
+_FANOUT_BITS = TABLE_FANOUT.bit_length() - 1
+_FANOUT_MASK = TABLE_FANOUT - 1
+
+
+def _find_page(root: list, height: int, page_index: int) -> Optional[dict]:
+    """Walk a page table tree of the given height down to a page, or None if it has none."""
+    if page_index < 0 or page_index >> (_FANOUT_BITS * height):
+        return None
+    node = root
+    for level in range(height - 1, -1, -1):
+        node = node[(page_index >> (_FANOUT_BITS * level)) & _FANOUT_MASK]
+        if node is None:
+            return None
+    return node
+
+
+def _iter_pages(node: list, height: int) -> Iterator[dict]:
+    """Iterate over the non-empty pages of a page table tree in ID order."""
+    for child in node:
+        if child:
+            if height == 1:
+                yield child
+            else:
+                yield from _iter_pages(child, height - 1)
+
+
+class TodoSnapshot:
+    """
+    A frozen, read-only version of a PagedTodoStore.
+
+    The snapshot shares its pages (and the todos in them) with the store
+    and with other snapshots; the store copies a page before changing it,
+    so a snapshot never observes later writes.
+    """
+    __slots__ = ("_root", "_height", "_count")
+
+    def __init__(self, root: list, height: int, count: int):
+        """
+        Initialize the snapshot.
+
+        Args:
+            root: The root of the version's page table tree; it must never
+                be modified
+            height: The number of tree levels above the pages
+            count: The number of todos in the version
+        """
+        self._root = root
+        self._height = height
+        self._count = count
+
+    def get(self, todo_id: int) -> Optional[Todo]:
+        """Return the todo with an ID in this version, or None."""
+        page = _find_page(self._root, self._height, (todo_id - 1) // PAGE_SIZE)
+        return page.get(todo_id) if page is not None else None
+
+    def __iter__(self) -> Iterator[Todo]:
+        """Iterate over the todos of this version in ID order."""
+        for page in _iter_pages(self._root, self._height):
+            yield from page.values()
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class PagedTodoStore(MutableMapping):
+    """
+    Mapping of task ID to Todo stored in copy-on-write pages.
+
+    Task IDs are grouped into pages of PAGE_SIZE consecutive IDs, and the
+    pages are reached through a tree of TABLE_FANOUT-way nodes. freeze()
+    hands out the current tree as a TodoSnapshot in O(1) and marks
+    everything as shared. The first write afterwards copies the nodes on
+    the path to its page, O(log n) pointers rather than the whole table,
+    and the page itself; todos are copied before they are modified in place
+    (writable()), so every frozen version stays intact while the store
+    moves on.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._root: list = [None] * TABLE_FANOUT
+        self._height = 1
+        self._count = 0
+        # Nodes copied since the last freeze, as (level, page index >> level bits)
+        self._owned_nodes: Set[Tuple[int, int]] = {(1, 0)}
+        self._owned_pages: Set[int] = set()
+        self._owned_todos: Set[int] = set()
+        self._dirty: Set[int] = set()
+
+    def _page_for_write(self, page_index: int) -> dict:
+        """Return a page that belongs to the current version, copying it and its path if shared."""
+        while page_index >> (_FANOUT_BITS * self._height):
+            # Grow a level: the old root becomes the first child of a new one
+            self._root = [self._root] + [None] * (TABLE_FANOUT - 1)
+            self._height += 1
+            self._owned_nodes.add((self._height, 0))
+        if (self._height, 0) not in self._owned_nodes:
+            self._root = list(self._root)
+            self._owned_nodes.add((self._height, 0))
+        node = self._root
+        for level in range(self._height - 1, 0, -1):
+            prefix = page_index >> (_FANOUT_BITS * level)
+            slot = prefix & _FANOUT_MASK
+            child = node[slot]
+            if (level, prefix) not in self._owned_nodes:
+                child = list(child) if child is not None else [None] * TABLE_FANOUT
+                node[slot] = child
+                self._owned_nodes.add((level, prefix))
+            node = child
+        slot = page_index & _FANOUT_MASK
+        page = node[slot]
+        if page_index not in self._owned_pages:
+            page = dict(page) if page is not None else {}
+            node[slot] = page
+            self._owned_pages.add(page_index)
+        return page
+
+    def _page(self, todo_id: int) -> Optional[dict]:
+        """Return the page an ID belongs to, or None if it has none."""
+        return _find_page(self._root, self._height, (todo_id - 1) // PAGE_SIZE)
+
+    # -- versions ---------------------------------------------------------
+
+    def freeze(self) -> TodoSnapshot:
+        """Return the current contents as an immutable snapshot, in O(1)."""
+        snapshot = TodoSnapshot(self._root, self._height, self._count)
+        self._owned_nodes = set()
+        self._owned_pages = set()
+        self._owned_todos = set()
+        self._dirty = set()
+        return snapshot
+
+    def restore(self, snapshot: TodoSnapshot):
+        """Make a snapshot the current contents again, in O(1)."""
+        self._root = snapshot._root
+        self._height = snapshot._height
+        self._count = snapshot._count
+        self._owned_nodes = set()
+        self._owned_pages = set()
+        self._owned_todos = set()
+        self._dirty = set()
+
+    @property
+    def dirty_ids(self) -> Set[int]:
+        """IDs inserted, modified or deleted since the last freeze or restore."""
+        return self._dirty
+
+    def writable(self, todo_id: int) -> Optional[Todo]:
+        """
+        Return a todo that may be modified in place without affecting snapshots.
+
+        Args:
+            todo_id: The ID of the todo
+
+        Returns:
+            The current version's private copy of the todo, or None if absent
+        """
+        page = self._page(todo_id)
+        if page is None or todo_id not in page:
+            return None
+        if todo_id in self._owned_todos:
+            return page[todo_id]
+        page = self._page_for_write((todo_id - 1) // PAGE_SIZE)
+        todo = page[todo_id]
+        todo = Todo.from_validated(todo.id, todo.title, todo.description, todo.completed)
+        page[todo_id] = todo
+        self._owned_todos.add(todo_id)
+        self._dirty.add(todo_id)
+        return todo
+
+    # -- mapping protocol -------------------------------------------------
+
+    def __getitem__(self, todo_id: int) -> Todo:
+        page = self._page(todo_id)
+        if page is None:
+            raise KeyError(todo_id)
+        return page[todo_id]
+
+    def get(self, todo_id: int, default=None):
+        page = self._page(todo_id)
+        return page.get(todo_id, default) if page is not None else default
+
+    def __setitem__(self, todo_id: int, todo: Todo):
+        page = self._page_for_write((todo_id - 1) // PAGE_SIZE)
+        if todo_id not in page:
+            self._count += 1
+        page[todo_id] = todo
+        self._owned_todos.add(todo_id)
+        self._dirty.add(todo_id)
+
+    def __delitem__(self, todo_id: int):
+        page = self._page(todo_id)
+        if page is None or todo_id not in page:
+            raise KeyError(todo_id)
+        del self._page_for_write((todo_id - 1) // PAGE_SIZE)[todo_id]
+        self._count -= 1
+        self._owned_todos.discard(todo_id)
+        self._dirty.add(todo_id)
+
+    def __contains__(self, todo_id) -> bool:
+        page = self._page(todo_id) if isinstance(todo_id, int) else None
+        return page is not None and todo_id in page
+
+    def __iter__(self) -> Iterator[int]:
+        for page in _iter_pages(self._root, self._height):
+            yield from page.keys()
+
+    def values(self) -> Iterator[Todo]:
+        """Iterate over the stored todos in ID order."""
+        for page in _iter_pages(self._root, self._height):
+            yield from page.values()
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class VersionedTodoRepository(TodoRepository):
+    """
+    TodoRepository that keeps copy-on-write versions of its contents.
+
+    Every successful mutation (including each bulk operation) starts a new
+    version, and the previous one is kept on an undo stack of at most
+    `max_history` entries, so undo() and redo() just switch versions.
+    Switching versions only re-indexes the todos that differ between them.
+    snapshot() hands out a frozen TodoSnapshot for consistent reads (e.g.
+    exports) while writes continue.
+
+    Todos handed out before a mutation are not updated by it: the mutation
+    works on a private copy so that earlier versions stay unchanged.
+    """
+
+    def __init__(self, max_history: int = 100):
+        """
+        Initialize the repository.
+
+        Args:
+            max_history: Maximum number of versions kept for undo
+        """
+        super().__init__()
+        self._storage = PagedTodoStore()
+        self.max_history = max_history
+        # Entries are (version, IDs that changed after it, next ID in it)
+        self._undo_stack: List[Tuple[TodoSnapshot, Set[int], int]] = []
+        self._redo_stack: List[Tuple[TodoSnapshot, Set[int], int]] = []
+
+    def _writable(self, todo_id: int) -> Optional[Todo]:
+        """Return a private copy of the todo that the current version may modify."""
+        return self._storage.writable(todo_id)
+
+    def snapshot(self) -> TodoSnapshot:
+        """
+        Take a consistent, read-only view of the current contents in O(1).
+
+        Returns:
+            A TodoSnapshot that later writes do not affect
+        """
+        return self._storage.freeze()
+
+    def iter_todos(self) -> Iterator[Todo]:
+        """
+        Iterate over a snapshot of the todos taken when the iteration starts.
+
+        The repository may be changed while the iteration is running; the
+        changes are not visible to it.
+
+        Returns:
+            An iterator over the Todo objects, ordered by ID
+        """
+        return iter(self.snapshot())
+
+    # -- history ----------------------------------------------------------
+
+    def _versioned(self, operation, *args):
+        """
+        Run a mutation as a new version, recording the previous one for undo.
+
+        Mutations that change nothing (e.g. on a missing ID) or raise leave
+        the history untouched.
+        """
+        version = self._storage.freeze()
+        next_id = self._next_id
+        try:
+            result = operation(*args)
+        finally:
+            dirty = self._storage.dirty_ids
+            if dirty:
+                self._undo_stack.append((version, dirty, next_id))
+                if len(self._undo_stack) > self.max_history:
+                    del self._undo_stack[0]
+                self._redo_stack.clear()
+        return result
+
+    def _switch_to(self, version: TodoSnapshot, changed: Set[int]):
+        """Make a version current, re-indexing only the todos that differ."""
+        current = self._storage.freeze()
+        for todo_id in changed:
+            todo = current.get(todo_id)
+            if todo is not None:
+                self._unindex_todo(todo)
+        self._storage.restore(version)
+        for todo_id in changed:
+            todo = version.get(todo_id)
+            if todo is not None:
+                self._index_todo(todo)
+        return current
+
+    def undo(self) -> bool:
+        """
+        Return to the version before the last mutation.
+
+        Returns:
+            True if a mutation was undone, False if there was nothing to undo
+        """
+        if not self._undo_stack:
+            return False
+        version, changed, next_id = self._undo_stack.pop()
+        current = self._switch_to(version, changed)
+        self._redo_stack.append((current, changed, self._next_id))
+        self._next_id = next_id
+        return True
+
+    def redo(self) -> bool:
+        """
+        Re-apply the last undone mutation.
+
+        Returns:
+            True if a mutation was redone, False if there was nothing to redo
+        """
+        if not self._redo_stack:
+            return False
+        version, changed, next_id = self._redo_stack.pop()
+        current = self._switch_to(version, changed)
+        self._undo_stack.append((current, changed, self._next_id))
+        self._next_id = next_id
+        return True
+
+    # -- versioned mutations ----------------------------------------------
+
+    def add_todo(self, title, description=None):
+        """Add a new todo as a new version."""
+        return self._versioned(super().add_todo, title, description)
+
+    def update_todo(self, todo_id, title=None, description=None):
+        """Update an existing todo as a new version."""
+        return self._versioned(super().update_todo, todo_id, title, description)
+
+    def delete_todo(self, todo_id):
+        """Delete a todo as a new version."""
+        return self._versioned(super().delete_todo, todo_id)
+
+    def toggle_completion(self, todo_id):
+        """Toggle a todo's completion status as a new version."""
+        return self._versioned(super().toggle_completion, todo_id)
+
+    def add_many(self, items):
+        """Add many todos as a single new version."""
+        return self._versioned(super().add_many, items)
+
+    def update_many(self, updates):
+        """Update many todos as a single new version."""
+        return self._versioned(super().update_many, updates)
+
+    def complete_many(self, todo_ids, completed=True):
+        """Set the status of many todos as a single new version."""
+        return self._versioned(super().complete_many, todo_ids, completed)
+
+    def delete_many(self, todo_ids):
+        """Delete many todos as a single new version."""
+        return self._versioned(super().delete_many, todo_ids)
@@ -0,0 +1,54 @@
+"""
+Tests for the non-interactive batch mode.
+"""
+import sys
+import os
+import io
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation.cli import TodoCLI
+from implementation.main import run_batch
+
+
+def test_run_batch():
+    """Test that scripts run through process_command with buffered output."""
+    cli = TodoCLI()
+    script = [
+        '# Seed the list\n',
+        'ADD "Buy groceries" "Milk, eggs, bread"\n',
+        '\n',
+        'ADD "Walk the dog"\n',
+        'COMPLETE 1\n',
+        'LIST\n',
+    ]
+    output = io.StringIO()
+    executed = run_batch(cli, script, output, flush_every=2)
+
+    assert executed == 4
+    assert output.getvalue() == (
+        "Added task #1: Buy groceries\n"
+        "Added task #2: Walk the dog\n"
+        "Task #1 marked as complete\n"
+        "1. [x] Buy groceries - Milk, eggs, bread\n"
+        "2. [ ] Walk the dog\n"
+    )
+
+    print("Batch mode tests passed!")
+
+
+def test_run_batch_stops_at_exit():
+    """Test that EXIT ends the script."""
+    cli = TodoCLI()
+    output = io.StringIO()
+    executed = run_batch(cli, ['ADD "First"', 'EXIT', 'ADD "Never added"'], output)
+
+    assert executed == 2
+    assert cli.service.count_tasks() == 1
+    assert output.getvalue().endswith("Goodbye!\n")
+
+    print("Batch EXIT tests passed!")
+
+
+if __name__ == "__main__":
+    test_run_batch()
+    test_run_batch_stops_at_exit()
@@ -0,0 +1,123 @@
+"""
+Tests for the bulk add/update/complete/delete operations.
+"""
+import sys
+import os
+import io
+import tempfile
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation.cli import TodoCLI
+from implementation.service import TodoService
+from implementation.validation import parse_id_ranges
+
+
+def test_bulk_operations_on_every_backend():
+    """Test bulk results and index maintenance on the in-memory backends."""
+    for backend in ("dict", "compact", "concurrent", "versioned"):
+        service = TodoService(backend=backend)
+        service.add_task("Existing task")
+
+        result = service.add_many([("Buy groceries", "Milk"), ("   ", None),
+                                   ("Walk the dog", None), ("", "No title")])
+        assert [t.id for t in result.succeeded] == [2, 3]
+        assert [position for position, _ in result.failed] == [1, 3]
+        assert service.get_task(2).description == "Milk"
+        assert service.add_task("After the block").id == 4
+
+        result = service.update_many([(2, "Buy vegetables", None), (3, " ", None),
+                                      (99, "Missing", None), (4, None, "New description")])
+        assert [t.id for t in result.succeeded] == [2, 4]
+        assert [todo_id for todo_id, _ in result.failed] == [3, 99]
+        assert service.get_task(2).title == "Buy vegetables"
+        assert service.get_task(3).title == "Walk the dog"
+        assert [t.id for t in service.search("vegetables")] == [2]
+
+        result = service.complete_many([1, 2, 99])
+        assert [t.id for t in result.succeeded] == [1, 2]
+        assert result.failed == [(99, "Task with ID 99 does not exist")]
+        result = service.complete_many([1, 2])  # Setting, not toggling
+        assert [t.id for t in service.list_tasks(completed=True)] == [1, 2]
+
+        result = service.delete_many(range(2, 6))
+        assert [t.id for t in result.succeeded] == [2, 3, 4]
+        assert [todo_id for todo_id, _ in result.failed] == [5]
+        assert [t.id for t in service.list_tasks()] == [1]
+        assert [t.id for t in service.list_tasks(completed=True)] == [1]
+        assert service.list_tasks(completed=False) == []
+
+    print("Bulk operation tests passed!")
+
+
+def test_bulk_operations_are_durable():
+    """Test that bulk operations are logged and replayed."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        service = TodoService(backend="durable", data_dir=data_dir)
+        service.add_many([(f"Task {i}", None) for i in range(1, 11)])
+        service.complete_many(range(1, 6))
+        service.update_many([(6, "Renamed", "With description")])
+        service.delete_many([9, 10])
+        expected = [str(t) for t in service.list_tasks()]
+        service.close()
+
+        service = TodoService(backend="durable", data_dir=data_dir)
+        assert [str(t) for t in service.list_tasks()] == expected
+        assert service.count_tasks(completed=True) == 5
+        assert service.add_task("Next").id == 11
+        service.close()
+
+    print("Durable bulk operation tests passed!")
+
+
+def test_parse_id_ranges():
+    """Test parsing of ID lists and ranges."""
+    assert parse_id_ranges("1-3 7,9-10") == [1, 2, 3, 7, 9, 10]
+    assert parse_id_ranges("5") == [5]
+    assert parse_id_ranges("") == []
+    assert len(parse_id_ranges("1-999999 5000000")) == 1000000
+    for invalid in ("5-1", "a-b", "1-", "-3", "1-10000000000", "1-600000 1-400001"):
+        try:
+            parse_id_ranges(invalid)
+            assert False, f"Expected ValueError for {invalid!r}"
+        except ValueError:
+            pass  # Expected
+
+    print("ID range parsing tests passed!")
+
+
+def test_cli_bulk_commands():
+    """Test the ADD-MANY, COMPLETE-MANY and DELETE-MANY commands."""
+    cli = TodoCLI()
+
+    def run(command):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            cli.process_command(command)
+        return output.getvalue()
+
+    assert run('ADD-MANY "Buy groceries" "Walk the dog"') == "Added 2 tasks (#1-#2)\n"
+    assert run('ADD-MANY 5000 "Task"') == "Added 5000 tasks (#3-#5002)\n"
+    assert cli.service.get_task(5002).title == "Task 5000"
+    assert run('ADD-MANY "Valid" "  "') == "Added 1 tasks (#5003-#5003)\n" \
+        "Skipped 1 tasks: Title cannot be empty or whitespace only\n"
+    assert run("ADD-MANY").startswith("Invalid format for ADD-MANY")
+    assert run('ADD-MANY 10000000000 "x"') == \
+        "Error: Too many tasks: at most 1000000 per command\n"
+
+    assert run("COMPLETE-MANY 1-2 4") == "Marked 3 tasks as complete\n"
+    assert run("DELETE-MANY 3-5000") == "Deleted 4998 tasks\n"
+    assert run("DELETE-MANY 1 3-4") == "Deleted 1 tasks\n2 task IDs do not exist\n"
+    assert run("DELETE-MANY 9-1") == "Error: Invalid task ID range: 9-1\n"
+    assert run("DELETE-MANY 1-10000000000") == "Error: Too many task IDs: at most 1000000 per command\n"
+    assert run("COMPLETE-MANY").startswith("Invalid format for COMPLETE-MANY")
+    assert [t.id for t in cli.service.list_tasks()] == [2, 5001, 5002, 5003]
+
+    print("CLI bulk command tests passed!")
+
+
+if __name__ == "__main__":
+    test_bulk_operations_on_every_backend()
+    test_bulk_operations_are_durable()
+    test_parse_id_ranges()
+    test_cli_bulk_commands()
@@ -0,0 +1,63 @@
+"""
+Tests for the single-task CLI command handlers and the service values they rely on.
+"""
+import sys
+import os
+import io
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation.cli import TodoCLI
+from implementation.service import TodoService
+
+
+def _run(cli, command):
+    """Run a command and return what it printed."""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        cli.process_command(command)
+    return output.getvalue()
+
+
+def test_service_returns_affected_task():
+    """Test that every mutation returns the affected task."""
+    service = TodoService()
+    task = service.add_task("Walk the dog")
+
+    assert service.get_task(task.id) is task
+    assert service.get_task(999) is None
+
+    toggled = service.complete_task(task.id)
+    assert toggled.id == task.id and toggled.completed
+
+    updated = service.update_task(task.id, "Walk the cat")
+    assert updated.title == "Walk the cat"
+
+    deleted = service.delete_task(task.id)
+    assert deleted.title == "Walk the cat"
+    assert service.get_task(task.id) is None
+
+    print("Service return value tests passed!")
+
+
+def test_cli_single_task_commands():
+    """Test COMPLETE, UPDATE and DELETE output for existing and missing tasks."""
+    cli = TodoCLI()
+    cli.service.add_task("Walk the dog")
+
+    assert _run(cli, "COMPLETE 1") == "Task #1 marked as complete\n"
+    assert _run(cli, "COMPLETE 1") == "Task #1 marked as incomplete\n"
+    assert _run(cli, 'UPDATE 1 "Walk the cat"') == "Task #1 updated successfully\n"
+    assert _run(cli, 'UPDATE 1 "   "') == "Error: Title cannot be empty or whitespace only\n"
+    assert _run(cli, "DELETE 1") == "Task #1 deleted successfully\n"
+
+    for command in ("COMPLETE 1", 'UPDATE 1 "Title"', "DELETE 1"):
+        assert _run(cli, command) == "Error: Task with ID 1 does not exist\n"
+    assert _run(cli, "DELETE one") == "Invalid task ID. Please provide a valid number.\n"
+
+    print("CLI single-task command tests passed!")
+
+
+if __name__ == "__main__":
+    test_service_returns_affected_task()
+    test_cli_single_task_commands()
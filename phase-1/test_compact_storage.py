@@ -0,0 +1,89 @@
+"""
+Tests for the compact columnar storage backend.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation.service import TodoService
+from implementation.compact_storage import ColumnarTodoStore, CompactTodoRepository, TodoView
+from implementation.todo_model import Todo
+
+
+def test_compact_backend_matches_dict_backend():
+    """Run the same operations against both backends and compare the results."""
+    services = [TodoService(), TodoService(backend="compact")]
+    assert isinstance(services[1].repository, CompactTodoRepository)
+
+    for service in services:
+        service.add_task("Buy groceries", "Milk, eggs, bread")
+        service.add_task("Walk the dog")
+        service.add_task("Finish report", "Submit by Friday")
+        service.complete_task(1)
+        service.update_task(2, "Walk the cat", "Play with the cat")
+        service.update_task(3, description="Submit by Monday")
+        service.delete_task(1)
+
+    dict_tasks, compact_tasks = (s.list_tasks() for s in services)
+    assert dict_tasks == compact_tasks
+    assert [str(t) for t in dict_tasks] == [str(t) for t in compact_tasks]
+
+    print("Compact backend parity tests passed!")
+
+
+def test_compact_views():
+    """Test that views read and write through to the columns."""
+    service = TodoService(backend="compact")
+
+    task = service.add_task("Café ☕", "Unicode description")
+    assert isinstance(task, TodoView)
+    assert task.title == "Café ☕"
+    assert not task.completed
+
+    # Mutations through the service are visible through an existing view
+    service.complete_task(task.id)
+    assert task.completed
+    service.update_task(task.id, "Tea", None)
+    assert task.title == "Tea"
+    assert task.description == "Unicode description"
+    assert task.to_todo() == Todo(id=1, title="Tea", description="Unicode description",
+                                  completed=True)
+
+    # Validation still applies
+    try:
+        service.add_task("   ")
+        assert False, "Expected ValueError for whitespace-only title"
+    except ValueError:
+        pass  # Expected
+    assert len(service.list_tasks()) == 1
+
+    # Missing IDs behave exactly like the dict backend
+    assert service.update_task(999, "Nothing") is None
+    assert service.delete_task(999) is None
+    assert service.complete_task(999) is None
+
+    print("Compact view tests passed!")
+
+
+def test_compact_arena_reclaims_garbage():
+    """Test that repeated updates do not grow the string arena without bound."""
+    store = ColumnarTodoStore()
+    for todo_id in range(1, 101):
+        store[todo_id] = Todo(id=todo_id, title=f"Task {todo_id}")
+    for round_number in range(200):
+        store[1].title = f"Rewritten title number {round_number}"
+    del store[2]
+
+    assert len(store) == 99
+    assert 2 not in store
+    assert store[1].title == "Rewritten title number 199"
+    assert store[100].title == "Task 100"
+    assert store.nbytes() < 100 * 25 + 8192
+
+    print("Compact arena tests passed!")
+
+
+if __name__ == "__main__":
+    test_compact_backend_matches_dict_backend()
+    test_compact_views()
+    test_compact_arena_reclaims_garbage()
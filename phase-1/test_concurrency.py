@@ -0,0 +1,157 @@
+"""
+Multi-threaded stress tests for the concurrent repository.
+"""
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation.service import TodoService
+from implementation.concurrent_repository import ConcurrentTodoRepository, IdAllocator
+
+THREADS = 8
+
+
+def _run_threads(target, count=THREADS):
+    """Start `count` threads running target(index) and wait for them all."""
+    barrier = threading.Barrier(count)
+
+    def worker(index):
+        barrier.wait()
+        target(index)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_adds_get_unique_ids():
+    """Test that no IDs are duplicated or lost when threads add in parallel."""
+    service = TodoService(backend="concurrent")
+    per_thread = 2000
+    created = [[] for _ in range(THREADS)]
+
+    def add(index):
+        for i in range(per_thread):
+            created[index].append(service.add_task(f"Thread {index} task {i}").id)
+
+    _run_threads(add)
+
+    all_ids = [todo_id for ids in created for todo_id in ids]
+    assert len(set(all_ids)) == THREADS * per_thread
+    assert sorted(all_ids) == list(range(1, THREADS * per_thread + 1))
+    assert service.count_tasks() == THREADS * per_thread
+    assert service.count_tasks(completed=False) == THREADS * per_thread
+
+    print("Concurrent add tests passed!")
+
+
+def test_concurrent_toggles_are_not_lost():
+    """Test that every toggle of a shared task is applied exactly once."""
+    service = TodoService(backend="concurrent")
+    task_count = 200
+    for i in range(task_count):
+        service.add_task(f"Shared task {i}")
+    toggles_per_thread = 25
+
+    def toggle(index):
+        for _ in range(toggles_per_thread):
+            for todo_id in range(1, task_count + 1):
+                service.complete_task(todo_id)
+
+    # Eight threads toggling 25 times each is an even number of toggles, so
+    # every task must end up pending again unless an update was lost
+    _run_threads(toggle)
+
+    assert service.count_tasks(completed=True) == 0
+    assert service.count_tasks(completed=False) == task_count
+    assert all(not task.completed for task in service.list_tasks())
+
+    print("Concurrent toggle tests passed!")
+
+
+def test_concurrent_mixed_operations():
+    """Test that the indexes agree with storage after a mixed workload."""
+    repository = ConcurrentTodoRepository(stripes=4, stripe_width=8)
+    service = TodoService(repository=repository)
+    for i in range(1000):
+        service.add_task(f"Seed task {i}")
+
+    def work(index):
+        for todo_id in range(index + 1, 1001, THREADS):
+            if todo_id % 3 == 0:
+                service.delete_task(todo_id)
+            elif todo_id % 3 == 1:
+                service.complete_task(todo_id)
+            else:
+                service.update_task(todo_id, f"Updated task {todo_id}")
+        service.add_task(f"Added by thread {index}")
+
+    _run_threads(work)
+
+    tasks = service.list_tasks()
+    assert len(tasks) == 1000 - 333 + THREADS
+    assert service.list_tasks(completed=True) == sorted(
+        (t for t in tasks if t.completed), key=lambda t: t.id)
+    assert len(service.search("updated")) == 333
+    assert len(service.search("thread")) == THREADS
+
+    print("Concurrent mixed operation tests passed!")
+
+
+class _SlowIndexRepository(ConcurrentTodoRepository):
+    """Repository that yields to other threads between storing and indexing a todo."""
+
+    def _index_todo(self, todo):
+        time.sleep(0)
+        super()._index_todo(todo)
+
+
+def test_concurrent_bulk_adds_and_deletes():
+    """Test that deleting todos while add_many stores them leaves no stale index entries."""
+    repository = _SlowIndexRepository(stripes=4, stripe_width=8)
+    batches, batch_size, deleters = 20, 10, 2
+    total = batches * batch_size
+    adding = threading.Event()
+    adding.set()
+
+    def work(index):
+        if index == 0:
+            for batch in range(batches):
+                repository.add_many((f"Bulk task {batch}.{i}", None)
+                                    for i in range(batch_size))
+            adding.clear()
+            return
+        while adding.is_set():
+            repository.delete_many(range(index, total + 1, deleters))
+
+    _run_threads(work, count=deleters + 1)
+
+    remaining = repository.count_todos()
+    assert repository.count_todos(completed=False) == remaining
+    assert len(repository.list_todos()) == remaining
+    assert len(repository.search_todos("bulk")) == remaining
+
+    print("Concurrent bulk add/delete tests passed!")
+
+
+def test_id_allocator_blocks():
+    """Test that reserved blocks never overlap with single allocations."""
+    allocator = IdAllocator()
+    assert allocator.allocate() == 1
+    assert allocator.allocate_block(3) == range(2, 5)
+    assert allocator.allocate() == 5
+    assert allocator.next_id == 6
+
+    print("ID allocator tests passed!")
+
+
+if __name__ == "__main__":
+    test_concurrent_adds_get_unique_ids()
+    test_concurrent_toggles_are_not_lost()
+    test_concurrent_mixed_operations()
+    test_concurrent_bulk_adds_and_deletes()
+    test_id_allocator_blocks()
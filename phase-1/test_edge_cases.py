@@ -26,9 +26,9 @@ def test_edge_cases():
     except ValueError:
         pass  # Expected
 
-    # Test updating a non-existent task (should return False)
+    # Test updating a non-existent task (should return None)
     result = service.update_task(999, "New title")
-    assert result is False
+    assert result is None
 
     # Test updating with empty title (should fail)
     task = service.add_task("Valid task")
@@ -38,13 +38,13 @@ def test_edge_cases():
     except ValueError:
         pass  # Expected
 
-    # Test deleting a non-existent task (should return False)
+    # Test deleting a non-existent task (should return None)
     result = service.delete_task(999)
-    assert result is False
+    assert result is None
 
-    # Test completing a non-existent task (should return False)
+    # Test completing a non-existent task (should return None)
     result = service.complete_task(999)
-    assert result is False
+    assert result is None
 
     # Test adding task with description but no title (should fail)
     try:
@@ -60,7 +60,7 @@ def test_edge_cases():
 
     # Test updating only description (keeping title)
     result = service.update_task(task.id, description="Updated description")
-    assert result is True
+    assert result is not None
     updated_tasks = service.list_tasks()
     updated_task = next(t for t in updated_tasks if t.id == task.id)
     assert updated_task.description == "Updated description"
@@ -68,7 +68,7 @@ def test_edge_cases():
 
     # Test updating only title (keeping description)
     result = service.update_task(task.id, title="Updated title")
-    assert result is True
+    assert result is not None
     updated_tasks = service.list_tasks()
     updated_task = next(t for t in updated_tasks if t.id == task.id)
     assert updated_task.title == "Updated title"
@@ -0,0 +1,134 @@
+"""
+Tests for streaming EXPORT/IMPORT in JSON and CSV.
+"""
+import sys
+import os
+import io
+import tempfile
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation import transfer
+from implementation.cli import TodoCLI
+from implementation.service import TodoService
+
+
+def _populate(service):
+    """Add a mix of tasks, including awkward characters, to a service."""
+    service.add_task("Buy groceries", "Milk, eggs, \"fresh\" bread")
+    service.add_task("Walk the dog")
+    service.add_task("Café ünïcode ✓", "Line one\nline two")
+    service.add_task("Delete me")
+    service.complete_task(2)
+    service.delete_task(4)
+
+
+def test_round_trip_on_every_format():
+    """Test that an export imports back into identical tasks."""
+    with tempfile.TemporaryDirectory() as directory:
+        for format in transfer.FORMATS:
+            source = TodoService()
+            _populate(source)
+            path = os.path.join(directory, f"tasks.{format}")
+            assert source.export_tasks(path) == 3
+
+            target = TodoService()
+            assert target.import_tasks(path, chunk_size=2) == (3, 0)
+            assert [str(t) for t in target.list_tasks()] == \
+                [str(t).replace("4.", "3.", 1) if t.id == 4 else str(t)
+                 for t in source.list_tasks()]
+            assert [t.id for t in target.list_tasks(completed=True)] == [2]
+            assert [t.id for t in target.search("groceries")] == [1]
+
+    print("Round-trip tests passed!")
+
+
+def test_json_reader_streams_across_chunks():
+    """Test that records split across read chunks and malformed input are handled."""
+    original_chunk = transfer.READ_CHUNK
+    transfer.READ_CHUNK = 7
+    try:
+        text = ' [ {"title": "One", "completed": true} ,\n{"title":"Two","description":"x y"}]'
+        assert list(transfer.read_json(io.StringIO(text))) == \
+            [("One", None, True), ("Two", "x y", False)]
+        assert list(transfer.read_json(io.StringIO("[]"))) == []
+        for bad in ('{"title": "One"}', '[{"title": "One"} {"title": "Two"}]',
+                    '[{"title": "One"', '[{"name": "One"}]', '[1]'):
+            try:
+                list(transfer.read_json(io.StringIO(bad)))
+                assert False, f"Expected ValueError for {bad!r}"
+            except ValueError:
+                pass
+    finally:
+        transfer.READ_CHUNK = original_chunk
+
+    print("Streaming JSON reader tests passed!")
+
+
+def test_import_rejects_empty_titles():
+    """Test that records with empty titles are counted and skipped."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.csv")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write("title,completed\nFirst,true\n   ,false\nSecond,\n")
+        service = TodoService()
+        assert service.import_tasks(path) == (2, 1)
+        assert [str(t) for t in service.list_tasks()] == ["1. [x] First", "2. [ ] Second"]
+
+    print("Import validation tests passed!")
+
+
+def test_cli_export_import():
+    """Test the EXPORT and IMPORT commands."""
+    def run(cli, command):
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            cli.process_command(command)
+        return buffer.getvalue()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cli = TodoCLI()
+        _populate(cli.service)
+        path = os.path.join(directory, "my tasks.dat")
+        assert run(cli, f'EXPORT "{path}" csv') == f"Exported 3 tasks to {path}\n"
+        assert run(cli, f'IMPORT "{path}" CSV') == f"Imported 3 tasks from {path}\n"
+        assert cli.service.count_tasks() == 6
+        assert run(cli, f'EXPORT "{path}"').startswith("Error: Unknown file format")
+        assert run(cli, "IMPORT").startswith("Invalid format for IMPORT")
+        missing = os.path.join(directory, "missing.json")
+        assert run(cli, f"IMPORT {missing}").startswith("Error: ")
+
+    print("CLI export/import tests passed!")
+
+
+def test_csv_round_trip_with_large_fields():
+    """Test that IMPORT reads back a CSV EXPORT whose fields exceed the csv default limit."""
+    def run(cli, command):
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            cli.process_command(command)
+        return buffer.getvalue()
+
+    description = "x" * 200_000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.csv")
+        cli = TodoCLI()
+        cli.service.add_task("Long", description)
+        assert run(cli, f'EXPORT "{path}"') == f"Exported 1 tasks to {path}\n"
+        target = TodoCLI()
+        assert run(target, f'IMPORT "{path}"') == f"Imported 1 tasks from {path}\n"
+        assert target.service.get_task(1).description == description
+
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write('title,description\nFirst,ok\n"Second"x,bad\n')
+        assert run(target, f'IMPORT "{path}"').startswith("Error: Malformed CSV at line 3")
+
+    print("Large CSV field tests passed!")
+
+
+if __name__ == "__main__":
+    test_round_trip_on_every_format()
+    test_json_reader_streams_across_chunks()
+    test_import_rejects_empty_titles()
+    test_cli_export_import()
+    test_csv_round_trip_with_large_fields()
@@ -0,0 +1,112 @@
+"""
+Tests for named task lists in one service.
+"""
+import sys
+import os
+import io
+import tempfile
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation.cli import TodoCLI
+from implementation.main import run_batch
+from implementation.service import DEFAULT_LIST, TodoService
+
+
+def test_lists_are_independent():
+    """Test that each list has its own IDs, indexes and history."""
+    service = TodoService(backend="versioned")
+    service.add_task("Buy groceries")
+    service.add_task("Walk the dog")
+    assert service.use_list("work") is True
+    assert service.current_list == "work"
+    assert service.list_tasks() == []
+    assert service.add_task("Write report").id == 1
+    service.complete_task(1)
+    assert [t.id for t in service.search("report")] == [1]
+    assert service.search("groceries") == []
+
+    assert service.use_list(DEFAULT_LIST) is False
+    assert [t.title for t in service.list_tasks()] == ["Buy groceries", "Walk the dog"]
+    assert service.count_tasks(completed=True) == 0
+    assert service.undo() is True
+    assert [t.title for t in service.list_tasks()] == ["Buy groceries"]
+
+    service.use_list("work")
+    assert [str(t) for t in service.list_tasks()] == ["1. [x] Write report"]
+    assert service.list_names() == ["default", "work"]
+    for bad in ("", "has space", "../escape", "x" * 65):
+        try:
+            service.use_list(bad)
+            assert False, f"Expected ValueError for {bad!r}"
+        except ValueError:
+            pass
+    assert service.current_list == "work"
+
+    print("List independence tests passed!")
+
+
+def test_lists_are_stored_per_directory():
+    """Test that lists of the storage backends survive a reopen and are discovered."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        for backend in ("durable", "sqlite"):
+            directory = os.path.join(data_dir, backend)
+            service = TodoService(backend=backend, data_dir=directory)
+            service.add_task("Home task")
+            service.use_list("work")
+            service.add_task("Work task")
+            service.close()
+
+            service = TodoService(backend=backend, data_dir=directory)
+            assert service.list_names() == ["default", "work"], backend
+            assert [t.title for t in service.list_tasks()] == ["Home task"], backend
+            assert service.use_list("work") is False, backend
+            assert [t.title for t in service.list_tasks()] == ["Work task"], backend
+            service.close()
+
+    print("Stored list tests passed!")
+
+
+def test_batch_transaction_covers_every_list():
+    """Test that lists switched to inside a batch block are committed with it."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        cli = TodoCLI(TodoService(backend="sqlite", data_dir=data_dir))
+        script = ['ADD "Home 1"', "USE work", 'ADD "Work 1"', "USE default", 'ADD "Home 2"',
+                  "USE work", 'ADD "Work 2"']
+        run_batch(cli, script, io.StringIO(), flush_every=3)
+        cli.service.close()
+
+        service = TodoService(backend="sqlite", data_dir=data_dir)
+        assert [t.title for t in service.list_tasks()] == ["Home 1", "Home 2"]
+        service.use_list("work")
+        assert [t.title for t in service.list_tasks()] == ["Work 1", "Work 2"]
+        service.close()
+
+    print("Batch transaction tests passed!")
+
+
+def test_cli_use_and_lists():
+    """Test the USE and LISTS commands."""
+    def run(cli, command):
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            cli.process_command(command)
+        return buffer.getvalue()
+
+    cli = TodoCLI()
+    assert run(cli, "USE work") == "Created and switched to list 'work'\n"
+    assert run(cli, 'ADD "Plan sprint"') == "Added task #1: Plan sprint\n"
+    assert run(cli, "use default") == "Switched to list 'default'\n"
+    assert run(cli, "LIST") == "No tasks found.\n"
+    assert run(cli, "LISTS") == "* default\n  work\n"
+    assert run(cli, "USE") == "Invalid format for USE. Use: USE list\n"
+    assert run(cli, "USE bad/name").startswith("Error: ")
+
+    print("CLI list command tests passed!")
+
+
+if __name__ == "__main__":
+    test_lists_are_independent()
+    test_lists_are_stored_per_directory()
+    test_batch_transaction_covers_every_list()
+    test_cli_use_and_lists()
@@ -0,0 +1,131 @@
+"""
+Tests for the durable (write-ahead log and snapshot) repository.
+"""
+import sys
+import os
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation.service import TodoService
+from implementation.persistence import DurableTodoRepository, LOG_FILENAME, WriteAheadLog
+
+
+def _populate(service):
+    """Apply a mix of operations to a service."""
+    service.add_task("Buy groceries", "Milk, eggs, bread")
+    service.add_task("Walk the dog")
+    service.add_task("Finish report", "Submit by Friday")
+    service.complete_task(1)
+    service.update_task(2, "Walk the cat", "Play with the cat")
+    service.delete_task(3)
+    service.update_task(999, "Missing")  # Not logged
+
+
+def test_recovery_from_log():
+    """Test that a restart replays the log."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        service = TodoService(backend="durable", data_dir=data_dir)
+        _populate(service)
+        expected = [str(t) for t in service.list_tasks()]
+        service.close()
+
+        service = TodoService(backend="durable", data_dir=data_dir)
+        assert [str(t) for t in service.list_tasks()] == expected
+        assert [t.id for t in service.list_tasks(completed=True)] == [1]
+        assert [t.id for t in service.search("cat")] == [2]
+        # IDs keep counting from where the previous session stopped
+        assert service.add_task("New task").id == 4
+        service.close()
+
+    print("Log recovery tests passed!")
+
+
+def test_recovery_from_snapshot_and_tail():
+    """Test that a restart loads the snapshot and replays only the log tail."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        repository = DurableTodoRepository(data_dir, snapshot_interval=5)
+        service = TodoService(repository=repository)
+        _populate(service)  # Six logged operations: one snapshot, one in the tail
+        service.add_task("After the snapshot")
+        expected = [str(t) for t in service.list_tasks()]
+        service.close()
+
+        with open(os.path.join(data_dir, LOG_FILENAME)) as log:
+            assert len(log.readlines()) == 2
+
+        repository = DurableTodoRepository(data_dir, snapshot_interval=5)
+        assert [str(t) for t in repository.list_todos()] == expected
+        assert repository._ops_since_snapshot == 2
+        repository.close()
+
+    print("Snapshot recovery tests passed!")
+
+
+def test_torn_log_record_is_ignored():
+    """Test that a partially written final record does not break recovery."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        service = TodoService(backend="durable", data_dir=data_dir)
+        service.add_task("Survives")
+        service.close()
+        with open(os.path.join(data_dir, LOG_FILENAME), "a") as log:
+            log.write('{"lsn":2,"op":"add","id":2,"tit')
+
+        service = TodoService(backend="durable", data_dir=data_dir)
+        assert [t.title for t in service.list_tasks()] == ["Survives"]
+        service.add_task("Written after recovery")
+        service.close()
+
+        service = TodoService(backend="durable", data_dir=data_dir)
+        assert [t.title for t in service.list_tasks()] == ["Survives", "Written after recovery"]
+        service.close()
+
+    print("Torn record tests passed!")
+
+
+def test_log_cut_before_newline():
+    """Test that a complete final record missing its newline keeps later appends readable."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        service = TodoService(backend="durable", data_dir=data_dir)
+        service.add_task("First")
+        service.close()
+        with open(os.path.join(data_dir, LOG_FILENAME), "a") as log:
+            log.write('{"lsn":2,"op":"add","id":2,"title":"Cut before newline"}')
+
+        service = TodoService(backend="durable", data_dir=data_dir)
+        assert [t.title for t in service.list_tasks()] == ["First", "Cut before newline"]
+        service.add_task("Appended after recovery")
+        service.add_task("And another")
+        service.close()
+
+        service = TodoService(backend="durable", data_dir=data_dir)
+        assert [t.title for t in service.list_tasks()] == [
+            "First", "Cut before newline", "Appended after recovery", "And another"]
+        service.close()
+
+    print("Unterminated record tests passed!")
+
+
+def test_idle_log_is_synced():
+    """Test that records left pending when appends stop are synced by the timer."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        log = WriteAheadLog(os.path.join(data_dir, LOG_FILENAME), group_size=64, group_interval=0.02)
+        log.append({"lsn": 1})
+        time.sleep(0.01)
+        log.append({"lsn": 2})
+        assert log._pending == 2
+        deadline = time.monotonic() + 5
+        while log._pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert log._pending == 0
+        log.close()
+
+    print("Idle sync tests passed!")
+
+
+if __name__ == "__main__":
+    test_recovery_from_log()
+    test_recovery_from_snapshot_and_tail()
+    test_torn_log_record_is_ignored()
+    test_log_cut_before_newline()
+    test_idle_log_is_synced()
@@ -0,0 +1,100 @@
+"""
+Tests for the PROFILE and STATS commands and the profiling helpers.
+"""
+import sys
+import os
+import io
+import pstats
+import tempfile
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation.cli import TodoCLI
+from implementation.profiling import CommandStats, deep_size
+from implementation.service import TodoService
+
+
+def _run(cli, command):
+    """Run one command and return its output."""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        cli.process_command(command)
+    return buffer.getvalue()
+
+
+def test_latency_histogram():
+    """Test bucketing and percentile bounds of CommandStats."""
+    stats = CommandStats()
+    for elapsed_us in [0.5] * 90 + [3] * 9 + [1000]:
+        stats.record(int(elapsed_us * 1000), 100, 50)
+    assert stats.count == 100
+    assert stats.buckets[0] == 90 and stats.buckets[2] == 9 and stats.buckets[10] == 1
+    assert stats.percentile(0.5) == 1
+    assert stats.percentile(0.95) == 4
+    assert stats.percentile(1.0) == 1024
+    assert stats.allocated == 10_000 and stats.peak == 50
+
+    print("Latency histogram tests passed!")
+
+
+def test_storage_size_on_every_backend():
+    """Test that every backend reports a size that grows with its tasks."""
+    assert deep_size([]) < deep_size(["x" * 1000])
+    with tempfile.TemporaryDirectory() as data_dir:
+        for backend in ("dict", "compact", "concurrent", "versioned", "shared", "sqlite"):
+            service = TodoService(backend=backend, data_dir=data_dir)
+            empty = service.storage_bytes()
+            service.add_many((f"Task number {i}", "Some description") for i in range(2000))
+            assert service.storage_bytes() - empty > 2000 * 16, backend
+            service.close()
+
+    print("Storage size tests passed!")
+
+
+def test_cli_profile_and_stats():
+    """Test profiling a session, the STATS report and the cProfile dump."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "session.prof")
+        cli = TodoCLI()
+        cli.process_command('ADD "Unprofiled"')
+        output = _run(cli, "STATS")
+        assert output.startswith("List 'default': 1 tasks, ")
+        assert "No profile recorded" in output
+
+        assert _run(cli, f"profile on {path}") == \
+            f"Profiling started; cProfile output goes to {path}\n"
+        assert _run(cli, "PROFILE ON") == "Profiling is already on\n"
+        for i in range(20):
+            _run(cli, f'ADD "Task {i}"')
+        _run(cli, "LIST")
+        _run(cli, "NOSUCH")
+        output = _run(cli, "STATS")
+        assert "Profiling on: 21 commands" in output
+        assert "Largest live allocations since PROFILE ON:" in output
+        rows = {line.split()[0]: line.split()[1] for line in output.splitlines()
+                if line.split()[0] in ("ADD", "LIST", "STATS", "PROFILE", "NOSUCH")}
+        assert rows == {"ADD": "20", "LIST": "1"}
+
+        assert _run(cli, "PROFILE OFF") == (f"cProfile statistics written to {path}\n"
+                                            "Profiling stopped. Use STATS to see the results.\n")
+        functions = {name for _, _, name in pstats.Stats(path).stats}
+        assert "handle_add" in functions
+        _run(cli, 'ADD "After profiling"')
+        assert "Profiling off: 21 commands" in _run(cli, "STATS")
+        assert _run(cli, "PROFILE OFF") == "Profiling is not on\n"
+        assert _run(cli, "PROFILE OFF now").startswith("Invalid format for PROFILE")
+
+        # Closing the CLI writes the profile of a session left running
+        os.remove(path)
+        _run(cli, f'PROFILE ON "{path}"')
+        with redirect_stdout(io.StringIO()):
+            cli.close()
+        assert os.path.exists(path)
+
+    print("CLI profiling tests passed!")
+
+
+if __name__ == "__main__":
+    test_latency_histogram()
+    test_storage_size_on_every_backend()
+    test_cli_profile_and_stats()
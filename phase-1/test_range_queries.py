@@ -0,0 +1,94 @@
+"""
+Tests for the sorted ID index, ranged listing and the paged LIST command.
+"""
+import sys
+import os
+import io
+import random
+import tempfile
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation.cli import TodoCLI
+from implementation.range_index import SortedIdIndex
+from implementation.service import TodoService
+
+
+def test_sorted_id_index():
+    """Test adds in any order, discards and range iteration against a plain sorted list."""
+    rng = random.Random(15)
+    index = SortedIdIndex()
+    index.LOAD = 4
+    expected = set()
+    for todo_id in list(range(1, 200)) + rng.sample(range(200, 1000), 300):
+        index.add(todo_id)
+        expected.add(todo_id)
+    for todo_id in rng.sample(range(1, 1100), 400):
+        index.discard(todo_id)
+        expected.discard(todo_id)
+    ordered = sorted(expected)
+    assert len(index) == len(ordered)
+    assert list(index.irange()) == ordered
+    for start, end in ((None, 50), (100, None), (150, 420), (420, 150), (999, 2000), (5, 5)):
+        assert list(index.irange(start, end)) == \
+            [i for i in ordered if (start is None or i >= start) and (end is None or i <= end)]
+
+    print("Sorted ID index tests passed!")
+
+
+def test_ranged_listing_on_every_backend():
+    """Test that every backend returns the same pages of tasks."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        for backend in ("dict", "compact", "concurrent", "versioned", "shared", "sqlite"):
+            service = TodoService(backend=backend, data_dir=data_dir)
+            service.add_many((f"Task {i}", None) for i in range(1, 31))
+            service.delete_many(range(10, 15))
+            service.complete_many(range(1, 31, 3))
+
+            def ids(**kwargs):
+                return [t.id for t in service.list_tasks(**kwargs)]
+
+            assert ids(start_id=8, limit=4) == [8, 9, 15, 16], backend
+            assert ids(start_id=25) == [25, 26, 27, 28, 29, 30], backend
+            assert ids(end_id=3) == [1, 2, 3], backend
+            assert ids(start_id=5, end_id=20) == [5, 6, 7, 8, 9, 15, 16, 17, 18, 19, 20], backend
+            assert ids(completed=True, start_id=5, limit=3) == [7, 16, 19], backend
+            assert ids(completed=False, end_id=4) == [2, 3], backend
+            assert ids(start_id=31) == [] and ids(limit=0) == [], backend
+            assert ids() == ids(start_id=1, end_id=100), backend
+            # Bounds and limits beyond any machine integer are accepted
+            assert ids(start_id=29, end_id=2 ** 70, limit=2 ** 70) == [29, 30], backend
+            assert ids(start_id=2 ** 70, limit=2) == [], backend
+            service.close()
+
+    print("Ranged listing tests passed!")
+
+
+def test_cli_paged_list():
+    """Test LIST with a page, the next-page hint and invalid arguments."""
+    def run(cli, command):
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            cli.process_command(command)
+        return buffer.getvalue()
+
+    cli = TodoCLI()
+    cli.service.add_many((f"Task {i}", None) for i in range(1, 8))
+    cli.service.complete_many([2, 3, 6])
+    assert run(cli, "LIST 2 3") == ("2. [x] Task 2\n3. [x] Task 3\n4. [ ] Task 4\n"
+                                    "More tasks: LIST 5 3\n")
+    assert run(cli, "LIST 5 3") == "5. [ ] Task 5\n6. [x] Task 6\n7. [ ] Task 7\n"
+    assert run(cli, "list completed 1 2") == "2. [x] Task 2\n3. [x] Task 3\nMore tasks: LIST completed 4 2\n"
+    assert run(cli, "LIST completed 4 2") == "6. [x] Task 6\n"
+    assert run(cli, "LIST 50 10") == "No tasks found.\n"
+    assert run(cli, "LIST pending") == "1. [ ] Task 1\n4. [ ] Task 4\n5. [ ] Task 5\n7. [ ] Task 7\n"
+    for bad in ("LIST 5", "LIST 1 two", "LIST done 1 2", "LIST 1 2 pending"):
+        assert run(cli, bad).startswith("Invalid format for LIST"), bad
+
+    print("Paged LIST tests passed!")
+
+
+if __name__ == "__main__":
+    test_sorted_id_index()
+    test_ranged_listing_on_every_backend()
+    test_cli_paged_list()
@@ -0,0 +1,103 @@
+"""
+Tests for full-text search over tasks.
+"""
+import sys
+import os
+import io
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation.cli import TodoCLI
+from implementation.service import TodoService
+from implementation.search_index import InvertedIndex
+
+
+def test_search_matching():
+    """Test AND and prefix matching on every backend."""
+    for backend in ("dict", "compact"):
+        service = TodoService(backend=backend)
+        service.add_task("Buy groceries", "Milk, eggs, bread")
+        service.add_task("Walk the dog")
+        service.add_task("Buy a birthday present", "For the dog")
+
+        assert [t.id for t in service.search("buy")] == [1, 3]
+        assert [t.id for t in service.search("BUY dog")] == [3]
+        assert [t.id for t in service.search("gro")] == [1]
+        assert [t.id for t in service.search("b")] == [1, 3]
+        assert [t.id for t in service.search("dog walk")] == [2]
+        assert service.search("cat") == []
+        assert service.search("buy cat") == []
+        assert service.search("   ") == []
+
+    print("Search matching tests passed!")
+
+
+def test_search_follows_mutations():
+    """Test that updates and deletes are reflected in search results."""
+    service = TodoService()
+    service.add_task("Walk the dog")
+    service.add_task("Feed the dog", "Twice a day")
+
+    service.update_task(1, "Walk the cat")
+    assert [t.id for t in service.search("dog")] == [2]
+    assert [t.id for t in service.search("cat")] == [1]
+
+    service.update_task(2, description="Once a week")
+    assert service.search("twice") == []
+    assert [t.id for t in service.search("week")] == [2]
+
+    # A rejected update must leave the index untouched
+    try:
+        service.update_task(1, "   ")
+        assert False, "Expected ValueError for whitespace-only title"
+    except ValueError:
+        pass  # Expected
+    assert [t.id for t in service.search("cat")] == [1]
+
+    service.delete_task(2)
+    assert service.search("feed") == []
+    assert service.search("the") == service.list_tasks()
+
+    print("Search mutation tests passed!")
+
+
+def test_inverted_index_vocabulary():
+    """Test that tokens with no remaining documents are dropped."""
+    index = InvertedIndex()
+    index.add(1, "alpha beta")
+    index.add(2, "alphabet")
+    assert index.search("alpha") == [1, 2]
+
+    index.remove(1, "alpha beta")
+    assert index.search("alpha") == [2]
+    assert index.search("beta") == []
+    assert sorted(index._postings) == ["alphabet"]
+
+    print("Inverted index tests passed!")
+
+
+def test_cli_search():
+    """Test the SEARCH command."""
+    cli = TodoCLI()
+    cli.service.add_task("Buy groceries")
+    cli.service.add_task("Walk the dog")
+
+    def run(command):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            cli.process_command(command)
+        return output.getvalue()
+
+    assert run("SEARCH groc") == "1. [ ] Buy groceries\n"
+    assert run('search "walk dog"') == "2. [ ] Walk the dog\n"
+    assert run("SEARCH cat") == "No tasks found.\n"
+    assert run("SEARCH").startswith("Invalid format for SEARCH")
+
+    print("CLI search tests passed!")
+
+
+if __name__ == "__main__":
+    test_search_matching()
+    test_search_follows_mutations()
+    test_inverted_index_vocabulary()
+    test_cli_search()
@@ -0,0 +1,188 @@
+"""
+Multi-process tests for the shared-memory repository.
+"""
+import sys
+import os
+import multiprocessing
+import threading
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation import shared_memory_repository
+from implementation.service import TodoService
+from implementation.shared_memory_repository import SharedMemoryTodoRepository
+
+PROCESSES = 4
+
+
+def _add_and_toggle(repo, index, per_process):
+    """Worker: add tasks, then toggle the shared task 1 once per added task."""
+    for i in range(per_process):
+        repo.add_todo(f"Process {index} task {i}", "Added by a worker" if i % 2 else None)
+    for _ in range(per_process):
+        repo.toggle_completion(1)
+
+
+def _run_processes(context, target, args_for):
+    """Start PROCESSES workers with a multiprocessing context and wait for them."""
+    processes = [context.Process(target=target, args=args_for(i)) for i in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+
+def test_processes_share_one_task_set():
+    """Test that adds and toggles from several processes are all visible and none are lost."""
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    repo = SharedMemoryTodoRepository(capacity=10_000, arena_size=1024 * 1024, context=context)
+    repo.add_todo("Shared task")
+    per_process = 500
+
+    _run_processes(context, _add_and_toggle, lambda i: (repo, i, per_process))
+
+    todos = repo.list_todos()
+    assert len(todos) == repo.count_todos() == 1 + PROCESSES * per_process
+    assert [t.id for t in todos] == list(range(1, len(todos) + 1))
+    titles = {t.title for t in todos[1:]}
+    assert len(titles) == PROCESSES * per_process
+    # An even number of toggles in total leaves the task pending
+    assert repo.get_todo(1).completed is False
+    assert repo.count_todos(completed=True) == 0
+    repo.close()
+
+    print("Shared task set tests passed!")
+
+
+def _complete_own_stripe(repo, index):
+    """Worker: complete every task whose ID is congruent to index."""
+    repo.complete_many(range(index + 1, repo._next_id, PROCESSES))
+    repo.update_todo(index + 1, f"Finished by {index}")
+
+
+def test_spawned_workers_attach_by_name():
+    """Test that spawned processes map the same segment instead of copying it."""
+    context = multiprocessing.get_context("spawn")
+    repo = SharedMemoryTodoRepository(capacity=1000, arena_size=64 * 1024, context=context)
+    repo.add_many([(f"Task {i}", None) for i in range(100)])
+
+    _run_processes(context, _complete_own_stripe, lambda i: (repo, i))
+
+    assert repo.count_todos(completed=True) == 100
+    assert [repo.get_todo(i + 1).title for i in range(PROCESSES)] == \
+        [f"Finished by {i}" for i in range(PROCESSES)]
+    assert [t.id for t in repo.search_todos("finished")] == [1, 2, 3, 4]
+    repo.close()
+
+    print("Spawned worker tests passed!")
+
+
+def test_shared_backend_operations():
+    """Test the single-process behaviour through the service."""
+    service = TodoService(backend="shared")
+    service.add_task("Buy groceries", "Milk")
+    service.add_task("Walk the dog")
+    assert service.delete_task(2).title == "Walk the dog"
+    assert service.delete_task(2) is None
+    assert service.update_task(2, "Missing") is None
+    assert service.complete_task(99) is None
+    assert service.add_task("Next").id == 3
+    try:
+        service.add_task("   ")
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+    assert [str(t) for t in service.list_tasks()] == ["1. [ ] Buy groceries - Milk", "3. [ ] Next"]
+    service.close()
+
+    repo = SharedMemoryTodoRepository(capacity=2, arena_size=1024)
+    repo.add_many([("One", None), ("Two", None)])
+    try:
+        repo.add_todo("Three")
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+    repo.close()
+
+    print("Shared backend operation tests passed!")
+
+
+class _SlowChunkRepository(SharedMemoryTodoRepository):
+    """Yields to other threads whenever the arena chunk position is read."""
+
+    @property
+    def _chunk_next(self):
+        position = self.__dict__["_chunk_next"]
+        time.sleep(0)
+        return position
+
+    @_chunk_next.setter
+    def _chunk_next(self, position):
+        self.__dict__["_chunk_next"] = position
+
+
+def test_threads_get_separate_text_slots():
+    """Test that threads of one process never share arena bytes for their texts."""
+    repo = _SlowChunkRepository(capacity=2000, arena_size=1024 * 1024)
+
+    def add(worker):
+        for i in range(250):
+            repo.add_todo(f"Worker {worker} task {i:03d}")
+
+    threads = [threading.Thread(target=add, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    titles = sorted(todo.title for todo in repo.list_todos())
+    assert titles == sorted(f"Worker {w} task {i:03d}" for w in range(8) for i in range(250))
+    repo.close()
+
+    print("Threaded arena allocation tests passed!")
+
+
+class _TornRecord:
+    """Stands in for the record struct, handing one torn view of a record to the next reader."""
+
+    def __init__(self, record, torn):
+        self._record = record
+        self._torn = torn
+        self.size = record.size
+
+    def unpack_from(self, buf, position):
+        torn, self._torn = self._torn, None
+        return torn if torn is not None else self._record.unpack_from(buf, position)
+
+    def pack_into(self, *args):
+        self._record.pack_into(*args)
+
+
+def test_torn_read_is_retried():
+    """Test that a read torn by a concurrent write is retried instead of decoded."""
+    repo = SharedMemoryTodoRepository(capacity=4, arena_size=1024)
+    repo.add_todo("Café ✓", "Déjà vu")
+    record = shared_memory_repository._RECORD
+    position = repo._record_position(1)
+    version, state, offset, title_length, _ = record.unpack_from(repo._buf, position)
+    # As if the writer had moved on: an older version whose offset now
+    # lands inside a multi-byte character
+    torn = (version - 2, state, offset + 4, title_length, 1)
+    shared_memory_repository._RECORD = _TornRecord(record, torn)
+    try:
+        todo = repo.get_todo(1)
+    finally:
+        shared_memory_repository._RECORD = record
+    assert (todo.title, todo.description) == ("Café ✓", "Déjà vu")
+    repo.close()
+
+    print("Torn read tests passed!")
+
+
+if __name__ == "__main__":
+    test_processes_share_one_task_set()
+    test_spawned_workers_attach_by_name()
+    test_shared_backend_operations()
+    test_threads_get_separate_text_slots()
+    test_torn_read_is_retried()
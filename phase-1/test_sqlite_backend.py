@@ -0,0 +1,132 @@
+"""
+Tests for the SQLite-backed repository.
+"""
+import sys
+import os
+import io
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation.cli import TodoCLI
+from implementation.main import run_batch
+from implementation.service import TodoService
+from implementation.sqlite_repository import SqliteTodoRepository
+
+
+def test_sqlite_operations_and_reopen():
+    """Test the single-task operations and that the data survives a reopen."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        service = TodoService(backend="sqlite", data_dir=data_dir)
+        service.add_task("Buy groceries", "Milk, eggs, bread")
+        service.add_task("Walk the dog")
+        service.add_task("Finish report", "Submit by Friday")
+        assert service.complete_task(1).completed is True
+        assert service.update_task(2, "Walk the cat").description is None
+        assert service.delete_task(3).title == "Finish report"
+        assert service.update_task(99, "Missing") is None
+        assert service.delete_task(99) is None
+        try:
+            service.update_task(1, "   ")
+            assert False, "Expected ValueError"
+        except ValueError:
+            pass
+        expected = [str(t) for t in service.list_tasks()]
+        service.close()
+
+        service = TodoService(backend="sqlite", data_dir=data_dir)
+        assert [str(t) for t in service.list_tasks()] == expected
+        assert [t.id for t in service.list_tasks(completed=True)] == [1]
+        assert service.count_tasks(completed=False) == 1
+        assert [t.id for t in service.search("gro mil")] == [1]
+        assert [t.id for t in service.search("CAT")] == [2]
+        assert service.search("dog") == []
+        # Deleted IDs are not handed out again
+        assert service.add_task("New task").id == 4
+        service.close()
+
+    print("SQLite operation tests passed!")
+
+
+def test_transactions_roll_back():
+    """Test that a failing transaction() block leaves nothing behind."""
+    repo = SqliteTodoRepository(":memory:")
+    repo.add_todo("Kept")
+    try:
+        with repo.transaction():
+            repo.add_todo("Discarded")
+            repo.toggle_completion(1)
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert repo.count_todos() == 1
+    assert repo.get_todo(1).completed is False
+    assert repo.add_todo("Next").id == 2
+
+    result = repo.add_many([("One", None), ("", None), ("Two", "Second")])
+    assert [t.id for t in result.succeeded] == [3, 4]
+    assert [t.id for t in repo.complete_many([3, 4, 99]).succeeded] == [3, 4]
+    assert [t.id for t in repo.delete_many([1, 3]).succeeded] == [1, 3]
+    assert [t.id for t in repo.list_todos(completed=True)] == [4]
+    repo.close()
+
+    print("SQLite transaction tests passed!")
+
+
+def test_ids_beyond_sqlite_integers():
+    """Test that IDs too large for a SQLite integer are reported as missing instead of crashing."""
+    repo = SqliteTodoRepository(":memory:")
+    repo.add_todo("Only task")
+    huge = 2 ** 64
+    assert repo.get_todo(huge) is None
+    assert repo.exists(huge) is False
+    assert repo.delete_todo(huge) is None
+    assert repo.update_todo(huge, "x") is None
+    assert repo.update_todo(huge, "   ") is None
+    assert repo.toggle_completion(huge) is None
+    assert repo.delete_many([huge, 1]).succeeded[0].id == 1
+    assert repo.list_todos(start_id=huge, limit=2) == []
+    repo.add_todo("Second task")
+    assert [t.id for t in repo.list_todos(start_id=1, end_id=huge, limit=huge)] == [2]
+
+    cli = TodoCLI(TodoService(repository=repo))
+    output = io.StringIO()
+    run_batch(cli, ["DELETE 99999999999999999999", "LIST 99999999999999999999 2",
+                    "COMPLETE 99999999999999999999"], output)
+    assert output.getvalue() == ("Error: Task with ID 99999999999999999999 does not exist\n"
+                                 "No tasks found.\n"
+                                 "Error: Task with ID 99999999999999999999 does not exist\n")
+
+    print("Oversized ID tests passed!")
+
+
+def test_backend_from_environment():
+    """Test that TodoService picks the backend from TODO_BACKEND/TODO_DATA_DIR."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        os.environ["TODO_BACKEND"] = "sqlite"
+        os.environ["TODO_DATA_DIR"] = data_dir
+        try:
+            service = TodoService()
+        finally:
+            del os.environ["TODO_BACKEND"]
+            del os.environ["TODO_DATA_DIR"]
+        assert isinstance(service.repository, SqliteTodoRepository)
+
+        cli = TodoCLI(service)
+        script = ['ADD "Task %d"' % i for i in range(10)] + ["COMPLETE 3", "LIST completed"]
+        output = io.StringIO()
+        assert run_batch(cli, script, output, flush_every=4) == 12
+        assert output.getvalue().endswith("3. [x] Task 2\n")
+        service.close()
+
+        service = TodoService(backend="sqlite", data_dir=data_dir)
+        assert service.count_tasks() == 10
+        service.close()
+
+    print("Backend configuration tests passed!")
+
+
+if __name__ == "__main__":
+    test_sqlite_operations_and_reopen()
+    test_transactions_roll_back()
+    test_ids_beyond_sqlite_integers()
+    test_backend_from_environment()
@@ -0,0 +1,73 @@
+"""
+Tests for the fast-start path of the console app.
+"""
+import sys
+import os
+import io
+import subprocess
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation.cli import TodoCLI
+from implementation.main import _parse_with_argparse, parse_args
+
+MAIN = os.path.join(os.path.dirname(__file__), 'implementation', 'main.py')
+
+
+def test_fast_option_parsing_matches_argparse():
+    """Test that hand-parsed options agree with argparse."""
+    for argv in ([], ["--batch", "-"], ["--batch=script.txt", "--backend", "sqlite"],
+                 ["--data-dir", "./data", "--backend=versioned", "--batch", "cmds.txt"]):
+        assert vars(parse_args(argv)) == vars(_parse_with_argparse(argv))
+
+    # Anything unusual is left to argparse, which reports the error
+    for argv in (["--backend", "nosuch"], ["--batch"], ["--data-dir", "--batch", "x"], ["-x"]):
+        try:
+            with redirect_stdout(io.StringIO()):
+                parse_args(argv)
+            assert False, f"Expected a usage error for {argv}"
+        except SystemExit as e:
+            assert e.code == 2
+
+    print("Option parsing tests passed!")
+
+
+def test_startup_defers_optional_modules():
+    """Test that starting the app does not import modules the first command may not need."""
+    code = ("import runpy, sys\n"
+            f"sys.argv = [{MAIN!r}, '--batch', '-']\n"
+            "runpy.run_path(sys.argv[0], run_name='__main__')\n"
+            "print(sorted(m for m in ('argparse', 'csv', 'json', 'sqlite3', "
+            "'cProfile', 'implementation.transfer', 'implementation.search_index', "
+            "'implementation.profiling') if m in sys.modules))")
+    completed = subprocess.run([sys.executable, "-c", code], input="EXIT\n",
+                               capture_output=True, text=True, check=True)
+    assert completed.stdout.splitlines()[-1] == "[]"
+
+    print("Deferred import tests passed!")
+
+
+def test_dispatch_table():
+    """Test that every documented command is dispatched and unknown ones are reported."""
+    cli = TodoCLI()
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        cli.process_command("HELP")
+    documented = {line.split()[0] for line in buffer.getvalue().splitlines()
+                  if line and line.split()[0].isupper() and line != "Available Commands:"}
+    assert documented == set(cli._handlers)
+
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        cli.process_command("frobnicate 1")
+        cli.process_command('add "Lower case works"')
+    assert buffer.getvalue() == ("Unknown command: FROBNICATE. Type 'HELP' for available commands.\n"
+                                 "Added task #1: Lower case works\n")
+
+    print("Dispatch table tests passed!")
+
+
+if __name__ == "__main__":
+    test_fast_option_parsing_matches_argparse()
+    test_startup_defers_optional_modules()
+    test_dispatch_table()
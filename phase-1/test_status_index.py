@@ -0,0 +1,74 @@
+"""
+Tests for the completion status indexes and filtered listing.
+"""
+import sys
+import os
+import io
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation.cli import TodoCLI
+from implementation.service import TodoService
+
+
+def test_status_indexes():
+    """Test that the indexes follow add, toggle and delete on every backend."""
+    for backend in ("dict", "compact"):
+        service = TodoService(backend=backend)
+        for i in range(1, 7):
+            service.add_task(f"Task {i}")
+
+        assert [t.id for t in service.list_tasks(completed=False)] == [1, 2, 3, 4, 5, 6]
+        assert service.list_tasks(completed=True) == []
+
+        service.complete_task(5)
+        service.complete_task(2)
+        service.complete_task(4)
+        service.complete_task(4)  # Toggle back to pending
+        assert [t.id for t in service.list_tasks(completed=True)] == [2, 5]
+        assert [t.id for t in service.list_tasks(completed=False)] == [1, 3, 4, 6]
+
+        service.delete_task(2)
+        service.delete_task(3)
+        service.update_task(5, "Renamed task")  # Does not change status
+        assert [t.id for t in service.list_tasks(completed=True)] == [5]
+        assert [t.id for t in service.list_tasks(completed=False)] == [1, 4, 6]
+        assert service.count_tasks() == 4
+        assert service.count_tasks(completed=True) == 1
+        assert service.count_tasks(completed=False) == 3
+
+        # Filtered listings always agree with a full scan
+        all_tasks = service.list_tasks()
+        assert service.list_tasks(completed=True) == [t for t in all_tasks if t.completed]
+        assert service.list_tasks(completed=False) == [t for t in all_tasks if not t.completed]
+
+    print("Status index tests passed!")
+
+
+def test_cli_filtered_list():
+    """Test the LIST pending|completed command forms."""
+    cli = TodoCLI()
+    cli.service.add_task("Buy groceries")
+    cli.service.add_task("Walk the dog")
+    cli.service.complete_task(2)
+
+    def run(command):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            cli.process_command(command)
+        return output.getvalue()
+
+    assert run("LIST pending") == "1. [ ] Buy groceries\n"
+    assert run("list COMPLETED") == "2. [x] Walk the dog\n"
+    assert run("LIST") == "1. [ ] Buy groceries\n2. [x] Walk the dog\n"
+    assert run("LIST someday").startswith("Invalid format for LIST")
+
+    cli.service.complete_task(2)
+    assert run("LIST completed") == "No tasks found.\n"
+
+    print("CLI filtered list tests passed!")
+
+
+if __name__ == "__main__":
+    test_status_indexes()
+    test_cli_filtered_list()
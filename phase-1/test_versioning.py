@@ -0,0 +1,156 @@
+"""
+Tests for the copy-on-write versioned repository and UNDO/REDO.
+"""
+import sys
+import os
+import io
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'implementation'))
+
+from implementation.cli import TodoCLI
+from implementation.service import TodoService
+from implementation.versioned_repository import PAGE_SIZE, TABLE_FANOUT, VersionedTodoRepository
+
+
+def test_snapshot_is_isolated_from_later_writes():
+    """Test that a snapshot keeps seeing the contents at the time it was taken."""
+    repo = VersionedTodoRepository()
+    for i in range(PAGE_SIZE * 3):
+        repo.add_todo(f"Task {i}")
+    snapshot = repo.snapshot()
+
+    repo.update_todo(1, "Renamed")
+    repo.toggle_completion(2)
+    repo.delete_todo(PAGE_SIZE + 1)
+    repo.add_todo("After the snapshot")
+
+    assert len(snapshot) == PAGE_SIZE * 3
+    assert snapshot.get(1).title == "Task 0"
+    assert snapshot.get(2).completed is False
+    assert snapshot.get(PAGE_SIZE + 1).title == f"Task {PAGE_SIZE}"
+    assert snapshot.get(PAGE_SIZE * 3 + 1) is None
+    assert [todo.id for todo in snapshot] == list(range(1, PAGE_SIZE * 3 + 1))
+
+    assert repo.get_todo(1).title == "Renamed"
+    assert repo.get_todo(2).completed is True
+    assert repo.get_todo(PAGE_SIZE + 1) is None
+    assert repo.count_todos() == PAGE_SIZE * 3
+
+    print("Snapshot isolation tests passed!")
+
+
+def test_undo_and_redo_restore_versions_and_indexes():
+    """Test that undo/redo switch versions and keep the status and search indexes right."""
+    service = TodoService(backend="versioned")
+    service.add_task("Buy groceries", "Milk")
+    service.add_task("Walk the dog")
+    assert service.search("groceries")[0].id == 1
+
+    service.update_task(1, "Buy vegetables")
+    service.complete_task(2)
+    service.delete_many([1])
+    assert service.list_tasks() == [service.get_task(2)]
+
+    assert service.undo() is True  # delete_many
+    assert service.get_task(1).title == "Buy vegetables"
+    assert service.undo() is True  # complete
+    assert service.count_tasks(completed=True) == 0
+    assert service.undo() is True  # update
+    assert service.get_task(1).title == "Buy groceries"
+    assert [t.id for t in service.search("groceries")] == [1]
+    assert service.search("vegetables") == []
+
+    assert service.redo() is True
+    assert [t.id for t in service.search("vegetables")] == [1]
+    assert service.redo() is True
+    assert [t.id for t in service.list_tasks(completed=True)] == [2]
+
+    # Undoing an add gives the ID back; a new change clears the redo stack
+    assert service.undo() is True
+    assert service.undo() is True
+    assert service.undo() is True
+    assert service.count_tasks() == 1
+    assert service.add_task("Replacement").id == 2
+    assert service.redo() is False
+
+    # Changes that did nothing are not recorded
+    assert service.delete_task(99) is None
+    assert service.undo() is True
+    assert service.count_tasks() == 1
+
+    print("Undo/redo tests passed!")
+
+
+def test_history_is_bounded():
+    """Test that only max_history versions are kept."""
+    repo = VersionedTodoRepository(max_history=3)
+    for i in range(5):
+        repo.add_todo(f"Task {i}")
+    assert sum(repo.undo() for _ in range(5)) == 3
+    assert repo.count_todos() == 2
+
+    print("History bound tests passed!")
+
+
+def test_cli_undo_redo():
+    """Test the UNDO and REDO commands."""
+    def run(cli, command):
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            cli.process_command(command)
+        return buffer.getvalue()
+
+    cli = TodoCLI(TodoService(backend="versioned"))
+    assert run(cli, "UNDO") == "Nothing to undo\n"
+    run(cli, 'ADD "First task"')
+    assert run(cli, "UNDO") == "Undid the last change\n"
+    assert run(cli, "LIST") == "No tasks found.\n"
+    assert run(cli, "REDO") == "Redid the last undone change\n"
+    assert run(cli, "REDO") == "Nothing to redo\n"
+    assert cli.service.get_task(1).title == "First task"
+
+    cli = TodoCLI(TodoService())
+    assert run(cli, "UNDO") == "Error: Undo requires the versioned storage backend\n"
+
+    print("CLI undo/redo tests passed!")
+
+
+def test_writes_copy_only_the_path_to_their_page():
+    """Test that the page table tree grows and is copied path by path under snapshots."""
+    repo = VersionedTodoRepository()
+    store = repo._storage
+    per_node = PAGE_SIZE * TABLE_FANOUT
+    repo.add_many((f"Task {i}", None) for i in range(per_node))
+    first = repo.snapshot()
+    # Crossing into a second top-level node grows the tree under a held snapshot
+    repo.add_many((f"Task {i}", None) for i in range(per_node, per_node + 10))
+    assert store._height == 2
+    second = repo.snapshot()
+    root = store._root
+
+    repo.update_todo(per_node + 5, "Renamed")
+    # Only the root, the node above the page and the page were copied
+    assert store._root is not root
+    assert store._root[0] is root[0]
+    assert store._root[1] is not root[1]
+    assert store._root[1][1:] == root[1][1:]
+    assert store._owned_nodes == {(2, 0), (1, 1)}
+
+    assert len(first) == per_node and first.get(per_node + 1) is None
+    assert second.get(per_node + 5).title == f"Task {per_node + 4}"
+    assert repo.get_todo(per_node + 5).title == "Renamed"
+    assert [t.id for t in repo.list_todos(start_id=per_node - 1, limit=3)] == [
+        per_node - 1, per_node, per_node + 1]
+    assert repo.undo() and repo.get_todo(per_node + 5).title == f"Task {per_node + 4}"
+    assert repo.undo() and repo.get_todo(per_node + 1) is None
+    assert repo.count_todos() == per_node
+
+    print("Page table tree tests passed!")
+
+
+if __name__ == "__main__":
+    test_snapshot_is_isolated_from_later_writes()
+    test_undo_and_redo_restore_versions_and_indexes()
+    test_history_is_bounded()
+    test_cli_undo_redo()
+    test_writes_copy_only_the_path_to_their_page()
@@ -4,16 +4,18 @@ Authentication module for the todo application.
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from ..database.database import get_session
 from ..models.user import User
+from .hashing import crypt_context
+from .user_cache import AuthenticatedUser, user_cache
 import os
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing for scripts; request handlers use the async helpers in
+# hashing.py, which run in the hashing worker pool
+pwd_context = crypt_context()
 
 # JWT configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-super-secret-key-change-in-production")
@@ -23,14 +25,17 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
 # Security scheme
 security = HTTPBearer()
 
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash."""
     return pwd_context.verify(plain_password, hashed_password)
 
+
 def get_password_hash(password: str) -> str:
     """Hash a plain password."""
     return pwd_context.hash(password)
 
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a new access token."""
     to_encode = data.copy()
@@ -42,22 +47,40 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), session: Session = Depends(get_session)):
-    """Get the current authenticated user from the token."""
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: AsyncSession = Depends(get_session)
+) -> AuthenticatedUser:
+    """
+    Get the current authenticated user from the token.
+
+    Tokens seen recently are answered from user_cache without decoding the
+    token again or querying the user table.
+    """
+    token = credentials.credentials
+    cached = user_cache.get(token)
+    if cached is not None:
+        return cached
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("sub")
-        if user_id is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        subject = payload.get("sub")
+        if subject is None:
             raise credentials_exception
-    except JWTError:
+        # The subject is a string; asyncpg does not coerce it to the integer key
+        user_id = int(subject)
+    except (JWTError, ValueError):
         raise credentials_exception
 
-    user = session.get(User, user_id)
+    user = await session.get(User, user_id)
     if user is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+    principal = AuthenticatedUser(id=user.id, email=user.email)
+    user_cache.put(token, principal, payload.get("exp"))
+    return principal
@@ -0,0 +1,124 @@
+"""
+Password hashing for the todo application, run in a bounded process pool.
+
+bcrypt is deliberately slow and holds the CPU for the whole hash, so it runs
+in a few dedicated worker processes instead of the request threads or the
+event loop. At most HASH_QUEUE_LIMIT requests wait for a worker; beyond
+that, hashing is refused with HashingOverloaded, so a burst of logins fails
+fast instead of slowing every other endpoint down.
+
+The bcrypt cost factor is set with BCRYPT_ROUNDS. Hashes made with another
+cost are upgraded when their owner next logs in.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+from passlib.context import CryptContext
+
+# bcrypt cost factor: every step up doubles the time a hash takes
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Worker processes hashing passwords, and requests allowed to wait for one
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", "2"))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "32"))
+# Scheduling priority of the workers relative to the server (Unix nice value)
+HASH_WORKER_NICENESS = int(os.getenv("HASH_WORKER_NICENESS", "10"))
+
+_contexts: Dict[int, CryptContext] = {}
+_pool: Optional[ProcessPoolExecutor] = None
+_pending = 0
+_lock = threading.Lock()
+
+
+class HashingOverloaded(Exception):
+    """Raised when too many password hashes are already queued."""
+
+
+def crypt_context(rounds: int = BCRYPT_ROUNDS) -> CryptContext:
+    """Return the passlib context that hashes with, and accepts only, a bcrypt cost."""
+    context = _contexts.get(rounds)
+    if context is None:
+        # Hashes of any other cost, higher or lower, count as out of date
+        context = _contexts[rounds] = CryptContext(
+            schemes=["bcrypt"], deprecated="auto", bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds, bcrypt__max_rounds=rounds)
+    return context
+
+
+def _hash(password: str, rounds: int) -> str:
+    """Hash a password; runs in a worker process."""
+    return crypt_context(rounds).hash(password)
+
+
+def _verify_and_update(password: str, password_hash: str,
+                       rounds: int) -> Tuple[bool, Optional[str]]:
+    """Verify a password and rehash it if its cost is out of date; runs in a worker."""
+    return crypt_context(rounds).verify_and_update(password, password_hash)
+
+
+def _lower_priority():
+    """Let request handling win the CPU over hashing; runs when a worker starts."""
+    if hasattr(os, "nice"):
+        os.nice(HASH_WORKER_NICENESS)
+
+
+def _executor() -> ProcessPoolExecutor:
+    """Start the worker processes on first use."""
+    global _pool
+    if _pool is None:
+        # Spawned rather than forked: the server process has threads and an
+        # event loop that a forked child would inherit in an unusable state
+        _pool = ProcessPoolExecutor(max_workers=HASH_WORKERS,
+                                    mp_context=multiprocessing.get_context("spawn"),
+                                    initializer=_lower_priority)
+    return _pool
+
+
+async def _submit(function, *args):
+    """Run a function in the pool, refusing it when the queue is full."""
+    global _pending
+    with _lock:
+        if _pending >= HASH_WORKERS + HASH_QUEUE_LIMIT:
+            raise HashingOverloaded(
+                "Too many password checks in progress; try again shortly")
+        _pending += 1
+    try:
+        return await asyncio.wrap_future(_executor().submit(function, *args))
+    finally:
+        with _lock:
+            _pending -= 1
+
+
+async def hash_password(password: str) -> str:
+    """
+    Hash a password with the configured cost.
+
+    Raises:
+        HashingOverloaded: If the hashing queue is full
+    """
+    return await _submit(_hash, password, BCRYPT_ROUNDS)
+
+
+async def verify_password(password: str,
+                          password_hash: str) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password against its hash.
+
+    Returns:
+        Whether the password matches, and a new hash to store when it does
+        but the stored hash was made with a different cost; otherwise None
+
+    Raises:
+        HashingOverloaded: If the hashing queue is full
+    """
+    return await _submit(_verify_and_update, password, password_hash, BCRYPT_ROUNDS)
+
+
+def shutdown():
+    """Stop the worker processes."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
@@ -0,0 +1,130 @@
+"""
+Cache of authenticated users for the todo application.
+
+Resolving a bearer token costs a JWT signature check and a database lookup
+of the user. Both results are stable for the token's lifetime, so they are
+cached per token in a bounded LRU with a short TTL. Entries of a user are
+dropped as soon as the user row is updated or deleted through the ORM in
+this process; other worker processes notice within the TTL.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+from sqlalchemy import event
+from ..models.user import User
+
+# Maximum number of cached tokens and seconds an entry stays valid
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """The part of a user that request handlers need, safe to share between requests."""
+    id: int
+    email: str
+
+
+class UserCache:
+    """Bounded LRU map from verified bearer token to the user it authenticates."""
+
+    def __init__(self, maxsize: int = AUTH_CACHE_SIZE,
+                 ttl: float = AUTH_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[AuthenticatedUser, float]]" = \
+            OrderedDict()
+        # Tokens cached for each user, for invalidation
+        self._tokens: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[AuthenticatedUser]:
+        """Return the user a token authenticates, or None if not cached or expired."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            user, expires = entry
+            if expires <= time.monotonic():
+                self._remove(token, user.id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return user
+
+    def put(self, token: str, user: AuthenticatedUser,
+            token_expires: Optional[float] = None):
+        """
+        Cache the user of a verified token.
+
+        Args:
+            token: The bearer token
+            user: The user it authenticates
+            token_expires: Unix time the token expires at; the entry never
+                outlives the token
+        """
+        expires = time.monotonic() + self.ttl
+        if token_expires is not None:
+            expires = min(expires, time.monotonic() + token_expires - time.time())
+        with self._lock:
+            if token in self._entries:
+                self._entries.move_to_end(token)
+            self._entries[token] = (user, expires)
+            self._tokens.setdefault(user.id, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                oldest, (oldest_user, _) = self._entries.popitem(last=False)
+                self._discard_token(oldest, oldest_user.id)
+
+    def invalidate_user(self, user_id: int):
+        """Drop every cached token of a user."""
+        with self._lock:
+            for token in self._tokens.pop(user_id, ()):
+                self._entries.pop(token, None)
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._tokens.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """Return the hit and miss counters and the number of cached tokens."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "size": len(self._entries)}
+
+    def _remove(self, token: str, user_id: int):
+        """Remove one entry; the lock must be held."""
+        del self._entries[token]
+        self._discard_token(token, user_id)
+
+    def _discard_token(self, token: str, user_id: int):
+        """Forget that a token belongs to a user; the lock must be held."""
+        tokens = self._tokens.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens[user_id]
+
+
+user_cache = UserCache()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User):
+    """
+    Drop the cached tokens of a user whose row was changed through the ORM.
+
+    Bulk UPDATE or DELETE statements on the user table bypass this hook and
+    must call user_cache.invalidate_user themselves.
+    """
+    user_cache.invalidate_user(target.id)
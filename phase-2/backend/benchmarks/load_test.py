@@ -0,0 +1,184 @@
+"""
+HTTP load test for the todo API: throughput, p99 latency and concurrency limit.
+
+Registers a throwaway user, seeds it with todos, then for each concurrency
+level keeps that many requests in flight against GET /api/todos (mixed with
+a share of creates and toggles) for a fixed time. The concurrency limit is
+the highest level whose p99 stays within the latency objective without
+errors. Save a run with --output and pass it as --baseline to a later run
+(for example before and after a change) to compare them side by side.
+
+Usage (server already running; needs `pip install httpx`):
+    python benchmarks/load_test.py --url http://localhost:8000 --output before.json
+    python benchmarks/load_test.py --url http://localhost:8000 --baseline before.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import httpx
+
+LEVELS = (1, 8, 32, 128, 512)
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of sorted samples."""
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+async def authenticate(client: httpx.AsyncClient) -> Dict[str, str]:
+    """Register a fresh user and return its authorization header."""
+    response = await client.post("/api/auth/register", json={
+        "email": f"load-{uuid.uuid4().hex[:12]}@example.com",
+        "password": uuid.uuid4().hex})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def seed(client: httpx.AsyncClient, headers: Dict[str, str],
+               count: int) -> List[int]:
+    """Create `count` todos and return their IDs."""
+    ids = []
+    for i in range(count):
+        response = await client.post("/api/todos", headers=headers,
+                                     json={"title": f"Load test todo {i}"})
+        response.raise_for_status()
+        ids.append(response.json()["id"])
+    return ids
+
+
+async def run_level(client: httpx.AsyncClient, headers: Dict[str, str],
+                    ids: List[int], concurrency: int, duration: float,
+                    write_share: float) -> Dict[str, float]:
+    """
+    Keep `concurrency` requests in flight for `duration` seconds.
+
+    Returns:
+        Requests per second, p50/p99 latency in milliseconds and the error count
+    """
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    rng = random.Random(concurrency)
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                if rng.random() >= write_share:
+                    response = await client.get("/api/todos", headers=headers,
+                                                params={"limit": 50})
+                elif rng.random() < 0.5:
+                    response = await client.post("/api/todos", headers=headers,
+                                                 json={"title": "Load test write"})
+                else:
+                    response = await client.patch(
+                        f"/api/todos/{rng.choice(ids)}/toggle", headers=headers,
+                        json={"completed": rng.random() < 0.5})
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def concurrency_limit(results: List[Dict[str, float]], slo_ms: float) -> Optional[int]:
+    """Return the highest concurrency that met the p99 objective without errors."""
+    passing = [r["concurrency"] for r in results
+               if r["p99_ms"] <= slo_ms and not r["errors"]]
+    return max(passing) if passing else None
+
+
+async def run(args) -> Dict[str, object]:
+    """Run every concurrency level against the server."""
+    limits = httpx.Limits(max_connections=max(args.levels),
+                          max_keepalive_connections=max(args.levels))
+    async with httpx.AsyncClient(base_url=args.url, limits=limits,
+                                 timeout=args.timeout) as client:
+        headers = await authenticate(client)
+        ids = await seed(client, headers, args.todos)
+        results = []
+        for level in args.levels:
+            result = await run_level(client, headers, ids, level, args.duration,
+                                     args.write_share)
+            results.append(result)
+            print(f"  c={level:<5} {result['rps']:>9.1f} req/s  "
+                  f"p50 {result['p50_ms']:>8.2f} ms  "
+                  f"p99 {result['p99_ms']:>8.2f} ms  errors {result['errors']}")
+    return {"url": args.url, "slo_ms": args.slo_ms, "levels": results,
+            "concurrency_limit": concurrency_limit(results, args.slo_ms)}
+
+
+def compare(baseline: Dict[str, object], current: Dict[str, object]):
+    """Print throughput and p99 of two runs side by side."""
+    before = {r["concurrency"]: r for r in baseline["levels"]}
+    print(f"{'conc':>6} {'req/s before':>13} {'after':>10} "
+          f"{'p99 before':>12} {'after':>10}")
+    for result in current["levels"]:
+        old = before.get(result["concurrency"])
+        if old is None:
+            continue
+        print(f"{result['concurrency']:>6} {old['rps']:>13.1f} {result['rps']:>10.1f} "
+              f"{old['p99_ms']:>10.2f}ms {result['p99_ms']:>8.2f}ms")
+    print(f"Concurrency limit (p99 <= {current['slo_ms']} ms): "
+          f"{baseline['concurrency_limit']} before, "
+          f"{current['concurrency_limit']} after")
+
+
+def main(argv=None):
+    """Parse the options, run the load test and report."""
+    parser = argparse.ArgumentParser(description="Todo API load test")
+    parser.add_argument("--url", default="http://localhost:8000",
+                        help="base URL of the API")
+    parser.add_argument("--levels", type=int, nargs="+", default=list(LEVELS),
+                        help="concurrency levels to run")
+    parser.add_argument("--duration", type=float, default=10.0,
+                        help="seconds per level")
+    parser.add_argument("--todos", type=int, default=200,
+                        help="todos to seed the user with")
+    parser.add_argument("--write-share", type=float, default=0.1,
+                        help="fraction of requests that create or toggle a todo")
+    parser.add_argument("--slo-ms", type=float, default=250.0,
+                        help="p99 latency objective")
+    parser.add_argument("--timeout", type=float, default=30.0,
+                        help="per-request timeout")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline",
+                        help="JSON results of an earlier run to compare with")
+    args = parser.parse_args(argv)
+
+    print(f"Load test against {args.url}, {args.duration:.0f}s per level")
+    results = asyncio.run(run(args))
+    print(f"Concurrency limit (p99 <= {args.slo_ms} ms): "
+          f"{results['concurrency_limit']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Todo-read latency during a login storm.
+
+Measures GET /api/todos with a fixed number of concurrent readers, first on
+its own and then while many clients log in at once. Password checks run in
+a bounded worker pool, so the readers' p99 should hold steady while excess
+logins are turned away with 503. Exits with status 1 when the p99 during
+the storm exceeds the quiet p99 by more than --max-slowdown times.
+
+Usage (server already running; needs `pip install httpx`):
+    python benchmarks/login_storm.py --url http://localhost:8000 \
+        [--logins 64] [--duration 10]
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional
+
+import httpx
+
+from load_test import authenticate, percentile, seed
+
+
+async def read_loop(client: httpx.AsyncClient, headers: Dict[str, str],
+                    deadline: float, latencies: List[float]):
+    """Read the todo list until the deadline, recording latencies in milliseconds."""
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get("/api/todos", headers=headers, params={"limit": 50})
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def login_loop(client: httpx.AsyncClient, email: str, password: str,
+                     deadline: float, outcomes: Counter, latencies: List[float]):
+    """Log in repeatedly until the deadline, counting responses by status code."""
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.post("/api/auth/login",
+                                     data={"email": email, "password": password})
+        outcomes[response.status_code] += 1
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code == 503:
+            # Back off as asked, like a well-behaved client
+            await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+
+
+async def phase(client: httpx.AsyncClient, headers: Dict[str, str], readers: int,
+                duration: float, login: Optional[Dict[str, object]] = None
+                ) -> Dict[str, object]:
+    """Run the readers, and the login storm if given, for `duration` seconds."""
+    deadline = time.perf_counter() + duration
+    read_latencies: List[float] = []
+    login_latencies: List[float] = []
+    outcomes: Counter = Counter()
+    tasks = [read_loop(client, headers, deadline, read_latencies)
+             for _ in range(readers)]
+    if login:
+        tasks += [login_loop(client, login["email"], login["password"], deadline,
+                             outcomes, login_latencies)
+                  for _ in range(login["clients"])]
+    await asyncio.gather(*tasks)
+    read_latencies.sort()
+    login_latencies.sort()
+    return {"reads": len(read_latencies),
+            "read_p50_ms": percentile(read_latencies, 0.50),
+            "read_p99_ms": percentile(read_latencies, 0.99),
+            "login_p99_ms": percentile(login_latencies, 0.99), "logins": dict(outcomes)}
+
+
+async def run(args) -> int:
+    """Measure the quiet and storm phases and compare the readers' p99."""
+    connections = args.readers + args.logins
+    limits = httpx.Limits(max_connections=connections,
+                          max_keepalive_connections=connections)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits,
+                                 timeout=args.timeout) as client:
+        headers = await authenticate(client)
+        await seed(client, headers, args.todos)
+        email, password = f"storm-{uuid.uuid4().hex[:12]}@example.com", uuid.uuid4().hex
+        (await client.post(
+            "/api/auth/register",
+            json={"email": email, "password": password})).raise_for_status()
+
+        quiet = await phase(client, headers, args.readers, args.duration)
+        storm = await phase(client, headers, args.readers, args.duration,
+                            {"email": email, "password": password,
+                             "clients": args.logins})
+
+    print(f"{args.readers} readers, {args.logins} clients logging in, "
+          f"{args.duration:.0f}s per phase")
+    print(f"  quiet  reads {quiet['reads']:>7}  p50 {quiet['read_p50_ms']:8.2f} ms  "
+          f"p99 {quiet['read_p99_ms']:8.2f} ms")
+    print(f"  storm  reads {storm['reads']:>7}  p50 {storm['read_p50_ms']:8.2f} ms  "
+          f"p99 {storm['read_p99_ms']:8.2f} ms")
+    logins = ", ".join(f"{status}: {count}"
+                       for status, count in sorted(storm["logins"].items()))
+    print(f"  logins {logins}  (p99 {storm['login_p99_ms']:.2f} ms)")
+
+    slowdown = (storm["read_p99_ms"] / quiet["read_p99_ms"]
+                if quiet["read_p99_ms"] else 1.0)
+    print(f"Read p99 during the storm is {slowdown:.2f}x the quiet p99 "
+          f"(limit {args.max_slowdown}x)")
+    return 1 if slowdown > args.max_slowdown else 0
+
+
+def main(argv=None) -> int:
+    """Parse the options and run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Todo-read latency during a login storm")
+    parser.add_argument("--url", default="http://localhost:8000",
+                        help="base URL of the API")
+    parser.add_argument("--readers", type=int, default=8,
+                        help="concurrent todo readers")
+    parser.add_argument("--logins", type=int, default=64,
+                        help="concurrent clients logging in")
+    parser.add_argument("--duration", type=float, default=10.0,
+                        help="seconds per phase")
+    parser.add_argument("--todos", type=int, default=50,
+                        help="todos to seed the reader with")
+    parser.add_argument("--max-slowdown", type=float, default=2.0,
+                        help="allowed ratio of storm to quiet read p99")
+    parser.add_argument("--timeout", type=float, default=30.0,
+                        help="per-request timeout")
+    return asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,12 @@
 Database configuration for the todo application.
 """
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import AsyncIterator, Union
 import os
 from dotenv import load_dotenv
 
@@ -12,20 +15,65 @@ load_dotenv()
 
 # Get database URL from environment variable
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./todo_app.db")
+# Log every SQL statement (slow; for debugging only)
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() in ("1", "true", "yes")
+# Connections kept open per worker process, and extra ones allowed under bursts
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
 
-# Create engine
-engine = create_engine(DATABASE_URL, echo=True)
+# Async driver the request handlers use for each database
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
 
-# Create session factory
+
+def to_async_url(url: Union[str, URL]) -> URL:
+    """
+    Convert a database URL to use the database's async driver.
+
+    asyncpg takes TLS settings as `ssl` rather than libpq's `sslmode` and
+    does not know `channel_binding`, so those query options are translated.
+
+    Raises:
+        ValueError: If there is no async driver for the database
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    query = dict(url.query)
+    if backend == "postgresql":
+        sslmode = query.pop("sslmode", None)
+        query.pop("channel_binding", None)
+        if sslmode:
+            query["ssl"] = sslmode
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}", query=query)
+
+
+# Blocking engine, used by migrations and scripts
+engine = create_engine(DATABASE_URL, echo=SQL_ECHO)
+
+# Non-blocking engine, used by the request handlers
+async_url = to_async_url(DATABASE_URL)
+async_engine = create_async_engine(
+    async_url,
+    echo=SQL_ECHO,
+    # Serverless Postgres drops idle connections; check them before use
+    **({"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW,
+        "pool_pre_ping": True}
+       if async_url.get_backend_name() == "postgresql" else {}),
+)
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay loaded after commit, since lazily reloading an attribute
+# would need a database round trip outside of an await
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession,
+                                       autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
 
-def get_session():
-    """Dependency to get database session."""
-    session = SessionLocal()
-    try:
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """Dependency to get an async database session."""
+    async with AsyncSessionLocal() as session:
         yield session
-    finally:
-        session.close()
\ No newline at end of file
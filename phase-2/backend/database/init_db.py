@@ -1,20 +1,20 @@
 """
 Database initialization and migration logic for the todo application.
 """
-from .database import engine
-from ..models.user import User
-from ..models.todo import Todo
-from sqlmodel import SQLModel
+from .migrations import migrate
 
 
 def create_db_and_tables():
     """
-    Create database tables if they don't exist.
-    This function creates all tables defined in the models.
+    Create or upgrade the database tables.
+
+    This applies every pending migration (see migrations.py), so it is
+    safe to run against a database created by an earlier release.
     """
-    SQLModel.metadata.create_all(bind=engine)
-    print("Database tables created successfully.")
+    applied = migrate()
+    print(f"Database migrations applied: {applied}" if applied
+          else "Database is up to date.")
 
 
 if __name__ == "__main__":
-    create_db_and_tables()
\ No newline at end of file
+    create_db_and_tables()
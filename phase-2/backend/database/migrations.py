@@ -0,0 +1,226 @@
+"""
+Versioned schema migrations for the todo application.
+
+Every migration moves the schema up by one version and runs once, in order,
+in its own transaction; the schema_version table records each version
+applied. Migrations are applied at deploy time, not when the app starts:
+
+    python -m backend.database.migrations           # upgrade to the latest version
+    python -m backend.database.migrations --check   # then verify the list query plans
+"""
+import argparse
+import sys
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Index, Integer, MetaData,
+                        String, Table, inspect, text)
+from sqlalchemy.engine import Connection, Engine
+from .database import engine
+from .queries import todo_list_query
+from ..models.todo import TODO_LIST_BY_STATUS_INDEX, TODO_LIST_INDEX
+from ..models.user import User
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+
+def _create_tables(connection: Connection):
+    """Create the user and todo tables as the first release's create_all did."""
+    # A frozen copy of the version 1 schema: later model changes must not
+    # change what this migration creates
+    metadata = MetaData()
+    Table("user", metadata,
+          Column("id", Integer, primary_key=True),
+          Column("email", String(255), nullable=False, unique=True),
+          Column("password_hash", String, nullable=False),
+          Column("created_at", DateTime),
+          Column("updated_at", DateTime))
+    Table("todo", metadata,
+          Column("id", Integer, primary_key=True),
+          Column("title", String(255), nullable=False),
+          Column("description", String(1000)),
+          Column("completed", Boolean, nullable=False),
+          Column("user_id", Integer, ForeignKey("user.id", ondelete="CASCADE"),
+                 nullable=False),
+          Column("created_at", DateTime),
+          Column("updated_at", DateTime))
+    # Databases created by create_all before migrations existed already
+    # have the tables
+    metadata.create_all(connection, checkfirst=True)
+
+
+def _add_todo_list_indexes(connection: Connection):
+    """Index the todo list query with and without the completion filter."""
+    todo = Table("todo", MetaData(), autoload_with=connection)
+    Index(TODO_LIST_INDEX, todo.c.user_id, todo.c.created_at,
+          todo.c.id).create(connection)
+    Index(TODO_LIST_BY_STATUS_INDEX, todo.c.user_id, todo.c.completed,
+          todo.c.created_at, todo.c.id).create(connection)
+
+
+def _add_todo_version(connection: Connection):
+    """Add the per-user version of the todo collection, starting every user at 0."""
+    user = connection.dialect.identifier_preparer.format_table(User.__table__)
+    connection.execute(text(
+        f"ALTER TABLE {user} ADD COLUMN todo_version INTEGER NOT NULL DEFAULT 0"))
+
+
+# (version, description, upgrade) in the order they are applied
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "create user and todo tables", _create_tables),
+    (2, "add todo list indexes", _add_todo_list_indexes),
+    (3, "add user todo_version", _add_todo_version),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(connection: Connection) -> int:
+    """
+    Return the schema version of the database.
+
+    Returns:
+        The highest version applied, or 0 for a database never migrated
+    """
+    if not inspect(connection).has_table(SCHEMA_VERSION_TABLE):
+        return 0
+    return connection.execute(
+        text(f"SELECT MAX(version) FROM {SCHEMA_VERSION_TABLE}")).scalar() or 0
+
+
+def migrate(bind: Engine = engine, target: Optional[int] = None) -> List[int]:
+    """
+    Apply every pending migration up to the target version.
+
+    Args:
+        bind: The engine of the database to upgrade
+        target: The version to stop at; the latest version if omitted
+
+    Returns:
+        The versions applied, in order
+    """
+    with bind.begin() as connection:
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+            "version INTEGER PRIMARY KEY, description VARCHAR(255) NOT NULL, "
+            "applied_at TIMESTAMP NOT NULL)"))
+
+    applied = []
+    for version, description, upgrade in MIGRATIONS:
+        if target is not None and version > target:
+            break
+        with bind.begin() as connection:
+            if connection.dialect.name == "postgresql":
+                # Deploys running at the same time wait here and then see
+                # the migration as applied
+                connection.execute(
+                    text(f"LOCK TABLE {SCHEMA_VERSION_TABLE} IN EXCLUSIVE MODE"))
+            if version <= current_version(connection):
+                continue
+            upgrade(connection)
+            connection.execute(
+                text(f"INSERT INTO {SCHEMA_VERSION_TABLE} "
+                     "(version, description, applied_at) "
+                     "VALUES (:version, :description, :applied_at)"),
+                {"version": version, "description": description,
+                 "applied_at": datetime.utcnow()})
+        applied.append(version)
+    return applied
+
+
+def check_schema_version(bind: Engine = engine):
+    """
+    Check at startup that the database has every migration applied.
+
+    Raises:
+        RuntimeError: If the schema is older than this release expects
+    """
+    with bind.connect() as connection:
+        version = current_version(connection)
+    if version < LATEST_VERSION:
+        raise RuntimeError(f"Database schema is at version {version}, "
+                           f"expected {LATEST_VERSION}; run "
+                           "`python -m backend.database.migrations` to upgrade it")
+
+
+def explain(connection: Connection, query) -> str:
+    """
+    Return the database's plan for a query.
+
+    Args:
+        connection: A connection to a SQLite or PostgreSQL database
+        query: The statement to explain
+
+    Returns:
+        The plan, one step per line
+    """
+    compiled = query.compile(dialect=connection.dialect)
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    prefix = ("EXPLAIN QUERY PLAN " if connection.dialect.name == "sqlite"
+              else "EXPLAIN ")
+    rows = connection.exec_driver_sql(prefix + str(compiled), params).all()
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def check_query_plans(bind: Engine = engine) -> List[str]:
+    """
+    Verify that every form of the todo list query reads from its index without sorting.
+
+    PostgreSQL prefers sequential scans of small tables, so sequential scans
+    are disabled while explaining; the check proves the index can serve the
+    query, which is what the planner chooses once a user has many todos.
+
+    Returns:
+        A description of every query that does not use its index; empty
+        when all of them do
+    """
+    position = (datetime(2024, 1, 1), 1)
+    cases = [
+        ("list", todo_list_query(1), TODO_LIST_INDEX),
+        ("list by status", todo_list_query(1, completed=True),
+         TODO_LIST_BY_STATUS_INDEX),
+        ("list after cursor", todo_list_query(1, after=position), TODO_LIST_INDEX),
+        ("list by status after cursor",
+         todo_list_query(1, completed=False, after=position),
+         TODO_LIST_BY_STATUS_INDEX),
+    ]
+    failures = []
+    with bind.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SET enable_seqscan = off"))
+        for name, query, index in cases:
+            plan = explain(connection, query.limit(50))
+            # SQLite reports a sort as "USE TEMP B-TREE FOR ORDER BY",
+            # PostgreSQL as a "Sort" node
+            if index not in plan or "TEMP B-TREE" in plan or "Sort" in plan:
+                failures.append(f"{name} does not use {index} without sorting:\n{plan}")
+        connection.rollback()
+    return failures
+
+
+def main(argv=None) -> int:
+    """Upgrade the database and optionally check the query plans."""
+    parser = argparse.ArgumentParser(description="Apply the todo database migrations")
+    parser.add_argument("--target", type=int,
+                        help="version to upgrade to (default: latest)")
+    parser.add_argument("--check", action="store_true",
+                        help="verify that the list queries use their indexes")
+    args = parser.parse_args(argv)
+
+    applied = migrate(target=args.target)
+    with engine.connect() as connection:
+        version = current_version(connection)
+    print(f"Applied migrations {applied}; schema is at version {version}" if applied
+          else f"Schema is up to date at version {version}")
+    if args.check:
+        failures = check_query_plans()
+        for failure in failures:
+            print(failure)
+        if failures:
+            return 1
+        print("All list queries use their indexes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
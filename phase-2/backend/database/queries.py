@@ -0,0 +1,67 @@
+"""
+Shared query builders for the todo application.
+"""
+from datetime import datetime
+from typing import Collection, Optional, Tuple
+from sqlalchemy import tuple_, update
+from sqlmodel import select, desc
+from ..models.todo import Todo
+from ..models.user import User
+
+
+def todo_list_query(user_id: int, completed: Optional[bool] = None,
+                    after: Optional[Tuple[datetime, int]] = None):
+    """
+    Build the query listing a user's todos, newest first.
+
+    The filters and ordering match the todo list indexes, so the database
+    reads the page straight from an index without sorting.
+
+    Args:
+        user_id: The owner of the todos
+        completed: If given, only todos with this completion status
+        after: If given, only todos after this (created_at, id) position
+
+    Returns:
+        The select statement, ordered by created_at and then id, descending
+    """
+    query = select(Todo).where(Todo.user_id == user_id)
+
+    if completed is not None:
+        query = query.where(Todo.completed == completed)
+
+    if after is not None:
+        # Seek straight past the last todo of the previous page instead of
+        # reading and discarding every earlier row
+        query = query.where(tuple_(Todo.created_at, Todo.id) < tuple_(*after))
+
+    # id breaks created_at ties so that every todo has one fixed position
+    return query.order_by(desc(Todo.created_at), desc(Todo.id))
+
+
+def todo_version_query(user_id: int):
+    """Build the query reading the version of a user's todo collection."""
+    return select(User.todo_version).where(User.id == user_id)
+
+
+def bump_todo_version(user_id: int, expected: Optional[Collection[int]] = None):
+    """
+    Build the statement advancing the version of a user's todo collection.
+
+    Every todo write runs it first in its transaction. The row lock it takes
+    makes concurrent writes of the same user queue up, so a version check
+    cannot be overtaken before the write commits.
+
+    Args:
+        user_id: The owner of the todos
+        expected: If given, only advance from one of these versions; the
+            statement then returns no row when the version has moved on
+
+    Returns:
+        The update statement, returning the new version
+    """
+    statement = update(User).where(User.id == user_id)
+    if expected is not None:
+        statement = statement.where(User.todo_version.in_(expected))
+    return (statement.values(todo_version=User.todo_version + 1)
+            .returning(User.todo_version))
@@ -1,17 +1,19 @@
 """
 Main FastAPI application for the todo application.
 """
-from fastapi import FastAPI, Depends, HTTPException, status, Request
+from fastapi import FastAPI, Depends, Form, HTTPException, status, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from datetime import datetime
-from sqlmodel import Session
-from .database.database import get_session
-from .database.init_db import create_db_and_tables
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .database.database import async_engine, get_session
+from .database.migrations import check_schema_version
 from .routers import todos
-from .auth.auth import security
+from .auth.user_cache import user_cache
 from .models.user import UserCreate, User
-from .auth.auth import get_password_hash, create_access_token
+from .auth.auth import create_access_token
+from .auth import hashing
 from datetime import timedelta
 
 # Create FastAPI app
@@ -28,40 +30,62 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[todos.NEXT_CURSOR_HEADER, todos.ETAG_HEADER],
 )
 
 # Include routers
 app.include_router(todos.router, prefix="/api", tags=["todos"])
 
+
 @app.on_event("startup")
 def on_startup():
-    """Create database tables on startup."""
-    create_db_and_tables()
+    """Refuse to start against a database whose migrations have not been applied."""
+    check_schema_version()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """Close the pooled database connections."""
+    await async_engine.dispose()
+    hashing.shutdown()
+
+
+@app.exception_handler(hashing.HashingOverloaded)
+async def hashing_overloaded_handler(request: Request, exc: hashing.HashingOverloaded):
+    """Turn a full password-hashing queue into a retryable 503."""
+    return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
 
 @app.get("/health", tags=["health"])
-def health_check():
+async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat(),
+            "auth_cache": user_cache.stats()}
+
 
 @app.post("/api/auth/register", tags=["auth"])
-def register(user_data: UserCreate, session: Session = Depends(get_session)):
+async def register(user_data: UserCreate, session: AsyncSession = Depends(get_session)):
     """Register a new user."""
     # Check if user already exists
-    existing_user = session.exec(select(User).where(User.email == user_data.email)).first()
+    existing_user = (await session.exec(
+        select(User).where(User.email == user_data.email))).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    # Hash password
-    hashed_password = get_password_hash(user_data.password)
+    # End the read so that no pooled connection is held while the password
+    # waits for the hashing worker pool
+    await session.commit()
+    hashed_password = await hashing.hash_password(user_data.password)
 
     # Create user
     db_user = User(email=user_data.email, password_hash=hashed_password)
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    await session.commit()
+    await session.refresh(db_user)
 
     # Create access token
     access_token_expires = timedelta(minutes=30)
@@ -71,20 +95,32 @@ def register(user_data: UserCreate, session: Session = Depends(get_session)):
 
     return {"access_token": access_token, "token_type": "bearer", "user": db_user}
 
-from fastapi import Form
-from .auth.auth import verify_password
 
 @app.post("/api/auth/login", tags=["auth"])
-def login(email: str = Form(...), password: str = Form(...), session: Session = Depends(get_session)):
+async def login(
+    email: str = Form(...),
+    password: str = Form(...),
+    session: AsyncSession = Depends(get_session)
+):
     """Authenticate user and return access token."""
     # Find user by email
-    user = session.exec(select(User).where(User.email == email)).first()
-    if not user or not verify_password(password, user.password_hash):
+    user = (await session.exec(select(User).where(User.email == email))).first()
+    # As in register, release the connection during the password check
+    await session.commit()
+    valid, new_hash = (await hashing.verify_password(password, user.password_hash)
+                       if user else (False, None))
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
 
+    # The hash was made with another bcrypt cost; store it at the current one
+    if new_hash:
+        user.password_hash = new_hash
+        session.add(user)
+        await session.commit()
+
     # Create access token
     access_token_expires = timedelta(minutes=30)
     access_token = create_access_token(
@@ -93,9 +129,10 @@ def login(email: str = Form(...), password: str = Form(...), session: Session =
 
     return {"access_token": access_token, "token_type": "bearer", "user": user}
 
+
 @app.post("/api/auth/logout", tags=["auth"])
-def logout():
+async def logout():
     """Logout user by clearing the session."""
     # In this simple implementation, the client is responsible for clearing the token
     # In a more complex system, you might add the token to a blacklist
-    return {"message": "Successfully logged out"}
\ No newline at end of file
+    return {"message": "Successfully logged out"}
@@ -1,11 +1,17 @@
 """
 Todo model for the todo application.
 """
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 from .user import User
-import uuid
+
+# Indexes serving the todo list query: newest first for one user, with or
+# without a completion filter. Both databases scan them backwards for the
+# descending order, so the columns are kept ascending. Created by migration 2.
+TODO_LIST_INDEX = "ix_todo_user_created"
+TODO_LIST_BY_STATUS_INDEX = "ix_todo_user_completed_created"
 
 
 class TodoBase(SQLModel):
@@ -15,6 +21,11 @@ class TodoBase(SQLModel):
 
 
 class Todo(TodoBase, table=True):
+    __table_args__ = (
+        Index(TODO_LIST_INDEX, "user_id", "created_at", "id"),
+        Index(TODO_LIST_BY_STATUS_INDEX, "user_id", "completed", "created_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str = Field(min_length=1, max_length=255)
     description: Optional[str] = Field(default=None, max_length=1000)
@@ -46,4 +57,38 @@ class TodoUpdate(SQLModel):
 
 
 class TodoToggle(SQLModel):
-    completed: bool
\ No newline at end of file
+    completed: bool
+
+
+# Most operations accepted in one batch request
+MAX_BATCH_OPERATIONS = 500
+
+
+class TodoBatchOperation(SQLModel):
+    """
+    One operation of a batch.
+
+    create needs a title, toggle an id and completed, update and delete an id.
+    """
+    op: Literal["create", "update", "toggle", "delete"]
+    id: Optional[int] = None
+    title: Optional[str] = Field(default=None, min_length=1, max_length=255)
+    description: Optional[str] = Field(default=None, max_length=1000)
+    completed: Optional[bool] = None
+
+
+class TodoBatchRequest(SQLModel):
+    operations: List[TodoBatchOperation] = Field(min_length=1,
+                                                 max_length=MAX_BATCH_OPERATIONS)
+
+
+class TodoBatchResult(SQLModel):
+    """Outcome of one operation: 201, 200, 204, or 404 or 403 as for one todo."""
+    index: int
+    op: str
+    status: int
+    todo: Optional[TodoRead] = None
+
+
+class TodoBatchResponse(SQLModel):
+    results: List[TodoBatchResult]
@@ -1,11 +1,12 @@
 """
 User model for the todo application.
 """
-from sqlmodel import SQLModel, Field
-from typing import Optional
+from sqlmodel import SQLModel, Field, Relationship
+from typing import List, Optional, TYPE_CHECKING
 from datetime import datetime
-from pydantic import BaseModel
-import uuid
+
+if TYPE_CHECKING:
+    from .todo import Todo
 
 
 class UserBase(SQLModel):
@@ -18,6 +19,12 @@ class User(UserBase, table=True):
     password_hash: str = Field(nullable=False)
     created_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    # Advanced by every write to the user's todos; the ETag of their todo responses
+    todo_version: int = Field(default=0, nullable=False,
+                              sa_column_kwargs={"server_default": "0"})
+
+    # Counterpart of Todo.user, which names this property in back_populates
+    todos: List["Todo"] = Relationship(back_populates="user")
 
 
 class UserCreate(UserBase):
@@ -31,4 +38,4 @@ class UserRead(UserBase):
 
 
 class UserUpdate(SQLModel):
-    email: Optional[str] = None
\ No newline at end of file
+    email: Optional[str] = None
@@ -1,120 +1,405 @@
 """
 Todos router for the todo application.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlmodel import Session, select, desc
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Response
+from sqlalchemy import delete, insert, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional, Tuple
+from datetime import datetime
+import base64
+import binascii
 from ..database.database import get_session
-from ..models.todo import Todo, TodoCreate, TodoRead, TodoUpdate, TodoToggle
-from ..models.user import User
+from ..database.queries import bump_todo_version, todo_list_query, todo_version_query
+from ..models.todo import (Todo, TodoCreate, TodoRead, TodoUpdate, TodoToggle,
+                           TodoBatchOperation, TodoBatchRequest, TodoBatchResponse,
+                           TodoBatchResult)
+from ..auth.user_cache import AuthenticatedUser
 from ..auth.auth import get_current_user
 
 router = APIRouter()
 
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+ETAG_HEADER = "ETag"
+
+
+def encode_cursor(todo: Todo) -> str:
+    """Encode the (created_at, id) position of a todo as an opaque cursor."""
+    position = f"{todo.created_at.isoformat()}|{todo.id}"
+    return base64.urlsafe_b64encode(position.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor made by encode_cursor, raising a 400 error if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, todo_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(todo_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def todo_etag(user_id: int, version: int) -> str:
+    """Return the strong ETag of a user's todos at a version of their collection."""
+    return f'"{user_id}.{version}"'
+
+
+def etag_listed(if_none_match: str, etag: str) -> bool:
+    """Check whether If-None-Match names the current ETag, comparing weakly."""
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(
+        (candidate[2:] if candidate.startswith("W/") else candidate) == etag
+        for candidate in candidates)
+
+
+def if_match_versions(if_match: Optional[str], user_id: int) -> Optional[List[int]]:
+    """
+    Parse an If-Match header into the collection versions it accepts.
+
+    Returns:
+        None if the request is unconditional (no header, or "*"); otherwise
+        the versions of this user's strong ETags it lists, possibly none
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    prefix = f'"{user_id}.'
+    versions = []
+    for candidate in if_match.split(","):
+        candidate = candidate.strip()
+        number = candidate[len(prefix):-1]
+        if (candidate.startswith(prefix) and candidate.endswith('"')
+                and number.isdigit()):
+            versions.append(int(number))
+    return versions
+
+
+async def current_todo_etag(session: AsyncSession, user_id: int) -> str:
+    """
+    Read the ETag of the user's todos from the database.
+
+    This is one query on top of what a GET would otherwise run. The
+    version is deliberately not kept in the authentication cache: that
+    cache is per process, so other workers would answer 304 with stale
+    todos until their entry expired.
+    """
+    return todo_etag(user_id, await session.scalar(todo_version_query(user_id)))
+
+
+async def begin_todo_write(session: AsyncSession, response: Response, user_id: int,
+                           if_match: Optional[str] = None):
+    """
+    Advance the user's todo version ahead of a write and send the new ETag.
+
+    Raises:
+        HTTPException: 412 if If-Match names none of the current versions
+    """
+    expected = if_match_versions(if_match, user_id)
+    version = None
+    if expected is None or expected:
+        version = await session.scalar(bump_todo_version(user_id, expected))
+    if version is None:
+        raise HTTPException(status_code=412,
+                            detail="Todos have changed since they were fetched")
+    response.headers[ETAG_HEADER] = todo_etag(user_id, version)
+
+
 @router.get("/todos", response_model=List[TodoRead], tags=["todos"])
-def get_todos(
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+async def get_todos(
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    completed: Optional[bool] = Query(None)
+    cursor: Optional[str] = Query(
+        None, description="Value of the X-Next-Cursor header of the previous page"),
+    completed: Optional[bool] = Query(None),
+    if_none_match: Optional[str] = Header(None)
 ):
-    """Get all todos for the current user."""
-    query = select(Todo).where(Todo.user_id == current_user.id)
+    """
+    Get the current user's todos, newest first.
 
-    if completed is not None:
-        query = query.where(Todo.completed == completed)
+    Pages are either addressed by offset or, for constant cost at any depth,
+    by the cursor returned in the X-Next-Cursor header of the previous page.
+    The header is set whenever more todos follow.
 
-    query = query.order_by(desc(Todo.created_at)).offset(offset).limit(limit)
+    The ETag costs one query for the todo version before the list query.
+    When If-None-Match names the current ETag, that query is the only one:
+    the answer is 304 without reading any todo.
+    """
+    if cursor is not None and offset:
+        raise HTTPException(status_code=400,
+                            detail="Use either cursor or offset, not both")
 
-    todos = session.exec(query).all()
+    # Read before the todos: a write committed in between leaves the ETag
+    # older than the list, which only costs the client one more download
+    etag = await current_todo_etag(session, current_user.id)
+    if if_none_match is not None and etag_listed(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                        headers={ETAG_HEADER: etag})
+    response.headers[ETAG_HEADER] = etag
+
+    after = decode_cursor(cursor) if cursor is not None else None
+    query = (todo_list_query(current_user.id, completed, after)
+             .offset(offset).limit(limit + 1))
+
+    todos = (await session.exec(query)).all()
+    if len(todos) > limit:
+        todos = todos[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(todos[-1])
     return todos
 
-@router.post("/todos", response_model=TodoRead, status_code=status.HTTP_201_CREATED, tags=["todos"])
-def create_todo(
+
+@router.post("/todos", response_model=TodoRead, status_code=status.HTTP_201_CREATED,
+             tags=["todos"])
+async def create_todo(
     todo: TodoCreate,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session)
 ):
     """Create a new todo for the current user."""
-    db_todo = Todo.model_validate(todo.model_dump())
-    db_todo.user_id = current_user.id
+    await begin_todo_write(session, response, current_user.id)
+    db_todo = Todo.model_validate(todo.model_dump(),
+                                  update={"user_id": current_user.id})
     session.add(db_todo)
-    session.commit()
-    session.refresh(db_todo)
+    await session.commit()
+    await session.refresh(db_todo)
     return db_todo
 
+
+def validate_batch(operations: List[TodoBatchOperation]):
+    """
+    Check that every operation has its fields and no todo is targeted twice.
+
+    Raises:
+        HTTPException: 422 listing every invalid operation
+    """
+    errors = []
+    targeted = set()
+    for index, operation in enumerate(operations):
+        if operation.op == "create":
+            if operation.title is None:
+                errors.append(f"Operation {index}: create needs a title")
+            continue
+        if operation.id is None:
+            errors.append(f"Operation {index}: {operation.op} needs an id")
+        elif operation.id in targeted:
+            errors.append(f"Operation {index}: todo {operation.id} "
+                          "is already changed by this batch")
+        else:
+            targeted.add(operation.id)
+        if operation.op == "toggle" and operation.completed is None:
+            errors.append(f"Operation {index}: toggle needs completed")
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
+
+@router.post("/todos/batch", response_model=TodoBatchResponse, tags=["todos"])
+async def batch_todos(
+    batch: TodoBatchRequest,
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+    if_match: Optional[str] = Header(None)
+):
+    """
+    Apply many create, update, toggle and delete operations in one transaction.
+
+    Operations are grouped by kind and every group runs as one set-based
+    statement scoped to the current user, so a batch costs a handful of
+    statements whatever its size. Creates run first, then updates, toggles
+    and deletes. Results come back in request order, with the status the
+    single-todo endpoint would have answered: todos that do not exist
+    report 404 and todos of other users 403, which costs one more query
+    only when there are such operations.
+    """
+    operations = batch.operations
+    validate_batch(operations)
+    await begin_todo_write(session, response, current_user.id, if_match)
+    now = datetime.utcnow()
+    results: List[Optional[TodoBatchResult]] = [None] * len(operations)
+
+    def grouped(kind: str, completed: Optional[bool] = None
+                ) -> List[Tuple[int, TodoBatchOperation]]:
+        return [(index, operation) for index, operation in enumerate(operations)
+                if operation.op == kind
+                and (completed is None or operation.completed == completed)]
+
+    def report(group, todos_by_id, found_status: int):
+        for index, operation in group:
+            todo = todos_by_id.get(operation.id)
+            found = todo is not None
+            results[index] = TodoBatchResult(
+                index=index, op=operation.op, status=found_status if found else 404,
+                todo=TodoRead.model_validate(todo)
+                if found and found_status != 204 else None)
+
+    creates = grouped("create")
+    if creates:
+        # One multi-row INSERT ... RETURNING, rows in parameter order
+        rows = [{"title": operation.title, "description": operation.description,
+                 "completed": bool(operation.completed), "user_id": current_user.id,
+                 "created_at": now, "updated_at": now} for _, operation in creates]
+        created = (await session.scalars(
+            insert(Todo).returning(Todo, sort_by_parameter_order=True), rows)).all()
+        for (index, operation), todo in zip(creates, created):
+            results[index] = TodoBatchResult(index=index, op=operation.op, status=201,
+                                             todo=TodoRead.model_validate(todo))
+
+    updates = grouped("update")
+    if updates:
+        # Each row has its own values, so look up which todos are the user's
+        # and update those by primary key in one executemany
+        owned = set((await session.scalars(select(Todo.id).where(
+            Todo.user_id == current_user.id,
+            Todo.id.in_([operation.id for _, operation in updates])))).all())
+        rows = [{"id": operation.id, "updated_at": now,
+                 **{field: getattr(operation, field)
+                    for field in ("title", "description", "completed")
+                    if getattr(operation, field) is not None}}
+                for _, operation in updates if operation.id in owned]
+        if rows:
+            await session.execute(update(Todo), rows)
+        updated = (await session.scalars(
+            select(Todo).where(Todo.id.in_(owned))
+            .execution_options(populate_existing=True))).all()
+        report(updates, {todo.id: todo for todo in updated}, 200)
+
+    for completed in (True, False):
+        toggles = grouped("toggle", completed)
+        if toggles:
+            statement = (update(Todo)
+                         .where(Todo.user_id == current_user.id,
+                                Todo.id.in_([operation.id for _, operation in toggles]))
+                         .values(completed=completed, updated_at=now)
+                         .returning(Todo))
+            toggled = (await session.scalars(statement)).all()
+            report(toggles, {todo.id: todo for todo in toggled}, 200)
+
+    deletes = grouped("delete")
+    if deletes:
+        statement = (delete(Todo)
+                     .where(Todo.user_id == current_user.id,
+                            Todo.id.in_([operation.id for _, operation in deletes]))
+                     .returning(Todo.id))
+        deleted = (await session.scalars(statement)).all()
+        report(deletes, dict.fromkeys(deleted, True), 204)
+
+    missed = [result for result in results if result.status == 404]
+    if missed:
+        # Tell todos of other users from missing ones, as the single-todo
+        # endpoints do
+        missed_ids = [operations[result.index].id for result in missed]
+        others = set((await session.scalars(
+            select(Todo.id).where(Todo.id.in_(missed_ids)))).all())
+        for result in missed:
+            if operations[result.index].id in others:
+                result.status = 403
+
+    await session.commit()
+    return TodoBatchResponse(results=results)
+
+
 @router.get("/todos/{todo_id}", response_model=TodoRead, tags=["todos"])
-def get_todo(
+async def get_todo(
     todo_id: int,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+    if_none_match: Optional[str] = Header(None)
 ):
-    """Get a specific todo by ID."""
-    todo = session.get(Todo, todo_id)
+    """Get a specific todo by ID, or 304 if If-None-Match names the current ETag."""
+    etag = await current_todo_etag(session, current_user.id)
+    if if_none_match is not None and etag_listed(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                        headers={ETAG_HEADER: etag})
+    response.headers[ETAG_HEADER] = etag
+    todo = await session.get(Todo, todo_id)
     if not todo:
         raise HTTPException(status_code=404, detail="Todo not found")
     if todo.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to access this todo")
+        raise HTTPException(status_code=403,
+                            detail="Not authorized to access this todo")
     return todo
 
+
+async def raise_missing_todo(session: AsyncSession, todo_id: int):
+    """
+    Report why a statement scoped to the current user matched no todo.
+
+    Raises:
+        HTTPException: 404 if the todo does not exist, 403 if it is
+            someone else's
+    """
+    if await session.scalar(select(Todo.id).where(Todo.id == todo_id)) is None:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    raise HTTPException(status_code=403, detail="Not authorized to access this todo")
+
+
 @router.put("/todos/{todo_id}", response_model=TodoRead, tags=["todos"])
-def update_todo(
+async def update_todo(
     todo_id: int,
     todo_update: TodoUpdate,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+    if_match: Optional[str] = Header(None)
 ):
     """Update a specific todo by ID."""
-    todo = session.get(Todo, todo_id)
-    if not todo:
-        raise HTTPException(status_code=404, detail="Todo not found")
-    if todo.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to access this todo")
-
-    update_data = todo_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        if value is not None:
-            setattr(todo, field, value)
-
-    session.add(todo)
-    session.commit()
-    session.refresh(todo)
+    await begin_todo_write(session, response, current_user.id, if_match)
+    update_data = {field: value
+                   for field, value in todo_update.dict(exclude_unset=True).items()
+                   if value is not None}
+    # One statement checks ownership, applies the change and returns the row
+    statement = (update(Todo)
+                 .where(Todo.id == todo_id, Todo.user_id == current_user.id)
+                 .values(**update_data, updated_at=datetime.utcnow())
+                 .returning(Todo))
+    todo = await session.scalar(statement)
+    if todo is None:
+        await raise_missing_todo(session, todo_id)
+    await session.commit()
     return todo
 
+
 @router.patch("/todos/{todo_id}/toggle", response_model=TodoRead, tags=["todos"])
-def toggle_todo(
+async def toggle_todo(
     todo_id: int,
     todo_toggle: TodoToggle,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+    if_match: Optional[str] = Header(None)
 ):
     """Toggle the completion status of a todo."""
-    todo = session.get(Todo, todo_id)
-    if not todo:
-        raise HTTPException(status_code=404, detail="Todo not found")
-    if todo.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to access this todo")
-
-    todo.completed = todo_toggle.completed
-    session.add(todo)
-    session.commit()
-    session.refresh(todo)
+    await begin_todo_write(session, response, current_user.id, if_match)
+    statement = (update(Todo)
+                 .where(Todo.id == todo_id, Todo.user_id == current_user.id)
+                 .values(completed=todo_toggle.completed, updated_at=datetime.utcnow())
+                 .returning(Todo))
+    todo = await session.scalar(statement)
+    if todo is None:
+        await raise_missing_todo(session, todo_id)
+    await session.commit()
     return todo
 
-@router.delete("/todos/{todo_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["todos"])
-def delete_todo(
+
+@router.delete("/todos/{todo_id}", status_code=status.HTTP_204_NO_CONTENT,
+               tags=["todos"])
+async def delete_todo(
     todo_id: int,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+    if_match: Optional[str] = Header(None)
 ):
     """Delete a specific todo by ID."""
-    todo = session.get(Todo, todo_id)
-    if not todo:
-        raise HTTPException(status_code=404, detail="Todo not found")
-    if todo.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to access this todo")
-
-    session.delete(todo)
-    session.commit()
-    return
\ No newline at end of file
+    await begin_todo_write(session, response, current_user.id, if_match)
+    statement = (delete(Todo)
+                 .where(Todo.id == todo_id, Todo.user_id == current_user.id)
+                 .returning(Todo.id))
+    if await session.scalar(statement) is None:
+        await raise_missing_todo(session, todo_id)
+    await session.commit()
+    return
@@ -30,4 +30,4 @@ class TodoUpdate(BaseModel):
 
 
 class TodoToggle(BaseModel):
-    completed: bool
\ No newline at end of file
+    completed: bool
@@ -26,4 +26,4 @@ class UserUpdate(BaseModel):
 
 class UserLogin(BaseModel):
     email: str
-    password: str
\ No newline at end of file
+    password: str
@@ -0,0 +1,60 @@
+"""
+Shared setup for the backend tests.
+
+The backend reads DATABASE_URL when it is imported, so the tests point it
+at a scratch SQLite file first; a real database configured in .env is
+never touched. Run the tests from the phase-2 directory:
+
+    python -m pytest backend/tests
+"""
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+_scratch = tempfile.mkdtemp(prefix="todo-backend-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_scratch, 'todo.db')}"
+# The cheapest bcrypt cost keeps registering test users fast
+os.environ["BCRYPT_ROUNDS"] = "4"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+
+@pytest.fixture(scope="session")
+def client():
+    """A TestClient of the app over a freshly migrated database."""
+    from fastapi.testclient import TestClient
+    from backend.database.database import engine
+    from backend.database.migrations import migrate
+    from backend.main import app
+    migrate(engine)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def new_user(client):
+    """A function registering a fresh user and returning their auth headers."""
+    def register() -> dict:
+        email = f"user-{uuid.uuid4().hex}@example.com"
+        response = client.post("/api/auth/register",
+                               json={"email": email, "password": "secret123"})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return register
+
+
+@pytest.fixture
+def statements():
+    """The first keyword of every SQL statement the request handlers run."""
+    from sqlalchemy import event
+    from backend.database.database import async_engine
+    executed = []
+
+    def record(connection, cursor, statement, parameters, context, executemany):
+        executed.append(statement.split(None, 1)[0].upper())
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
@@ -0,0 +1,101 @@
+"""
+Tests for the batch todo endpoint.
+"""
+
+
+def create(client, headers, title):
+    """Create a todo through the single-todo endpoint and return its ID."""
+    response = client.post("/api/todos", json={"title": title}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def batch(client, headers, *operations):
+    """Run a batch and return its response."""
+    return client.post("/api/todos/batch", json={"operations": list(operations)},
+                       headers=headers)
+
+
+def test_mixed_operations(client, new_user):
+    """Test that every kind of operation is applied and reported in request order."""
+    headers = new_user()
+    first, second, third = (create(client, headers, title) for title in "abc")
+
+    response = batch(client, headers,
+                     {"op": "delete", "id": third},
+                     {"op": "create", "title": "New", "description": "Made in a batch"},
+                     {"op": "toggle", "id": second, "completed": True},
+                     {"op": "update", "id": first, "title": "Renamed"})
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [(r["index"], r["op"], r["status"]) for r in results] == [
+        (0, "delete", 204), (1, "create", 201), (2, "toggle", 200), (3, "update", 200)]
+    assert results[0]["todo"] is None
+    assert results[1]["todo"]["description"] == "Made in a batch"
+    assert results[2]["todo"]["completed"] is True
+    assert results[3]["todo"]["title"] == "Renamed"
+
+    todos = {todo["id"]: todo for todo in
+             client.get("/api/todos", headers=headers).json()}
+    assert set(todos) == {first, second, results[1]["todo"]["id"]}
+    assert todos[first]["title"] == "Renamed" and todos[second]["completed"] is True
+
+
+def test_missing_todos_report_404(client, new_user):
+    """Test that operations on missing todos fail alone, leaving the rest applied."""
+    headers = new_user()
+    todo_id = create(client, headers, "Kept")
+
+    response = batch(client, headers,
+                     {"op": "update", "id": 10 ** 9, "title": "Nope"},
+                     {"op": "toggle", "id": 10 ** 9 + 1, "completed": True},
+                     {"op": "delete", "id": 10 ** 9 + 2},
+                     {"op": "toggle", "id": todo_id, "completed": True})
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [404, 404, 404, 200]
+    assert client.get(f"/api/todos/{todo_id}", headers=headers).json()["completed"]
+
+
+def test_todos_of_other_users_report_403(client, new_user):
+    """Test that a batch cannot touch another user's todos and reports it like PUT."""
+    owner, intruder = new_user(), new_user()
+    ids = [create(client, owner, title) for title in ("One", "Two", "Three")]
+
+    results = batch(client, intruder,
+                    {"op": "update", "id": ids[0], "title": "Hijacked"},
+                    {"op": "toggle", "id": ids[1], "completed": True},
+                    {"op": "delete", "id": ids[2]}).json()["results"]
+    assert [r["status"] for r in results] == [403, 403, 403]
+    put = client.put(f"/api/todos/{ids[0]}", json={"title": "Hijacked"},
+                     headers=intruder)
+    assert put.status_code == 403
+
+    todos = client.get("/api/todos", headers=owner).json()
+    assert sorted(todo["title"] for todo in todos) == ["One", "Three", "Two"]
+    assert not any(todo["completed"] for todo in todos)
+
+
+def test_statements_do_not_grow_with_the_batch(client, new_user, statements):
+    """Test that each kind of operation costs a fixed number of statements."""
+    headers = new_user()
+    ids = [create(client, headers, f"Todo {i}") for i in range(40)]
+
+    def run(todo_ids):
+        half = len(todo_ids) // 2
+        operations = (
+            [{"op": "update", "id": i, "title": "Updated"}
+             for i in todo_ids[:half // 2]]
+            + [{"op": "toggle", "id": i, "completed": True}
+               for i in todo_ids[half // 2:half]]
+            + [{"op": "delete", "id": i} for i in todo_ids[half:]])
+        statements.clear()
+        assert batch(client, headers, *operations).status_code == 200
+        return list(statements)
+
+    # Version bump; owned IDs, executemany UPDATE and reload for the
+    # updates; one UPDATE for the toggles; one DELETE
+    expected = ["UPDATE", "SELECT", "UPDATE", "SELECT", "UPDATE", "DELETE"]
+    assert run(ids[:8]) == expected
+    assert run(ids[8:]) == expected
+    # Operations that match nothing add one lookup for the whole batch
+    assert run(ids[:8]) == expected + ["SELECT"]
@@ -0,0 +1,112 @@
+"""
+Tests for todo ETags and conditional requests.
+"""
+
+
+def create(client, headers, title="Todo"):
+    """Create a todo and return the response."""
+    response = client.post("/api/todos", json={"title": title}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response
+
+
+def list_etag(client, headers):
+    """Return the ETag of the user's todo list."""
+    response = client.get("/api/todos", headers=headers)
+    assert response.status_code == 200
+    return response.headers["etag"]
+
+
+def test_matching_if_none_match_is_304_after_one_query(client, new_user, statements):
+    """Test that an unchanged list or todo is answered 304 from the version alone."""
+    headers = new_user()
+    todo_id = create(client, headers).json()["id"]
+
+    statements.clear()
+    response = client.get("/api/todos", headers=headers)
+    etag = response.headers["etag"]
+    # The version query, then the list query
+    assert statements == ["SELECT", "SELECT"]
+
+    for url in ("/api/todos", "/api/todos?completed=false", f"/api/todos/{todo_id}"):
+        statements.clear()
+        response = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304, url
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert statements == ["SELECT"], url
+
+    # Weak validators and lists of them match too; other ETags do not
+    response = client.get("/api/todos",
+                          headers={**headers, "If-None-Match": f'"0.0", W/{etag}'})
+    assert response.status_code == 304
+    response = client.get("/api/todos", headers={**headers, "If-None-Match": '"0.0"'})
+    assert response.status_code == 200 and len(response.json()) == 1
+
+
+def test_etag_changes_with_every_write(client, new_user):
+    """Test that create, update, toggle and delete each issue a new ETag."""
+    headers = new_user()
+    etags = [list_etag(client, headers)]
+
+    created = create(client, headers)
+    todo_id = created.json()["id"]
+    writes = [
+        lambda: created,
+        lambda: client.put(f"/api/todos/{todo_id}", json={"title": "New"},
+                           headers=headers),
+        lambda: client.patch(f"/api/todos/{todo_id}/toggle", json={"completed": True},
+                             headers=headers),
+        lambda: client.delete(f"/api/todos/{todo_id}", headers=headers),
+    ]
+    for write in writes:
+        response = write()
+        # Each write answers with the ETag the next GET reports
+        assert response.headers["etag"] == list_etag(client, headers)
+        etags.append(response.headers["etag"])
+    assert len(set(etags)) == len(etags)
+
+
+def test_stale_if_match_is_412(client, new_user):
+    """Test that writes conditioned on an outdated ETag are refused."""
+    headers = new_user()
+    todo_id = create(client, headers, "Original").json()["id"]
+    stale = list_etag(client, headers)
+    fresh = client.put(f"/api/todos/{todo_id}", json={"title": "Changed"},
+                       headers={**headers, "If-Match": stale}).headers["etag"]
+
+    for method, url, body in (
+            ("PUT", f"/api/todos/{todo_id}", {"title": "Lost update"}),
+            ("PATCH", f"/api/todos/{todo_id}/toggle", {"completed": True}),
+            ("DELETE", f"/api/todos/{todo_id}", None)):
+        for if_match in (stale, '"junk"', f'"{stale[1:-1]}0"'):
+            response = client.request(method, url, json=body,
+                                      headers={**headers, "If-Match": if_match})
+            assert response.status_code == 412, (method, if_match)
+    assert list_etag(client, headers) == fresh
+    todo = client.get(f"/api/todos/{todo_id}", headers=headers).json()
+    assert (todo["title"], todo["completed"]) == ("Changed", False)
+
+    response = client.delete(f"/api/todos/{todo_id}",
+                             headers={**headers, "If-Match": f'"0.0", {fresh}'})
+    assert response.status_code == 204
+
+
+def test_failed_write_rolls_back_the_version(client, new_user):
+    """Test that a write that fails leaves the ETag as it was."""
+    headers, other = new_user(), new_user()
+    others_todo = create(client, other).json()["id"]
+    create(client, headers)
+    etag = list_etag(client, headers)
+
+    assert client.put("/api/todos/999999", json={"title": "x"},
+                      headers=headers).status_code == 404
+    response = client.delete(f"/api/todos/{others_todo}", headers=headers)
+    assert response.status_code == 403
+    assert list_etag(client, headers) == etag
+
+    # The ETag is still current, so a conditional write goes through
+    todo_id = client.get("/api/todos", headers=headers).json()[0]["id"]
+    response = client.patch(f"/api/todos/{todo_id}/toggle", json={"completed": True},
+                            headers={**headers, "If-Match": etag})
+    assert response.status_code == 200
@@ -0,0 +1,76 @@
+"""
+Tests for password hashing in the worker pool during login.
+"""
+import uuid
+
+from sqlmodel import Session
+
+from backend.auth import hashing
+from backend.database.database import engine
+from backend.models.user import User
+
+PASSWORD = "secret123"
+
+
+def register(client):
+    """Register a fresh user and return their email and id."""
+    email = f"user-{uuid.uuid4().hex}@example.com"
+    response = client.post("/api/auth/register",
+                           json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return email, response.json()["user"]["id"]
+
+
+def stored_hash(user_id):
+    """Read a user's password hash from the database."""
+    with Session(engine) as session:
+        return session.get(User, user_id).password_hash
+
+
+def store_hash(user_id, password_hash):
+    """Replace a user's password hash in the database."""
+    with Session(engine) as session:
+        user = session.get(User, user_id)
+        user.password_hash = password_hash
+        session.add(user)
+        session.commit()
+
+
+def login(client, email, password):
+    """Log in with form fields and return the response."""
+    return client.post("/api/auth/login", data={"email": email, "password": password})
+
+
+def test_full_queue_is_503_with_retry_after(client, monkeypatch):
+    """Test that a login is turned away while every hashing slot is taken."""
+    email, _ = register(client)
+    monkeypatch.setattr(hashing, "_pending",
+                        hashing.HASH_WORKERS + hashing.HASH_QUEUE_LIMIT)
+
+    response = login(client, email, PASSWORD)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_login_rehashes_an_outdated_cost(client):
+    """Test that a hash made at another BCRYPT_ROUNDS is replaced on login."""
+    email, user_id = register(client)
+    old_hash = hashing.crypt_context(hashing.BCRYPT_ROUNDS + 1).hash(PASSWORD)
+    store_hash(user_id, old_hash)
+
+    assert login(client, email, PASSWORD).status_code == 200
+    new_hash = stored_hash(user_id)
+    assert new_hash != old_hash
+    assert new_hash.startswith(f"$2b${hashing.BCRYPT_ROUNDS:02d}$")
+    assert login(client, email, PASSWORD).status_code == 200
+    assert stored_hash(user_id) == new_hash
+
+
+def test_wrong_password_does_not_rehash(client):
+    """Test that a failed login leaves an outdated hash as it was."""
+    email, user_id = register(client)
+    old_hash = hashing.crypt_context(hashing.BCRYPT_ROUNDS + 1).hash(PASSWORD)
+    store_hash(user_id, old_hash)
+
+    assert login(client, email, "wrong password").status_code == 401
+    assert stored_hash(user_id) == old_hash
@@ -0,0 +1,48 @@
+"""
+Tests for the schema migrations and the todo list query plans.
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+from backend.database.migrations import (LATEST_VERSION, check_query_plans,
+                                         current_version, migrate)
+
+# A scratch PostgreSQL database the plan test may migrate; never the app's own
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def test_sqlite_list_queries_use_their_indexes(tmp_path):
+    """Test that a migrated SQLite database serves every list query from an index."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    assert migrate(engine) == list(range(1, LATEST_VERSION + 1))
+    assert migrate(engine) == []
+    with engine.connect() as connection:
+        assert current_version(connection) == LATEST_VERSION
+    assert check_query_plans(engine) == []
+    engine.dispose()
+
+
+def test_sqlite_plan_check_fails_without_indexes(tmp_path):
+    """Test that the plan check notices when the list indexes are missing."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    migrate(engine, target=1)
+    assert len(check_query_plans(engine)) == 4
+    engine.dispose()
+
+
+def test_postgresql_list_queries_use_their_indexes():
+    """Test the query plans on PostgreSQL, when TEST_DATABASE_URL names a server."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    pytest.importorskip("psycopg2")
+    engine = create_engine(TEST_DATABASE_URL)
+    try:
+        engine.connect().close()
+    except OperationalError as e:
+        pytest.skip(f"PostgreSQL is not reachable: {e}")
+    migrate(engine)
+    assert check_query_plans(engine) == []
+    engine.dispose()
@@ -0,0 +1,104 @@
+"""
+Tests for keyset paging of the todo list.
+"""
+from datetime import datetime
+
+NEXT_CURSOR = "X-Next-Cursor"
+
+
+def create_many(client, headers, titles):
+    """Create todos in one batch, which gives them all the same created_at."""
+    response = client.post("/api/todos/batch",
+                           json={"operations": [{"op": "create", "title": title}
+                                                for title in titles]},
+                           headers=headers)
+    assert response.status_code == 200, response.text
+    return [result["todo"] for result in response.json()["results"]]
+
+
+def all_pages(client, headers, limit, **params):
+    """Follow X-Next-Cursor from the first page until it is absent."""
+    pages = []
+    params = {"limit": limit, **params}
+    while True:
+        response = client.get("/api/todos", params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get(NEXT_CURSOR)
+        if cursor is None:
+            return pages
+        params = {"limit": limit, "cursor": cursor}
+
+
+def test_cursor_walks_every_page(client, new_user):
+    """Test that following the cursor visits every todo once, newest first."""
+    headers = new_user()
+    older = create_many(client, headers, [f"Older {i}" for i in range(4)])
+    newer = create_many(client, headers, [f"Newer {i}" for i in range(5)])
+
+    pages = all_pages(client, headers, limit=3)
+    assert [len(page) for page in pages] == [3, 3, 3]
+    listed = [todo for page in pages for todo in page]
+    positions = [(datetime.fromisoformat(todo["created_at"]), todo["id"])
+                 for todo in listed]
+    assert positions == sorted(positions, reverse=True)
+    assert [todo["id"] for todo in listed] == \
+        sorted((todo["id"] for todo in older + newer), reverse=True)
+
+
+def test_ties_on_created_at_have_no_duplicates_or_gaps(client, new_user):
+    """Test that todos sharing created_at are split across pages by id."""
+    headers = new_user()
+    todos = create_many(client, headers, [f"Todo {i}" for i in range(7)])
+    assert len({todo["created_at"] for todo in todos}) == 1
+
+    for limit in (1, 2, 3, 6, 7):
+        pages = all_pages(client, headers, limit=limit)
+        ids = [todo["id"] for page in pages for todo in page]
+        assert ids == sorted((todo["id"] for todo in todos), reverse=True), limit
+        # The last page is full only when the todos divide evenly
+        assert all(len(page) == limit for page in pages[:-1]), limit
+
+
+def test_cursor_keeps_the_completed_filter(client, new_user):
+    """Test that a filtered list pages through the matching todos only."""
+    headers = new_user()
+    todos = create_many(client, headers, [f"Todo {i}" for i in range(6)])
+    done = [todo["id"] for todo in todos[::2]]
+    for todo_id in done:
+        client.patch(f"/api/todos/{todo_id}/toggle", json={"completed": True},
+                     headers=headers)
+
+    response = client.get("/api/todos", params={"limit": 2, "completed": True},
+                          headers=headers)
+    first = [todo["id"] for todo in response.json()]
+    response = client.get("/api/todos",
+                          params={"limit": 2, "completed": True,
+                                  "cursor": response.headers[NEXT_CURSOR]},
+                          headers=headers)
+    assert NEXT_CURSOR not in response.headers
+    second = [todo["id"] for todo in response.json()]
+    assert first + second == sorted(done, reverse=True)
+
+
+def test_malformed_cursor_is_400(client, new_user):
+    """Test that a cursor that does not decode to a position is rejected."""
+    headers = new_user()
+    for cursor in ("not base64!", "bm8gc2VwYXJhdG9y", "MjAyNC0wMS0wMXx4"):
+        response = client.get("/api/todos", params={"cursor": cursor},
+                              headers=headers)
+        assert response.status_code == 400, cursor
+        assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_cursor_and_offset_together_is_400(client, new_user):
+    """Test that a request cannot address a page by both cursor and offset."""
+    headers = new_user()
+    create_many(client, headers, ["a", "b", "c"])
+    cursor = client.get("/api/todos", params={"limit": 1},
+                        headers=headers).headers[NEXT_CURSOR]
+
+    response = client.get("/api/todos", params={"cursor": cursor, "offset": 1},
+                          headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Use either cursor or offset, not both"
@@ -0,0 +1,92 @@
+"""
+Tests for the single-statement todo update, toggle and delete routes.
+"""
+from datetime import datetime
+
+# Every todo write first advances the user's todo version, then runs its
+# one statement scoped by id and user_id
+BUMP = "UPDATE"
+
+
+def create(client, headers, title="Todo"):
+    """Create a todo and return it."""
+    response = client.post("/api/todos", json={"title": title}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_update_is_one_statement(client, new_user, statements):
+    """Test that PUT changes the todo and bumps updated_at in a single UPDATE."""
+    headers = new_user()
+    todo = create(client, headers)
+
+    statements.clear()
+    response = client.put(f"/api/todos/{todo['id']}",
+                          json={"title": "Renamed", "description": "Now described"},
+                          headers=headers)
+    assert response.status_code == 200
+    assert statements == [BUMP, "UPDATE"]
+    updated = response.json()
+    assert (updated["title"], updated["description"]) == ("Renamed", "Now described")
+    assert (datetime.fromisoformat(updated["updated_at"])
+            > datetime.fromisoformat(todo["updated_at"]))
+
+
+def test_toggle_is_one_statement(client, new_user, statements):
+    """Test that toggling runs a single UPDATE ... RETURNING."""
+    headers = new_user()
+    todo = create(client, headers)
+
+    statements.clear()
+    response = client.patch(f"/api/todos/{todo['id']}/toggle",
+                            json={"completed": True}, headers=headers)
+    assert response.status_code == 200
+    assert statements == [BUMP, "UPDATE"]
+    assert response.json()["completed"] is True
+    assert (datetime.fromisoformat(response.json()["updated_at"])
+            > datetime.fromisoformat(todo["updated_at"]))
+
+
+def test_delete_is_one_statement(client, new_user, statements):
+    """Test that DELETE runs a single DELETE ... RETURNING."""
+    headers = new_user()
+    todo = create(client, headers)
+
+    statements.clear()
+    response = client.delete(f"/api/todos/{todo['id']}", headers=headers)
+    assert response.status_code == 204
+    assert statements == [BUMP, "DELETE"]
+    assert client.get(f"/api/todos/{todo['id']}", headers=headers).status_code == 404
+
+
+def test_missing_todo_costs_one_more_lookup(client, new_user, statements):
+    """Test that a missing todo is reported as 404 after one existence lookup."""
+    headers = new_user()
+    create(client, headers)
+
+    for method, url, body, statement in (
+            ("PUT", "/api/todos/999999", {"title": "x"}, "UPDATE"),
+            ("PATCH", "/api/todos/999999/toggle", {"completed": True}, "UPDATE"),
+            ("DELETE", "/api/todos/999999", None, "DELETE")):
+        statements.clear()
+        response = client.request(method, url, json=body, headers=headers)
+        assert response.status_code == 404, method
+        assert statements == [BUMP, statement, "SELECT"], method
+
+
+def test_other_users_todo_is_403_and_unchanged(client, new_user, statements):
+    """Test that another user's todo is reported as 403 and left as it was."""
+    owner, intruder = new_user(), new_user()
+    todo = create(client, owner, "Private")
+    create(client, intruder)
+
+    for method, url, body, statement in (
+            ("PUT", f"/api/todos/{todo['id']}", {"title": "x"}, "UPDATE"),
+            ("PATCH", f"/api/todos/{todo['id']}/toggle", {"completed": True}, "UPDATE"),
+            ("DELETE", f"/api/todos/{todo['id']}", None, "DELETE")):
+        statements.clear()
+        response = client.request(method, url, json=body, headers=intruder)
+        assert response.status_code == 403, method
+        assert statements == [BUMP, statement, "SELECT"], method
+
+    assert client.get(f"/api/todos/{todo['id']}", headers=owner).json() == todo
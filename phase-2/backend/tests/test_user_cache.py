@@ -0,0 +1,100 @@
+"""
+Tests for the cache of authenticated users.
+"""
+import uuid
+
+from sqlmodel import Session
+
+from backend.auth import user_cache as user_cache_module
+from backend.auth.user_cache import AuthenticatedUser, UserCache, user_cache
+from backend.database.database import engine
+from backend.models.user import User
+
+# An uncached GET /api/todos looks up the user, then reads the todo version
+# and the list; a cached one skips the lookup
+UNCACHED = ["SELECT", "SELECT", "SELECT"]
+CACHED = ["SELECT", "SELECT"]
+
+
+def register(client):
+    """Register a fresh user and return their auth headers and id."""
+    response = client.post("/api/auth/register",
+                           json={"email": f"user-{uuid.uuid4().hex}@example.com",
+                                 "password": "secret123"})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return {"Authorization": f"Bearer {body['access_token']}"}, body["user"]["id"]
+
+
+def test_cached_token_skips_the_user_lookup(client, statements):
+    """Test that a second request within the TTL does not query the users table."""
+    headers, _ = register(client)
+
+    statements.clear()
+    assert client.get("/api/todos", headers=headers).status_code == 200
+    assert statements == UNCACHED
+
+    statements.clear()
+    assert client.get("/api/todos", headers=headers).status_code == 200
+    assert statements == CACHED
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    """Test that an entry is dropped once the TTL has passed."""
+    now = [1000.0]
+    monkeypatch.setattr(user_cache_module.time, "monotonic", lambda: now[0])
+    cache = UserCache(maxsize=10, ttl=60)
+    user = AuthenticatedUser(id=1, email="a@example.com")
+    cache.put("token", user)
+
+    now[0] += 59
+    assert cache.get("token") == user
+    now[0] += 1
+    assert cache.get("token") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 0}
+
+
+def test_lru_bound_evicts_the_oldest_entry():
+    """Test that a full cache evicts the least recently used token."""
+    cache = UserCache(maxsize=2, ttl=60)
+    first, second, third = (AuthenticatedUser(id=i, email=f"{i}@example.com")
+                            for i in (1, 2, 3))
+    cache.put("first", first)
+    cache.put("second", second)
+    assert cache.get("first") == first
+
+    cache.put("third", third)
+    assert cache.get("second") is None
+    assert (cache.get("first"), cache.get("third")) == (first, third)
+    # The evicted token no longer counts as one of its user's
+    cache.invalidate_user(2)
+    assert cache.stats()["size"] == 2
+
+
+def test_updating_a_user_drops_their_tokens(client, statements):
+    """Test that an ORM update of a user makes the next request look them up again."""
+    headers, user_id = register(client)
+    assert client.get("/api/todos", headers=headers).status_code == 200
+
+    with Session(engine) as session:
+        user = session.get(User, user_id)
+        user.email = f"renamed-{uuid.uuid4().hex}@example.com"
+        session.add(user)
+        session.commit()
+
+    statements.clear()
+    assert client.get("/api/todos", headers=headers).status_code == 200
+    assert statements == UNCACHED
+
+
+def test_deleted_users_token_stops_working_at_once(client):
+    """Test that a deleted user's cached token is rejected on the next request."""
+    headers, user_id = register(client)
+    assert client.get("/api/todos", headers=headers).status_code == 200
+    assert user_cache.stats()["size"] >= 1
+
+    with Session(engine) as session:
+        session.delete(session.get(User, user_id))
+        session.commit()
+
+    assert client.get("/api/todos", headers=headers).status_code == 401